@@ -0,0 +1,32 @@
+"""Add prompt cache token counts to ai_messages
+
+Revision ID: k1f2g3h4i5j6
+Revises: j0e1f2g3h4i5
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "k1f2g3h4i5j6"
+down_revision = "j0e1f2g3h4i5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ai_messages",
+        sa.Column("cache_read_tokens", sa.Integer(), nullable=True),
+    )
+    op.add_column(
+        "ai_messages",
+        sa.Column("cache_write_tokens", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("ai_messages", "cache_write_tokens")
+    op.drop_column("ai_messages", "cache_read_tokens")
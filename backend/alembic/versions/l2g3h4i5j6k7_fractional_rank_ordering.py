@@ -0,0 +1,82 @@
+"""Store kanban and board card order as fractional ranks
+
+Revision ID: l2g3h4i5j6k7
+Revises: k1f2g3h4i5j6
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "l2g3h4i5j6k7"
+down_revision = "k1f2g3h4i5j6"
+branch_labels = None
+depends_on = None
+
+# Existing integer positions become fixed-width base-10 keys (digits are
+# valid rank characters) ending in "i", so their order is kept and they
+# never end in "0". The rebalance job re-spreads them on first long key.
+RANK_FROM_INT = "lpad({column}::text, 9, '0') || 'i'"
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "tasks",
+        "kanban_position",
+        type_=sa.String(64, collation="C"),
+        server_default="i",
+        postgresql_using=RANK_FROM_INT.format(column="greatest(kanban_position, 0)"),
+    )
+    op.alter_column(
+        "board_tasks",
+        "order_index",
+        type_=sa.String(64, collation="C"),
+        postgresql_using=RANK_FROM_INT.format(column="greatest(order_index, 0)"),
+    )
+    op.create_index(
+        "ix_board_tasks_column_order", "board_tasks", ["column_id", "order_index"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_board_tasks_column_order", "board_tasks")
+    # Ranks are not numbers; restore dense positions per column
+    op.execute(
+        """
+        UPDATE board_tasks SET order_index = ranked.position::text
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY column_id ORDER BY order_index
+            ) - 1 AS position
+            FROM board_tasks
+        ) AS ranked
+        WHERE board_tasks.id = ranked.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE tasks SET kanban_position = ranked.position::text
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY project_id, status ORDER BY kanban_position
+            ) - 1 AS position
+            FROM tasks
+        ) AS ranked
+        WHERE tasks.id = ranked.id
+        """
+    )
+    op.alter_column(
+        "board_tasks",
+        "order_index",
+        type_=sa.Integer(),
+        postgresql_using="order_index::integer",
+    )
+    op.alter_column(
+        "tasks",
+        "kanban_position",
+        type_=sa.Integer(),
+        server_default="0",
+        postgresql_using="kanban_position::integer",
+    )
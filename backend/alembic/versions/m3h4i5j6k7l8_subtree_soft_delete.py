@@ -0,0 +1,67 @@
+"""Subtree soft-delete stamp and partial indexes on live tasks
+
+Revision ID: m3h4i5j6k7l8
+Revises: l2g3h4i5j6k7
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "m3h4i5j6k7l8"
+down_revision = "l2g3h4i5j6k7"
+branch_labels = None
+depends_on = None
+
+LIVE = sa.text("NOT is_deleted")
+
+LIVE_INDEXES = [
+    ("ix_tasks_live_project_status", ["project_id", "status", "kanban_position"]),
+    ("ix_tasks_live_assignee", ["assignee_id", "created_at"]),
+    ("ix_tasks_live_creator", ["creator_id", "created_at"]),
+    ("ix_tasks_live_parent", ["parent_id"]),
+    ("ix_tasks_live_created_at", ["created_at"]),
+]
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("deleted_at", sa.DateTime(), nullable=True))
+
+    # Each existing tombstone keeps its own stamp (its last update), so
+    # restoring one task never brings back subtasks deleted separately.
+    op.execute("UPDATE tasks SET deleted_at = updated_at WHERE is_deleted")
+    # Live descendants of already deleted tasks were never hidden; bring
+    # them in line with the cascading delete under the stamp of their
+    # nearest deleted ancestor, so restoring that ancestor brings them back.
+    op.execute(
+        """
+        UPDATE tasks AS child
+        SET is_deleted = true,
+            deleted_at = (
+                SELECT root.deleted_at
+                FROM tasks AS root
+                WHERE root.is_deleted AND child.path <@ root.path
+                ORDER BY nlevel(root.path) DESC
+                LIMIT 1
+            )
+        WHERE NOT child.is_deleted
+          AND EXISTS (
+              SELECT 1 FROM tasks AS root
+              WHERE root.is_deleted AND child.path <@ root.path
+          )
+        """
+    )
+
+    for name, columns in LIVE_INDEXES:
+        op.create_index(name, "tasks", columns, postgresql_where=LIVE)
+    # A boolean index is never selective; the partial indexes replace it
+    op.drop_index("ix_tasks_is_deleted", table_name="tasks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_tasks_is_deleted", "tasks", ["is_deleted"])
+    for name, _ in reversed(LIVE_INDEXES):
+        op.drop_index(name, table_name="tasks")
+    op.drop_column("tasks", "deleted_at")
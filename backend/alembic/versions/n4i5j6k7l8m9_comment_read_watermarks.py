@@ -0,0 +1,74 @@
+"""Replace per-comment read rows with per-task read watermarks
+
+Revision ID: n4i5j6k7l8m9
+Revises: m3h4i5j6k7l8
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "n4i5j6k7l8m9"
+down_revision = "m3h4i5j6k7l8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "comment_read_watermarks",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("task_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("read_at", sa.DateTime(), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "task_id"),
+    )
+    op.create_index("ix_comments_task_created", "comments", ["task_id", "created_at"])
+
+    # The newest comment a user had read on a task becomes the watermark.
+    # Older comments the user skipped count as read from now on.
+    op.execute(
+        """
+        INSERT INTO comment_read_watermarks (user_id, task_id, read_at)
+        SELECT rs.user_id, c.task_id, max(c.created_at)
+        FROM comment_read_status rs
+        JOIN comments c ON c.id = rs.comment_id
+        JOIN tasks t ON t.id = c.task_id
+        GROUP BY rs.user_id, c.task_id
+        """
+    )
+
+    op.drop_index("ix_comment_read_status_comment_id", "comment_read_status")
+    op.drop_index("ix_comment_read_status_user_id", "comment_read_status")
+    op.drop_table("comment_read_status")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "comment_read_status",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("comment_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("read_at", sa.DateTime(), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["comment_id"], ["comments.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "comment_id"),
+    )
+    op.create_index("ix_comment_read_status_user_id", "comment_read_status", ["user_id"])
+    op.create_index("ix_comment_read_status_comment_id", "comment_read_status", ["comment_id"])
+
+    # Every comment up to the watermark was read
+    op.execute(
+        """
+        INSERT INTO comment_read_status (user_id, comment_id, read_at)
+        SELECT w.user_id, c.id, w.read_at
+        FROM comment_read_watermarks w
+        JOIN comments c ON c.task_id = w.task_id AND c.created_at <= w.read_at
+        """
+    )
+
+    op.drop_index("ix_comments_task_created", table_name="comments")
+    op.drop_table("comment_read_watermarks")
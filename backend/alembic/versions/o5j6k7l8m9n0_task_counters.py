@@ -0,0 +1,60 @@
+"""Denormalized per-task subtask, comment and document counters
+
+Revision ID: o5j6k7l8m9n0
+Revises: n4i5j6k7l8m9
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "o5j6k7l8m9n0"
+down_revision = "n4i5j6k7l8m9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_counters",
+        sa.Column("task_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("children_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("comments_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("documents_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("documents_size", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+
+    # Same computation as app.modules.tasks.counters.reconcile
+    op.execute(
+        """
+        INSERT INTO task_counters
+            (task_id, children_count, comments_count, documents_count, documents_size)
+        SELECT t.id,
+               coalesce(ch.n, 0),
+               coalesce(cm.n, 0),
+               coalesce(d.n, 0),
+               coalesce(d.size, 0)
+        FROM tasks t
+        LEFT JOIN (
+            SELECT parent_id, count(*) AS n FROM tasks
+            WHERE parent_id IS NOT NULL AND NOT is_deleted
+            GROUP BY parent_id
+        ) ch ON ch.parent_id = t.id
+        LEFT JOIN (
+            SELECT task_id, count(*) AS n FROM comments GROUP BY task_id
+        ) cm ON cm.task_id = t.id
+        LEFT JOIN (
+            SELECT task_id, count(*) AS n, sum(file_size) AS size FROM documents
+            GROUP BY task_id
+        ) d ON d.task_id = t.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_counters")
@@ -0,0 +1,28 @@
+"""lower() and trigram indexes on user names and emails for @mentions
+
+Revision ID: p6k7l8m9n0o1
+Revises: o5j6k7l8m9n0
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "p6k7l8m9n0o1"
+down_revision = "o5j6k7l8m9n0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_users_name_lower ON users (lower(name))")
+    op.execute("CREATE INDEX ix_users_name_trgm ON users USING gin (lower(name) gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_users_email_trgm ON users USING gin (lower(email) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_email_trgm", table_name="users")
+    op.drop_index("ix_users_name_trgm", table_name="users")
+    op.drop_index("ix_users_name_lower", table_name="users")
@@ -0,0 +1,23 @@
+"""Index comments by parent for batched reply counts
+
+Revision ID: q7l8m9n0o1p2
+Revises: p6k7l8m9n0o1
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "q7l8m9n0o1p2"
+down_revision = "p6k7l8m9n0o1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_comments_reply_to_created", "comments", ["reply_to_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_reply_to_created", table_name="comments")
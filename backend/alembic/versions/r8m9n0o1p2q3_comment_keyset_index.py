@@ -0,0 +1,29 @@
+"""Partial index for keyset pages of top-level comments
+
+Revision ID: r8m9n0o1p2q3
+Revises: q7l8m9n0o1p2
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "r8m9n0o1p2q3"
+down_revision = "q7l8m9n0o1p2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_comments_task_top_level",
+        "comments",
+        ["task_id", "created_at", "id"],
+        postgresql_where=sa.text("reply_to_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_task_top_level", table_name="comments")
@@ -0,0 +1,44 @@
+"""Per-user unread notification counters
+
+Revision ID: s9n0o1p2q3r4
+Revises: r8m9n0o1p2q3
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "s9n0o1p2q3r4"
+down_revision = "r8m9n0o1p2q3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_unread_counters",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("type", sa.String(length=50), nullable=False),
+        sa.Column("unread", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("unread_high", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "type"),
+    )
+
+    # Same computation as app.modules.notifications.counters.reconcile
+    op.execute(
+        """
+        INSERT INTO notification_unread_counters (user_id, type, unread, unread_high)
+        SELECT user_id, type, count(*), count(*) FILTER (WHERE priority IN ('high', 'urgent'))
+        FROM notifications
+        WHERE NOT is_read
+        GROUP BY user_id, type
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_unread_counters")
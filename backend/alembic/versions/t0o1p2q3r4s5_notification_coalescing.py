@@ -0,0 +1,34 @@
+"""Coalesce unread notifications by group_key
+
+Revision ID: t0o1p2q3r4s5
+Revises: s9n0o1p2q3r4
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "t0o1p2q3r4s5"
+down_revision = "s9n0o1p2q3r4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "notifications",
+        sa.Column("group_count", sa.Integer(), nullable=False, server_default="1"),
+    )
+    op.create_index(
+        "ix_notifications_unread_group",
+        "notifications",
+        ["user_id", "group_key"],
+        postgresql_where=sa.text("NOT is_read AND group_key IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_unread_group", table_name="notifications")
+    op.drop_column("notifications", "group_count")
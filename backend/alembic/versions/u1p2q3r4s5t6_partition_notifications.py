@@ -0,0 +1,139 @@
+"""Range-partition notifications by month
+
+Revision ID: u1p2q3r4s5t6
+Revises: t0o1p2q3r4s5
+Create Date: 2026-10-19
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "u1p2q3r4s5t6"
+down_revision = "t0o1p2q3r4s5"
+branch_labels = None
+depends_on = None
+
+# Months created beyond the current one; the nightly job
+# (app.modules.notifications.partitions) keeps this window rolling
+MONTHS_AHEAD = 2
+
+COLUMNS = (
+    "id, user_id, type, title, content, entity_type, entity_id, actor_id, is_read, "
+    "priority, group_key, group_count, extra_data, created_at, read_at"
+)
+
+INDEXES = [
+    ("ix_notifications_user_created", "(user_id, created_at)", None),
+    ("ix_notifications_type", "(type)", None),
+    ("ix_notifications_entity_id", "(entity_id)", None),
+    ("ix_notifications_actor_id", "(actor_id)", None),
+    ("ix_notifications_is_read", "(is_read)", None),
+    ("ix_notifications_group_key", "(group_key)", None),
+    ("ix_notifications_created_at", "(created_at)", None),
+    ("ix_notifications_user_unread", "(user_id, is_read)", "is_read = false"),
+    ("ix_notifications_unread_group", "(user_id, group_key)", "NOT is_read AND group_key IS NOT NULL"),
+]
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes(with_user_created: bool) -> None:
+    for name, columns, where in INDEXES:
+        if name == "ix_notifications_user_created" and not with_user_created:
+            name, columns = "ix_notifications_user_id", "(user_id)"
+        clause = f" WHERE {where}" if where else ""
+        op.execute(f"CREATE INDEX {name} ON notifications {columns}{clause}")
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_unpartitioned")
+    op.execute(
+        "ALTER TABLE notifications_unpartitioned "
+        "RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey"
+    )
+
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            id UUID NOT NULL,
+            user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            type VARCHAR(50) NOT NULL,
+            title VARCHAR(200) NOT NULL,
+            content TEXT,
+            entity_type VARCHAR(50),
+            entity_id UUID,
+            actor_id UUID REFERENCES users (id) ON DELETE SET NULL,
+            is_read BOOLEAN NOT NULL,
+            priority VARCHAR(20) NOT NULL,
+            group_key VARCHAR(200),
+            group_count INTEGER NOT NULL DEFAULT 1,
+            extra_data JSONB,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            read_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT notifications_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE notifications_default PARTITION OF notifications DEFAULT")
+
+    # One partition per month from the oldest notification to MONTHS_AHEAD
+    # months from now, so existing rows never land in the default partition
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(created_at) FROM notifications_unpartitioned")
+    ).scalar()
+    current = date.today().replace(day=1)
+    month = min(oldest.date(), current).replace(day=1) if oldest else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE notifications_{month:%Y_%m} PARTITION OF notifications "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_unpartitioned")
+    op.execute("DROP TABLE notifications_unpartitioned")
+
+    # Created on the parent, so every current and future partition gets them
+    _create_indexes(with_user_created=True)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE notifications RENAME TO notifications_partitioned")
+    op.execute(
+        "ALTER TABLE notifications_partitioned "
+        "RENAME CONSTRAINT notifications_pkey TO notifications_partitioned_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            id UUID NOT NULL PRIMARY KEY,
+            user_id UUID NOT NULL REFERENCES users (id) ON DELETE CASCADE,
+            type VARCHAR(50) NOT NULL,
+            title VARCHAR(200) NOT NULL,
+            content TEXT,
+            entity_type VARCHAR(50),
+            entity_id UUID,
+            actor_id UUID REFERENCES users (id) ON DELETE SET NULL,
+            is_read BOOLEAN NOT NULL,
+            priority VARCHAR(20) NOT NULL,
+            group_key VARCHAR(200),
+            group_count INTEGER NOT NULL DEFAULT 1,
+            extra_data JSONB,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            read_at TIMESTAMP WITHOUT TIME ZONE
+        )
+        """
+    )
+    op.execute(f"INSERT INTO notifications ({COLUMNS}) SELECT {COLUMNS} FROM notifications_partitioned")
+    # Drops every partition with it
+    op.execute("DROP TABLE notifications_partitioned")
+    _create_indexes(with_user_created=False)
@@ -36,6 +36,45 @@ class Settings(BaseSettings):
     AI_TEMPERATURE_DIALOG: float = 0.7
     AI_TEMPERATURE_COMMENTS: float = 0.5
 
+    # AI batch scoring (nightly SMART re-scoring)
+    AI_BATCH_CHECKPOINT_PATH: str = ".smart_batch_checkpoint.json"
+    AI_BATCH_POLL_INTERVAL: float = 60.0  # seconds
+    AI_BATCH_MAX_REQUESTS: int = 10000
+
+    # Resource workload
+    WORKLOAD_HOURS_PER_DAY: float = 8.0
+    WORKLOAD_MAX_DAYS: int = 732  # Longest horizon per request
+
+    # Bulk task updates
+    TASK_BULK_MAX_ITEMS: int = 5000  # Most tasks one POST /tasks/bulk may touch
+
+    # Card ordering (fractional ranks)
+    RANK_REBALANCE_LENGTH: int = 16  # Re-spread a column once a key gets longer
+
+    # User directory (in-process @mention lookup)
+    USER_DIRECTORY_TTL_SECONDS: float = 300.0  # Reload so other workers' edits show up
+    USER_DIRECTORY_MAX_USERS: int = 50000  # Above this, fall back to indexed SQL
+
+    # Notifications
+    NOTIFICATION_COALESCE_MINUTES: int = 60  # Fold same-group_key unread notifications
+    NOTIFICATION_RETENTION_MONTHS: int = 6  # Monthly partitions older than this are dropped
+    NOTIFICATION_PARTITIONS_AHEAD: int = 2  # Future monthly partitions kept ready
+
+    # Email (notification digests)
+    APP_URL: str = "http://localhost:5173"  # Links in emails
+    EMAIL_FROM: str = "SmartTask360 <noreply@smarttask360.com>"
+    EMAIL_TRANSPORT: str = "smtp"  # smtp | file
+    EMAIL_FILE_DIR: str = ".outbox"  # Where the file transport writes .eml files
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: str = ""
+    SMTP_PASSWORD: str = ""
+    SMTP_STARTTLS: bool = True
+    DIGEST_USER_BATCH: int = 500  # Recipients loaded (and their notifications) per query
+    DIGEST_MAX_ITEMS: int = 20  # Notifications listed per email
+    DIGEST_SEND_BATCH: int = 50  # Messages handed to the transport at once
+    DIGEST_SEND_WORKERS: int = 4  # Concurrent transport batches
+
     class Config:
         env_file = ".env"
         case_sensitive = True
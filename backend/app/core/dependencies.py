@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import async_session_maker
+from app.core.unit_of_work import UnitOfWork
 from app.modules.users.models import User
 from app.modules.users.service import UserService
 
@@ -32,6 +33,28 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_uow(db: AsyncSession = Depends(get_db)) -> AsyncGenerator[UnitOfWork, None]:
+    """
+    Dependency for a request-scoped unit of work on the request's session.
+
+    The endpoint calls `await uow.commit()` itself, before building its
+    response, so commit errors surface as the request's error and the
+    commit does not depend on when FastAPI runs dependency teardown.
+    Anything left uncommitted (an exception or early return) is discarded.
+
+    Usage:
+        @app.post("/tasks")
+        async def create_task(uow: UnitOfWork = Depends(get_uow)):
+            ...
+            await uow.commit()
+    """
+    uow = UnitOfWork(db)
+    try:
+        yield uow
+    finally:
+        await uow.rollback()
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
@@ -0,0 +1,149 @@
+"""
+SmartTask360 — Fractional (LexoRank-style) ordering keys
+
+A rank is a base-36 fraction written without the leading "0.": "i" is 18/36,
+"i8" lies between "i" and "j". Ranks compare correctly as plain strings (the
+DB columns use the "C" collation), so a card can always be placed between
+two neighbours by writing only its own row. Keys never end in "0", which
+keeps string order identical to numeric order.
+
+Repeated inserts at the same spot make keys longer; once a key exceeds
+settings.RANK_REBALANCE_LENGTH the column is re-spread in the background.
+"""
+
+from app.core.config import settings
+
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(ALPHABET)
+DEFAULT_RANK = "i"
+
+_DIGITS = {char: value for value, char in enumerate(ALPHABET)}
+
+
+def _to_int(rank: str, length: int) -> int:
+    """Rank as an integer numerator over BASE ** length"""
+    value = 0
+    for char in rank[:length].ljust(length, "0"):
+        value = value * BASE + _DIGITS[char]
+    return value
+
+
+def _to_rank(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, BASE)
+        chars.append(ALPHABET[digit])
+    return "".join(reversed(chars)).rstrip("0")
+
+
+def ranks_between(before: str | None, after: str | None, count: int) -> list[str]:
+    """
+    `count` evenly spaced ranks strictly between two ranks.
+
+    Args:
+        before: Lower bound (None = start of the column)
+        after: Upper bound (None = end of the column)
+
+    Raises:
+        ValueError: If before >= after
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"Rank {before!r} is not below {after!r}")
+    if count <= 0:
+        return []
+
+    length = max(len(before or ""), len(after or ""), 1)
+    while True:
+        low = _to_int(before, length) if before else 0
+        high = _to_int(after, length) if after else BASE**length
+        if high - low > count:
+            step = (high - low) // (count + 1)
+            return [_to_rank(low + step * i, length) for i in range(1, count + 1)]
+        length += 1
+
+
+def needs_rebalance(rank: str) -> bool:
+    """True once a key is long enough that its column should be re-spread"""
+    return len(rank) > settings.RANK_REBALANCE_LENGTH
+
+
+def rank_between(before: str | None, after: str | None) -> str:
+    """Single rank halfway between two ranks"""
+    return ranks_between(before, after, 1)[0]
+
+
+def rank_after(before: str | None) -> str:
+    """
+    Rank for appending a card after `before` (None = empty column).
+
+    Steps by one unit of the key's last digit (at least the second), so
+    repeated appends keep the key length instead of halving the remaining
+    gap each time as rank_between(before, None) would.
+    """
+    if before is None:
+        return DEFAULT_RANK
+    length = max(len(before), 2)
+    value = _to_int(before, length) + 1
+    if value >= BASE**length:
+        return rank_between(before, None)
+    return _to_rank(value, length)
+
+
+def spread_ranks(count: int) -> list[str]:
+    """Short, evenly spaced ranks for a whole column (used by rebalancing)"""
+    return ranks_between(None, None, count)
+
+
+def rerank(current: list[str | None]) -> dict[int, str]:
+    """
+    New ranks for a list whose desired order is its list order.
+
+    Items on the longest run that is already strictly increasing keep their
+    rank; only the others get a new one. Moving a single card therefore
+    changes exactly one rank.
+
+    Args:
+        current: Current rank of each item in the desired order (None = unranked)
+
+    Returns:
+        Index in `current` -> new rank, only for items that change
+    """
+    # Longest strictly increasing subsequence (patience sorting, O(n log n))
+    tails: list[int] = []  # index of the smallest tail of each run length
+    parent = [-1] * len(current)
+    for i, rank in enumerate(current):
+        if rank is None:
+            continue
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if current[tails[mid]] < rank:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo:
+            parent[i] = tails[lo - 1]
+        if lo == len(tails):
+            tails.append(i)
+        else:
+            tails[lo] = i
+
+    kept = set()
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        kept.add(i)
+        i = parent[i]
+
+    changes: dict[int, str] = {}
+    gap: list[int] = []
+    before: str | None = None
+    for i, rank in enumerate(current + [None]):
+        if i < len(current) and i not in kept:
+            gap.append(i)
+            continue
+        after = rank if i < len(current) else None
+        for j, new_rank in zip(gap, ranks_between(before, after, len(gap))):
+            changes[j] = new_rank
+        gap = []
+        before = after
+    return changes
@@ -1,10 +1,14 @@
 """
 SmartTask360 — Pagination Utilities
 
-Minimal pagination helpers for query results.
+Minimal pagination helpers for query results: skip/limit pages and keyset
+(cursor) pages over (created_at, id).
 """
 
+import base64
+from datetime import datetime
 from typing import Generic, TypeVar
+from uuid import UUID
 
 from pydantic import BaseModel
 
@@ -61,3 +65,37 @@ class PaginatedResponse(BaseModel, Generic[T]):
     def has_prev(self) -> bool:
         """Check if there are previous pages"""
         return self.skip > 0
+
+
+# ============== Keyset pagination ==============
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Opaque cursor for a row's position in (created_at, id) order"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    A window of a chronological list.
+
+    Items are oldest first. Pass `older_cursor` as `before` to scroll back
+    and `newer_cursor` as `after` to scroll forward.
+    """
+
+    items: list[T]
+    older_cursor: str | None = None
+    newer_cursor: str | None = None
+    has_older: bool = False
+    has_newer: bool = False
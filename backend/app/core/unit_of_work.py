@@ -0,0 +1,66 @@
+"""
+SmartTask360 — Request-scoped Unit of Work
+
+One transaction per API request. Services that receive a unit of work stage
+their rows (task, history entries, notifications) and only flush when they
+need a generated ID; the endpoint then commits once. In-process side effects
+(similarity index, schedule cache) are queued and run after that commit, so
+they never see data that was rolled back.
+
+Services built without one get a standalone unit of work that commits at the
+end of every operation, which keeps scripts, jobs and other callers working
+unchanged.
+"""
+
+from collections.abc import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """
+    Transaction boundary shared by the services of one request.
+
+    Usage:
+        @router.post("/")
+        async def create(..., uow: UnitOfWork = Depends(get_uow)):
+            task = await TaskService(uow.db, uow).create(...)
+            await uow.commit()
+            return task
+    """
+
+    def __init__(self, db: AsyncSession, autocommit: bool = False):
+        self.db = db
+        self.autocommit = autocommit
+        self._after_commit: list[Callable[[], None]] = []
+
+    @classmethod
+    def standalone(cls, db: AsyncSession) -> "UnitOfWork":
+        """Unit of work that commits at the end of each service operation"""
+        return cls(db, autocommit=True)
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Queue an in-process side effect to run once the data is committed"""
+        self._after_commit.append(callback)
+
+    async def save(self) -> None:
+        """
+        End of a service operation.
+
+        Commits in standalone mode; inside a request the staged changes wait
+        for the endpoint's single `commit()`.
+        """
+        if self.autocommit:
+            await self.commit()
+
+    async def commit(self) -> None:
+        """Flush everything staged, commit, then run queued side effects"""
+        await self.db.commit()
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    async def rollback(self) -> None:
+        """Discard staged changes and queued side effects"""
+        self._after_commit = []
+        await self.db.rollback()
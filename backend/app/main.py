@@ -17,6 +17,9 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     print(f"Starting SmartTask360...")
+    from app.modules.tasks.similarity import task_similarity_index
+
+    task_similarity_index.start_build()
     yield
     # Shutdown
     print("Shutting down SmartTask360...")
@@ -0,0 +1,404 @@
+"""
+SmartTask360 — AI Batch SMART Scoring
+
+Offline re-scoring of open tasks through a message batch (Anthropic Message
+Batches API in production, an in-process stand-in for tests). Progress is
+checkpointed to disk so an interrupted run resumes where it stopped instead
+of resubmitting the whole batch.
+
+Run nightly:
+    python -m app.modules.ai.batch
+"""
+
+import asyncio
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+from uuid import UUID, uuid4
+
+from anthropic import AsyncAnthropic
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.modules.ai.prompts import build_smart_validation_prompt
+from app.modules.ai.schemas import (
+    SMARTBatchCheckpoint,
+    SMARTBatchRunResult,
+    SMARTValidationResult,
+)
+from app.modules.system_settings.schemas import PromptType
+from app.modules.system_settings.service import SystemSettingsService
+from app.modules.tasks.models import Task
+
+# Tasks fetched per page when collecting the batch
+COLLECT_PAGE_SIZE = 1000
+
+# Results written (and checkpointed) per transaction
+APPLY_CHUNK_SIZE = 500
+
+
+def parse_validation_content(content: str) -> SMARTValidationResult:
+    """
+    Parse a SMART validation response into a result.
+
+    Raises:
+        ValueError: If the content is not a valid validation JSON object
+    """
+    content = content.strip()
+
+    # Remove markdown blocks
+    if content.startswith("```json"):
+        content = content[7:]
+    elif content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+
+    try:
+        return SMARTValidationResult(**json.loads(content.strip()))
+    except (json.JSONDecodeError, TypeError) as e:
+        raise ValueError(f"Invalid validation result: {e}")
+
+
+# ============================================================================
+# Batch Backends
+# ============================================================================
+
+
+class BatchBackend(ABC):
+    """
+    Message batch provider.
+
+    Requests use the Message Batches format:
+        {"custom_id": "...", "params": {"model": ..., "messages": [...], ...}}
+
+    Results are dicts: {"custom_id": str, "content": str | None, "error": str | None}
+    """
+
+    @abstractmethod
+    async def submit(self, requests: list[dict[str, Any]]) -> str:
+        """Submit requests, return batch ID"""
+
+    @abstractmethod
+    async def is_complete(self, batch_id: str) -> bool:
+        """Check whether the batch has finished processing"""
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> list[dict[str, Any]]:
+        """Get per-request results of a finished batch"""
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Anthropic Message Batches API"""
+
+    def __init__(self):
+        self.client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+
+    async def submit(self, requests: list[dict[str, Any]]) -> str:
+        batch = await self.client.messages.batches.create(requests=requests)
+        return batch.id
+
+    async def is_complete(self, batch_id: str) -> bool:
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    async def results(self, batch_id: str) -> list[dict[str, Any]]:
+        results = []
+        async for entry in await self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                results.append({
+                    "custom_id": entry.custom_id,
+                    "content": entry.result.message.content[0].text,
+                    "error": None,
+                })
+            else:
+                results.append({
+                    "custom_id": entry.custom_id,
+                    "content": None,
+                    "error": entry.result.type,  # errored | canceled | expired
+                })
+        return results
+
+
+def _default_local_response(params: dict[str, Any]) -> str:
+    """Neutral validation used by LocalBatchBackend when no responder is given"""
+    return json.dumps({
+        "overall_score": 0.5,
+        "is_valid": False,
+        "criteria": [],
+        "summary": "Local batch stand-in result",
+        "recommended_changes": [],
+    })
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    In-process stand-in for the Message Batches API (tests, local runs).
+
+    Args:
+        responder: Called with each request's params, returns response text.
+            Exceptions are reported as errored results.
+        polls_until_complete: Number of is_complete() calls returning False
+            before the batch ends (exercises the polling loop).
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[dict[str, Any]], str] | None = None,
+        polls_until_complete: int = 0,
+    ):
+        self.responder = responder or _default_local_response
+        self.polls_until_complete = polls_until_complete
+        self.batches: dict[str, dict[str, Any]] = {}
+
+    async def submit(self, requests: list[dict[str, Any]]) -> str:
+        batch_id = f"local_{uuid4().hex}"
+        self.batches[batch_id] = {
+            "requests": list(requests),
+            "polls_left": self.polls_until_complete,
+        }
+        return batch_id
+
+    async def is_complete(self, batch_id: str) -> bool:
+        batch = self.batches[batch_id]
+        if batch["polls_left"] > 0:
+            batch["polls_left"] -= 1
+            return False
+        return True
+
+    async def results(self, batch_id: str) -> list[dict[str, Any]]:
+        results = []
+        for request in self.batches[batch_id]["requests"]:
+            try:
+                content = self.responder(request["params"])
+                results.append({"custom_id": request["custom_id"], "content": content, "error": None})
+            except Exception as e:
+                results.append({"custom_id": request["custom_id"], "content": None, "error": str(e)})
+        return results
+
+
+# ============================================================================
+# Checkpoint Store
+# ============================================================================
+
+
+class FileCheckpointStore:
+    """Stores the run checkpoint as JSON; writes are atomic (tmp + rename)"""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or settings.AI_BATCH_CHECKPOINT_PATH
+
+    def load(self) -> SMARTBatchCheckpoint | None:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as f:
+            return SMARTBatchCheckpoint.model_validate_json(f.read())
+
+    def save(self, checkpoint: SMARTBatchCheckpoint) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(checkpoint.model_dump_json())
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# ============================================================================
+# Batch Scorer
+# ============================================================================
+
+
+class SMARTBatchScorer:
+    """
+    Re-scores all open tasks against SMART criteria in one message batch.
+
+    Flow: collect open tasks -> build prompts -> submit batch -> poll ->
+    apply smart_score/smart_is_valid in chunks via TaskService. The
+    checkpoint is saved after submission and after every applied chunk.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        backend: BatchBackend | None = None,
+        checkpoint_store: FileCheckpointStore | None = None,
+        poll_interval: float | None = None,
+        max_requests: int | None = None,
+    ):
+        from app.modules.tasks.service import TaskService
+
+        self.db = db
+        self.backend = backend or AnthropicBatchBackend()
+        self.checkpoint_store = checkpoint_store or FileCheckpointStore()
+        self.poll_interval = (
+            settings.AI_BATCH_POLL_INTERVAL if poll_interval is None else poll_interval
+        )
+        self.max_requests = max_requests or settings.AI_BATCH_MAX_REQUESTS
+        self.task_service = TaskService(db)
+        self._settings_service = SystemSettingsService(db)
+
+    async def run(self) -> SMARTBatchRunResult:
+        """Run (or resume) a batch scoring pass"""
+        checkpoint = self.checkpoint_store.load()
+        resumed = checkpoint is not None and checkpoint.batch_id is not None
+
+        if not resumed:
+            tasks = await self._collect_open_tasks()
+            if not tasks:
+                return SMARTBatchRunResult(batch_id=None)
+
+            requests = await self.build_requests(tasks)
+            checkpoint = SMARTBatchCheckpoint(task_ids=[task.id for task in tasks])
+            checkpoint.batch_id = await self.backend.submit(requests)
+            self.checkpoint_store.save(checkpoint)
+
+        await self._wait_for_completion(checkpoint.batch_id)
+        await self._apply_results(checkpoint)
+
+        self.checkpoint_store.clear()
+        return SMARTBatchRunResult(
+            batch_id=checkpoint.batch_id,
+            total=len(checkpoint.task_ids),
+            applied=len(checkpoint.applied_task_ids),
+            failed=len(checkpoint.failed_task_ids),
+            resumed=resumed,
+        )
+
+    async def build_requests(self, tasks: list[Task]) -> list[dict[str, Any]]:
+        """Build one batch request per task using the SMART validation prompt"""
+        model, language, custom_prompt = await self._prompt_settings()
+        parents = await self._load_parents(tasks)
+
+        requests = []
+        for task in tasks:
+            prompt = build_smart_validation_prompt(
+                task.title,
+                task.description or "",
+                self._task_context(task, parents.get(task.parent_id)),
+                custom_prompt=custom_prompt,
+                language=language,
+            )
+            params: dict[str, Any] = {
+                "model": model,
+                "max_tokens": 3096,
+                "temperature": 0.3,
+                "messages": prompt.messages(),
+            }
+            system_blocks = prompt.system_blocks()
+            if system_blocks:
+                # Same static prefix for every request (cached when long enough)
+                params["system"] = system_blocks
+            requests.append({"custom_id": str(task.id), "params": params})
+        return requests
+
+    async def _prompt_settings(self) -> tuple[str, str, str | None]:
+        """Get (model, language, custom SMART prompt) from system settings"""
+        model = await self._settings_service.get_ai_model()
+        language = await self._settings_service.get_ai_language()
+        content, is_custom = await self._settings_service.get_prompt(PromptType.SMART_VALIDATION)
+        return model, language, content if is_custom else None
+
+    async def _collect_open_tasks(self) -> list[Task]:
+        """Walk open tasks page by page (keyset pagination by ID)"""
+        tasks: list[Task] = []
+        after_id = None
+        while len(tasks) < self.max_requests:
+            page = await self.task_service.get_open_tasks(
+                limit=min(COLLECT_PAGE_SIZE, self.max_requests - len(tasks)),
+                after_id=after_id,
+            )
+            if not page:
+                break
+            tasks.extend(page)
+            after_id = page[-1].id
+        return tasks
+
+    async def _load_parents(self, tasks: list[Task]) -> dict[UUID, dict]:
+        """Load parent titles/descriptions for all tasks in one query"""
+        parent_ids = {task.parent_id for task in tasks if task.parent_id}
+        if not parent_ids:
+            return {}
+
+        result = await self.db.execute(
+            select(Task.id, Task.title, Task.description).where(Task.id.in_(parent_ids))
+        )
+        return {
+            row.id: {"title": row.title, "description": row.description}
+            for row in result.all()
+        }
+
+    @staticmethod
+    def _task_context(task: Task, parent: dict | None) -> dict[str, Any]:
+        """Build validation context (same fields as the interactive endpoint)"""
+        context: dict[str, Any] = {
+            "priority": task.priority,
+            "status": task.status,
+        }
+        if task.due_date:
+            context["due_date"] = task.due_date.isoformat()
+        if task.estimated_hours:
+            context["estimated_hours"] = float(task.estimated_hours)
+        if parent:
+            context["parent_task"] = parent
+        return context
+
+    async def _wait_for_completion(self, batch_id: str) -> None:
+        """Poll the backend until the batch has ended"""
+        while not await self.backend.is_complete(batch_id):
+            await asyncio.sleep(self.poll_interval)
+
+    async def _apply_results(self, checkpoint: SMARTBatchCheckpoint) -> None:
+        """Apply results in chunks, skipping tasks applied by a previous attempt"""
+        done = set(checkpoint.applied_task_ids) | set(checkpoint.failed_task_ids)
+        results = await self.backend.results(checkpoint.batch_id)
+
+        pending: dict[UUID, tuple[dict, bool]] = {}
+        for item in results:
+            task_id = UUID(item["custom_id"])
+            if task_id in done:
+                continue
+
+            try:
+                if item["error"]:
+                    raise ValueError(item["error"])
+                validation = parse_validation_content(item["content"])
+            except ValueError as e:
+                print(f"SMART batch: task {task_id} not scored: {e}")
+                checkpoint.failed_task_ids.append(task_id)
+                continue
+
+            pending[task_id] = (validation.model_dump(), validation.is_valid)
+            if len(pending) >= APPLY_CHUNK_SIZE:
+                await self._apply_chunk(checkpoint, pending)
+                pending = {}
+
+        await self._apply_chunk(checkpoint, pending)
+
+    async def _apply_chunk(
+        self, checkpoint: SMARTBatchCheckpoint, scores: dict[UUID, tuple[dict, bool]]
+    ) -> None:
+        """Write one chunk and record it in the checkpoint"""
+        if scores:
+            await self.task_service.bulk_update_smart_scores(scores)
+            checkpoint.applied_task_ids.extend(scores.keys())
+        self.checkpoint_store.save(checkpoint)
+
+
+async def main() -> None:
+    """Entry point for the nightly job"""
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as db:
+        result = await SMARTBatchScorer(db).run()
+    print(
+        f"SMART batch {result.batch_id}: {result.applied}/{result.total} applied, "
+        f"{result.failed} failed{' (resumed)' if result.resumed else ''}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
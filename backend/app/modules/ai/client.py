@@ -31,7 +31,7 @@ class AIClient:
         model: str | None = None,
         temperature: float = 0.5,
         max_tokens: int = 4096,
-        system: str | None = None,
+        system: str | list[dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
         """
         Send a message to Claude and get a response.
@@ -41,10 +41,12 @@ class AIClient:
             model: Model to use (defaults to settings.AI_MODEL)
             temperature: Temperature for generation (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
-            system: System prompt (optional)
+            system: System prompt (optional) - plain text or content blocks,
+                e.g. CachedPrompt.system_blocks() with cache_control
 
         Returns:
             dict with keys: content, model, stop_reason, usage
+            (usage includes cache_creation_input_tokens / cache_read_input_tokens)
 
         Raises:
             AIError: If API call fails after retries
@@ -75,6 +77,12 @@ class AIClient:
                     "usage": {
                         "input_tokens": response.usage.input_tokens,
                         "output_tokens": response.usage.output_tokens,
+                        "cache_creation_input_tokens": getattr(
+                            response.usage, "cache_creation_input_tokens", None
+                        ) or 0,
+                        "cache_read_input_tokens": getattr(
+                            response.usage, "cache_read_input_tokens", None
+                        ) or 0,
                     },
                 }
 
@@ -112,16 +120,15 @@ class AIClient:
         Returns:
             SMART validation result
         """
-        # Build enhanced prompt with examples
+        # Build enhanced prompt with examples (static part is cached)
         prompt = build_smart_validation_prompt(
             task_title, task_description, context, custom_prompt=custom_prompt, language=language
         )
 
         # Call API with low temperature for consistency
-        messages = [{"role": "user", "content": prompt}]
-
         response = await self.send_message(
-            messages=messages,
+            messages=prompt.messages(),
+            system=prompt.system_blocks(),
             temperature=0.3,  # Low temperature for deterministic validation
             max_tokens=3096,  # Increased for detailed explanations
         )
@@ -100,6 +100,12 @@ class AIMessage(Base):
         nullable=False
     )  # Order in conversation (0, 1, 2...)
     token_count: Mapped[int | None] = mapped_column(nullable=True)  # For cost tracking
+    cache_read_tokens: Mapped[int | None] = mapped_column(
+        nullable=True
+    )  # Input tokens read from the prompt cache
+    cache_write_tokens: Mapped[int | None] = mapped_column(
+        nullable=True
+    )  # Input tokens written to the prompt cache
     model_used: Mapped[str | None] = mapped_column(
         String(100), nullable=True
     )  # Model that generated this response
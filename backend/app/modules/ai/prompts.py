@@ -3,8 +3,13 @@ SmartTask360 — AI Prompts
 
 Structured prompts for different AI operations.
 Supports configurable prompts from system settings with fallback to defaults.
+
+Templates keep the static instructions first and the task data last, so the
+instruction prefix can be sent as a system block, cached when it is long
+enough (see CachedPrompt).
 """
 
+import re
 from typing import Any
 
 
@@ -14,12 +19,7 @@ from typing import Any
 # ============================================================================
 
 
-DEFAULT_SMART_VALIDATION_PROMPT = """You are an expert task management consultant. Analyze this task against SMART criteria and provide actionable feedback.
-
-TASK TO ANALYZE:
-Title: {title}
-Description: {description}
-{context_section}
+DEFAULT_SMART_VALIDATION_PROMPT = """You are an expert task management consultant. Analyze the task given at the end against SMART criteria and provide actionable feedback.
 
 SMART CRITERIA EVALUATION GUIDE:
 
@@ -148,7 +148,12 @@ NOTE ON acceptance_criteria: Generate 3-5 specific, testable acceptance criteria
 - Be specific to this task
 - Include verification method (how to test it)
 
-{language_instruction}"""
+{language_instruction}
+
+TASK TO ANALYZE:
+Title: {title}
+Description: {description}
+{context_section}"""
 
 
 DEFAULT_TASK_DIALOG_PROMPT = """You are a task management consultant helping to clarify and refine task requirements.
@@ -165,11 +170,7 @@ Avoid generic advice - provide specific suggestions based on the task context.
 {language_instruction}"""
 
 
-DEFAULT_RISK_ANALYSIS_PROMPT = """Analyze potential risks and challenges for this task:
-
-Task: {title}
-Description: {description}
-{context_section}
+DEFAULT_RISK_ANALYSIS_PROMPT = """Analyze potential risks and challenges for the task given at the end.
 
 Identify:
 1. Technical Risks: Dependencies, complexity, unknowns
@@ -201,7 +202,12 @@ Return ONLY valid JSON:
   ]
 }}
 
-{language_instruction}"""
+{language_instruction}
+
+TASK TO ANALYZE:
+Task: {title}
+Description: {description}
+{context_section}"""
 
 
 DEFAULT_COMMENT_GENERATION_PROMPT = """Task: {title}
@@ -226,12 +232,7 @@ Be concise (2-3 sentences), practical, and specific to this task.
 # SMART Wizard Prompts
 # ============================================================================
 
-DEFAULT_SMART_ANALYZE_PROMPT = """You are an expert task management consultant. Analyze this task and generate clarifying questions to help the user formulate it according to SMART criteria.
-
-TASK TO ANALYZE:
-Title: {title}
-Description: {description}
-{context_section}
+DEFAULT_SMART_ANALYZE_PROMPT = """You are an expert task management consultant. Analyze the task given at the end and generate clarifying questions to help the user formulate it according to SMART criteria.
 
 Your job is to:
 1. Assess what information is missing to make this task SMART-compliant
@@ -292,22 +293,17 @@ IMPORTANT GUIDELINES:
 - If the task is already well-defined, set can_skip: true and provide minimal questions
 - Question text and options should be in the response language
 
-{language_instruction}"""
-
+{language_instruction}
 
-DEFAULT_SMART_REFINE_PROMPT = """You are an expert task management consultant. Based on the user's answers, generate a well-formulated SMART task proposal.
-
-ORIGINAL TASK:
+TASK TO ANALYZE:
 Title: {title}
 Description: {description}
-{context_section}
+{context_section}"""
 
-CLARIFYING QUESTIONS AND ANSWERS:
-{qa_section}
 
-{additional_context_section}
+DEFAULT_SMART_REFINE_PROMPT = """You are an expert task management consultant. Based on the user's answers, generate a well-formulated SMART task proposal.
 
-Your job is to generate a comprehensive SMART task proposal based on the answers provided.
+Your job is to generate a comprehensive SMART task proposal for the original task given at the end, based on the answers provided.
 
 RESPONSE FORMAT:
 Return ONLY valid JSON in this exact format:
@@ -358,16 +354,20 @@ GUIDELINES:
 - Confidence: "high" (well-defined), "medium" (some uncertainty), "low" (significant unknowns)
 - All text content should be in the response language
 
-{language_instruction}"""
-
-
-DEFAULT_PROGRESS_REVIEW_PROMPT = """Review progress for this task:
+{language_instruction}
 
-Task: {title}
+ORIGINAL TASK:
+Title: {title}
 Description: {description}
-Current Status: {status}
 {context_section}
-{subtasks_section}
+
+CLARIFYING QUESTIONS AND ANSWERS:
+{qa_section}
+
+{additional_context_section}"""
+
+
+DEFAULT_PROGRESS_REVIEW_PROMPT = """Review progress for the task given at the end.
 
 Provide a progress review with:
 1. Overall progress assessment (on track / at risk / blocked)
@@ -386,7 +386,14 @@ Return ONLY valid JSON:
   "risk_level": "Low"
 }}
 
-{language_instruction}"""
+{language_instruction}
+
+TASK TO REVIEW:
+Task: {title}
+Description: {description}
+Current Status: {status}
+{context_section}
+{subtasks_section}"""
 
 
 # ============================================================================
@@ -404,6 +411,104 @@ def get_language_instruction(language: str = "ru") -> str:
     return LANGUAGE_INSTRUCTIONS.get(language, LANGUAGE_INSTRUCTIONS["ru"])
 
 
+# ============================================================================
+# Cached Prompts
+# ============================================================================
+
+# Placeholders that carry per-task data; everything before the paragraph with
+# the first of them is identical across calls and can be cached.
+DYNAMIC_PROMPT_FIELDS = (
+    "title",
+    "description",
+    "status",
+    "comment_type",
+    "context_section",
+    "subtasks_section",
+    "qa_section",
+    "additional_context_section",
+)
+
+_DYNAMIC_FIELD_RE = re.compile(
+    r"(?<!\{)\{(" + "|".join(DYNAMIC_PROMPT_FIELDS) + r")\}(?!\})"
+)
+
+
+# Shortest prefix the API caches (Sonnet/Opus; Haiku needs 2048). Shorter
+# prefixes are sent without cache_control - the marker would do nothing.
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+# Rough size of a token in our (mostly English) instruction text; slightly
+# low, so borderline prefixes are marked rather than missed
+CHARS_PER_TOKEN = 3.5
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a prompt text"""
+    return int(len(text) / CHARS_PER_TOKEN)
+
+
+class CachedPrompt:
+    """
+    Prompt split into a static system prefix and a dynamic user suffix.
+
+    The prefix is sent as a system block. Prefixes long enough for the
+    prompt cache (PROMPT_CACHE_MIN_TOKENS) carry cache_control, so repeated
+    calls only pay full input price for the short task-specific part; of the
+    default prompts that is SMART validation. Shorter prefixes are sent as a
+    plain system block.
+    """
+
+    def __init__(self, system: str, user: str):
+        self.system = system
+        self.user = user
+
+    @property
+    def is_cacheable(self) -> bool:
+        """Whether the prefix reaches the prompt cache minimum"""
+        return estimate_tokens(self.system) >= PROMPT_CACHE_MIN_TOKENS
+
+    def system_blocks(self) -> list[dict[str, Any]] | None:
+        """System content blocks, the prefix marked for caching when it qualifies"""
+        if not self.system:
+            return None
+        block: dict[str, Any] = {"type": "text", "text": self.system}
+        if self.is_cacheable:
+            block["cache_control"] = {"type": "ephemeral"}
+        return [block]
+
+    def messages(self) -> list[dict[str, str]]:
+        """Messages list with the dynamic part as the single user turn"""
+        return [{"role": "user", "content": self.user}]
+
+    def __str__(self) -> str:
+        return f"{self.system}\n\n{self.user}" if self.system else self.user
+
+
+def render_cached_prompt(template: str, **values: Any) -> CachedPrompt:
+    """
+    Fill a template and split it at the paragraph holding the first dynamic field.
+
+    Custom templates that put task data first still work; they just end up
+    with a small (uncached) prefix.
+    """
+    match = _DYNAMIC_FIELD_RE.search(template)
+    split_at = template.rfind("\n\n", 0, match.start()) + 2 if match else 0
+    if split_at < 2:
+        split_at = 0
+
+    static_values = {k: v for k, v in values.items() if k not in DYNAMIC_PROMPT_FIELDS}
+    try:
+        system = template[:split_at].format(**static_values).strip()
+        user = template[split_at:].format(**values).strip()
+    except (KeyError, IndexError, ValueError):
+        # Prefix references a dynamic field in an unusual way - don't cache
+        return CachedPrompt(system="", user=template.format(**values))
+
+    if not user:
+        return CachedPrompt(system="", user=system)
+    return CachedPrompt(system=system, user=user)
+
+
 # ============================================================================
 # Default Prompt Access
 # ============================================================================
@@ -443,7 +548,7 @@ def get_default_prompt(prompt_type) -> str:
 def build_smart_validation_prompt(
     title: str, description: str, context: dict[str, Any] | None = None,
     custom_prompt: str | None = None, language: str = "ru"
-) -> str:
+) -> CachedPrompt:
     """
     Build SMART validation prompt with task data.
 
@@ -491,7 +596,8 @@ def build_smart_validation_prompt(
                 else:
                     context_section += f"    (empty)\n"
 
-    return template.format(
+    return render_cached_prompt(
+        template,
         title=title,
         description=description or "No description provided",
         context_section=context_section,
@@ -519,7 +625,7 @@ def build_task_dialog_prompt(
 def build_risk_analysis_prompt(
     task_title: str, task_description: str, context: dict[str, Any] | None = None,
     custom_prompt: str | None = None, language: str = "ru"
-) -> str:
+) -> CachedPrompt:
     """
     Build risk analysis prompt with task data.
     """
@@ -533,7 +639,8 @@ def build_risk_analysis_prompt(
         if context.get("estimated_hours"):
             context_section += f"Estimated Hours: {context['estimated_hours']}\n"
 
-    return template.format(
+    return render_cached_prompt(
+        template,
         title=task_title,
         description=task_description or "No description",
         context_section=context_section,
@@ -548,7 +655,7 @@ def build_comment_generation_prompt(
     context: dict[str, Any] | None = None,
     custom_prompt: str | None = None,
     language: str = "ru",
-) -> str:
+) -> CachedPrompt:
     """
     Build comment generation prompt with task data.
     """
@@ -564,7 +671,8 @@ def build_comment_generation_prompt(
         if context.get("assignee"):
             context_section += f"Assignee: {context['assignee']}\n"
 
-    return template.format(
+    return render_cached_prompt(
+        template,
         title=task_title,
         description=task_description or "No description",
         comment_type=comment_type,
@@ -581,7 +689,7 @@ def build_progress_review_prompt(
     context: dict[str, Any] | None = None,
     custom_prompt: str | None = None,
     language: str = "ru",
-) -> str:
+) -> CachedPrompt:
     """
     Build progress review prompt with task data.
     """
@@ -606,7 +714,8 @@ def build_progress_review_prompt(
         if len(subtasks) > 5:
             subtasks_section += f"  ... and {len(subtasks) - 5} more\n"
 
-    return template.format(
+    return render_cached_prompt(
+        template,
         title=task_title,
         description=task_description or "No description",
         status=task_status,
@@ -622,7 +731,7 @@ def build_smart_analyze_prompt(
     context: dict[str, Any] | None = None,
     custom_prompt: str | None = None,
     language: str = "ru",
-) -> str:
+) -> CachedPrompt:
     """
     Build SMART analyze prompt for generating clarifying questions.
 
@@ -655,7 +764,8 @@ def build_smart_analyze_prompt(
             if project.get("description"):
                 context_section += f"  Description: {project['description']}\n"
 
-    return template.format(
+    return render_cached_prompt(
+        template,
         title=task_title,
         description=task_description or "No description provided",
         context_section=context_section,
@@ -672,7 +782,7 @@ def build_smart_refine_prompt(
     additional_context: str | None = None,
     custom_prompt: str | None = None,
     language: str = "ru",
-) -> str:
+) -> CachedPrompt:
     """
     Build SMART refine prompt for generating task proposal based on answers.
 
@@ -730,7 +840,8 @@ def build_smart_refine_prompt(
     if additional_context:
         additional_context_section = f"ADDITIONAL USER CONTEXT:\n{additional_context}\n"
 
-    return template.format(
+    return render_cached_prompt(
+        template,
         title=task_title,
         description=task_description or "No description provided",
         context_section=context_section,
@@ -21,6 +21,12 @@ class AIMessageCreate(BaseModel):
     content: str = Field(..., min_length=1, description="Message content")
     sequence: int = Field(..., ge=0, description="Message sequence number")
     token_count: int | None = Field(None, ge=0, description="Token count")
+    cache_read_tokens: int | None = Field(
+        None, ge=0, description="Input tokens served from the prompt cache"
+    )
+    cache_write_tokens: int | None = Field(
+        None, ge=0, description="Input tokens written to the prompt cache"
+    )
     model_used: str | None = Field(None, description="Model used for generation")
 
 
@@ -33,6 +39,8 @@ class AIMessageResponse(BaseModel):
     content: str
     sequence: int
     token_count: int | None
+    cache_read_tokens: int | None = None
+    cache_write_tokens: int | None = None
     model_used: str | None
     created_at: datetime
 
@@ -175,6 +183,37 @@ class SMARTValidationResponse(BaseModel):
     validation: SMARTValidationResult
 
 
+# ============================================================================
+# Batch SMART Scoring Schemas
+# ============================================================================
+
+
+class SMARTBatchCheckpoint(BaseModel):
+    """Progress of a batch SMART scoring run (persisted between restarts)"""
+
+    batch_id: str | None = Field(None, description="Submitted batch ID")
+    task_ids: list[UUID] = Field(
+        default_factory=list, description="Tasks included in the batch"
+    )
+    applied_task_ids: list[UUID] = Field(
+        default_factory=list, description="Tasks whose results are already saved"
+    )
+    failed_task_ids: list[UUID] = Field(
+        default_factory=list, description="Tasks the batch could not score"
+    )
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SMARTBatchRunResult(BaseModel):
+    """Summary of a finished batch SMART scoring run"""
+
+    batch_id: str | None
+    total: int = 0
+    applied: int = 0
+    failed: int = 0
+    resumed: bool = False
+
+
 # ============================================================================
 # AI Dialog Schemas
 # ============================================================================
@@ -19,6 +19,7 @@ from app.modules.ai.schemas import (
     AIMessageCreate,
     SMARTValidationResult,
 )
+from app.modules.ai.unit_of_work import ConversationUnitOfWork
 from app.modules.system_settings.service import SystemSettingsService
 from app.modules.system_settings.schemas import PromptType
 
@@ -136,6 +137,8 @@ class AIService:
             content=message_data.content,
             sequence=message_data.sequence,
             token_count=message_data.token_count,
+            cache_read_tokens=message_data.cache_read_tokens,
+            cache_write_tokens=message_data.cache_write_tokens,
             model_used=message_data.model_used,
         )
 
@@ -218,6 +221,8 @@ class AIService:
                 language=language,
             )
 
+        uow = ConversationUnitOfWork.resume(self.db, conversation)
+
         # Call AI API
         try:
             response = await self.client.send_message(
@@ -227,21 +232,21 @@ class AIService:
                 system=system_prompt,
             )
 
-            # Save user message
-            user_msg = await self.add_message(
-                conversation_id,
+            # Stage user message
+            user_msg = uow.add_message(
                 AIMessageCreate(
                     role="user",
                     content=user_message,
                     sequence=next_sequence,
                     token_count=response["usage"]["input_tokens"],
+                    cache_read_tokens=response["usage"]["cache_read_input_tokens"],
+                    cache_write_tokens=response["usage"]["cache_creation_input_tokens"],
                     model_used=conversation.model,
                 ),
             )
 
-            # Save AI response
-            ai_msg = await self.add_message(
-                conversation_id,
+            # Stage AI response
+            ai_msg = uow.add_message(
                 AIMessageCreate(
                     role="assistant",
                     content=response["content"],
@@ -251,13 +256,12 @@ class AIService:
                 ),
             )
 
+            await uow.commit()
             return user_msg, ai_msg
 
         except AIError as e:
             # Mark conversation as failed
-            await self.update_conversation(
-                conversation_id, AIConversationUpdate(status="failed")
-            )
+            await uow.fail()
             raise e
 
     async def validate_task_smart(
@@ -273,7 +277,8 @@ class AIService:
         ai_model = await self.get_ai_model()
 
         # Create conversation
-        conversation = await self.create_conversation(
+        uow = ConversationUnitOfWork.start(
+            self.db,
             AIConversationCreate(
                 conversation_type="smart_validation",
                 task_id=task_id,
@@ -283,6 +288,7 @@ class AIService:
                 context=context,
             )
         )
+        conversation = uow.conversation
 
         try:
             # Get custom prompt if configured
@@ -332,37 +338,34 @@ class AIService:
             validation = SMARTValidationResult(**validation_data)
 
             # Update conversation with result
-            await self.update_conversation(
-                conversation.id,
+            uow.update(
                 AIConversationUpdate(
                     status="completed", result=validation.model_dump()
                 ),
             )
 
-            # Save SMART score to task
-            from app.modules.tasks.service import TaskService
-
-            task_service = TaskService(self.db)
-            await task_service.update_smart_score(
+            # Stage SMART score on task (committed together with the conversation)
+            await self.task_service.update_smart_score(
                 task_id=task_id,
                 smart_score=validation.model_dump(),
                 is_valid=validation.is_valid,
+                commit=False,
             )
 
             # Save messages for audit
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="user",
                     content=f"Validate: {task_title}",
                     sequence=0,
                     token_count=response["usage"]["input_tokens"],
+                    cache_read_tokens=response["usage"]["cache_read_input_tokens"],
+                    cache_write_tokens=response["usage"]["cache_creation_input_tokens"],
                     model_used=conversation.model,
                 ),
             )
 
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="assistant",
                     content=response["content"],
@@ -372,13 +375,12 @@ class AIService:
                 ),
             )
 
+            await uow.commit()
             return conversation, validation
 
         except Exception as e:
             # Mark as failed
-            await self.update_conversation(
-                conversation.id, AIConversationUpdate(status="failed")
-            )
+            await uow.fail()
             raise e
 
     # ========================================================================
@@ -412,7 +414,8 @@ class AIService:
             **(context or {}),
         }
 
-        conversation = await self.create_conversation(
+        uow = ConversationUnitOfWork.start(
+            self.db,
             AIConversationCreate(
                 conversation_type="task_dialog",
                 task_id=task_id,
@@ -422,6 +425,7 @@ class AIService:
                 context=full_context,
             )
         )
+        conversation = uow.conversation
 
         # Get custom prompt if configured
         custom_prompt = await self.get_custom_prompt(PromptType.TASK_DIALOG)
@@ -519,19 +523,19 @@ Description: {task_description or "No description"}
             ai_greeting = response["content"]
 
             # Save initial messages
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="user",
                     content=user_prompt,
                     sequence=0,
                     token_count=response["usage"]["input_tokens"],
+                    cache_read_tokens=response["usage"]["cache_read_input_tokens"],
+                    cache_write_tokens=response["usage"]["cache_creation_input_tokens"],
                     model_used=conversation.model,
                 ),
             )
 
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="assistant",
                     content=ai_greeting,
@@ -541,13 +545,12 @@ Description: {task_description or "No description"}
                 ),
             )
 
+            await uow.commit()
             return conversation, ai_greeting
 
         except Exception as e:
             # Mark as failed
-            await self.update_conversation(
-                conversation.id, AIConversationUpdate(status="failed")
-            )
+            await uow.fail()
             raise e
 
     async def complete_task_dialog(
@@ -564,6 +567,7 @@ Description: {task_description or "No description"}
 
         # Get all messages to extract insights
         messages = await self.get_conversation_messages(conversation_id)
+        uow = ConversationUnitOfWork.resume(self.db, conversation)
 
         # Build summary prompt
         conversation_text = "\n\n".join(
@@ -605,17 +609,15 @@ Respond ONLY with valid JSON:
             summary_data = json.loads(content.strip())
 
             # Mark conversation as completed with summary
-            await self.update_conversation(
-                conversation_id,
+            uow.update(
                 AIConversationUpdate(status="completed", result=summary_data),
             )
 
+            await uow.commit()
             return summary_data
 
         except Exception as e:
-            await self.update_conversation(
-                conversation_id, AIConversationUpdate(status="failed")
-            )
+            await uow.fail()
             raise e
 
     # ========================================================================
@@ -635,7 +637,8 @@ Respond ONLY with valid JSON:
         ai_model = await self.get_ai_model()
 
         # Create conversation
-        conversation = await self.create_conversation(
+        uow = ConversationUnitOfWork.start(
+            self.db,
             AIConversationCreate(
                 conversation_type="risk_analysis",
                 task_id=task_id,
@@ -645,6 +648,7 @@ Respond ONLY with valid JSON:
                 context=context,
             )
         )
+        conversation = uow.conversation
 
         try:
             # Get custom prompt if configured
@@ -665,7 +669,8 @@ Respond ONLY with valid JSON:
             )
 
             response = await self.client.send_message(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt.messages(),
+                system=prompt.system_blocks(),
                 model=conversation.model,
                 temperature=conversation.temperature,
                 max_tokens=2048,
@@ -694,25 +699,24 @@ Respond ONLY with valid JSON:
                 }
 
             # Update conversation with result
-            await self.update_conversation(
-                conversation.id,
+            uow.update(
                 AIConversationUpdate(status="completed", result=risk_data),
             )
 
             # Save messages for audit
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="user",
                     content=f"Analyze risks: {task_title}",
                     sequence=0,
                     token_count=response["usage"]["input_tokens"],
+                    cache_read_tokens=response["usage"]["cache_read_input_tokens"],
+                    cache_write_tokens=response["usage"]["cache_creation_input_tokens"],
                     model_used=conversation.model,
                 ),
             )
 
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="assistant",
                     content=response["content"],
@@ -722,12 +726,11 @@ Respond ONLY with valid JSON:
                 ),
             )
 
+            await uow.commit()
             return conversation, risk_data
 
         except Exception as e:
-            await self.update_conversation(
-                conversation.id, AIConversationUpdate(status="failed")
-            )
+            await uow.fail()
             raise e
 
     # ========================================================================
@@ -755,7 +758,8 @@ Respond ONLY with valid JSON:
         ai_model = await self.get_ai_model()
 
         # Create conversation
-        conversation = await self.create_conversation(
+        uow = ConversationUnitOfWork.start(
+            self.db,
             AIConversationCreate(
                 conversation_type="comment_generation",
                 task_id=task_id,
@@ -765,6 +769,7 @@ Respond ONLY with valid JSON:
                 context={**(context or {}), "comment_type": comment_type},
             )
         )
+        conversation = uow.conversation
 
         try:
             # Get custom prompt if configured
@@ -786,7 +791,8 @@ Respond ONLY with valid JSON:
             )
 
             response = await self.client.send_message(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt.messages(),
+                system=prompt.system_blocks(),
                 model=conversation.model,
                 temperature=conversation.temperature,
                 max_tokens=512,  # Comments should be concise
@@ -795,8 +801,7 @@ Respond ONLY with valid JSON:
             comment_content = response["content"].strip()
 
             # Update conversation
-            await self.update_conversation(
-                conversation.id,
+            uow.update(
                 AIConversationUpdate(
                     status="completed",
                     result={"comment_type": comment_type, "content": comment_content},
@@ -804,19 +809,19 @@ Respond ONLY with valid JSON:
             )
 
             # Save messages
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="user",
                     content=f"Generate {comment_type} comment: {task_title}",
                     sequence=0,
                     token_count=response["usage"]["input_tokens"],
+                    cache_read_tokens=response["usage"]["cache_read_input_tokens"],
+                    cache_write_tokens=response["usage"]["cache_creation_input_tokens"],
                     model_used=conversation.model,
                 ),
             )
 
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="assistant",
                     content=comment_content,
@@ -826,12 +831,11 @@ Respond ONLY with valid JSON:
                 ),
             )
 
+            await uow.commit()
             return conversation, comment_content
 
         except Exception as e:
-            await self.update_conversation(
-                conversation.id, AIConversationUpdate(status="failed")
-            )
+            await uow.fail()
             raise e
 
     # ========================================================================
@@ -858,7 +862,8 @@ Respond ONLY with valid JSON:
         ai_model = await self.get_ai_model()
 
         # Create conversation
-        conversation = await self.create_conversation(
+        uow = ConversationUnitOfWork.start(
+            self.db,
             AIConversationCreate(
                 conversation_type="progress_review",
                 task_id=task_id,
@@ -868,6 +873,7 @@ Respond ONLY with valid JSON:
                 context=context,
             )
         )
+        conversation = uow.conversation
 
         try:
             # Get custom prompt if configured
@@ -890,7 +896,8 @@ Respond ONLY with valid JSON:
             )
 
             response = await self.client.send_message(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt.messages(),
+                system=prompt.system_blocks(),
                 model=conversation.model,
                 temperature=conversation.temperature,
                 max_tokens=1536,
@@ -923,25 +930,24 @@ Respond ONLY with valid JSON:
                 }
 
             # Update conversation
-            await self.update_conversation(
-                conversation.id,
+            uow.update(
                 AIConversationUpdate(status="completed", result=review_data),
             )
 
             # Save messages
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="user",
                     content=f"Review progress: {task_title}",
                     sequence=0,
                     token_count=response["usage"]["input_tokens"],
+                    cache_read_tokens=response["usage"]["cache_read_input_tokens"],
+                    cache_write_tokens=response["usage"]["cache_creation_input_tokens"],
                     model_used=conversation.model,
                 ),
             )
 
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="assistant",
                     content=response["content"],
@@ -951,12 +957,11 @@ Respond ONLY with valid JSON:
                 ),
             )
 
+            await uow.commit()
             return conversation, review_data
 
         except Exception as e:
-            await self.update_conversation(
-                conversation.id, AIConversationUpdate(status="failed")
-            )
+            await uow.fail()
             raise e
 
     # =========================================================================
@@ -1005,7 +1010,8 @@ Respond ONLY with valid JSON:
                 }
 
         # Create conversation for wizard flow
-        conversation = await self.create_conversation(
+        uow = ConversationUnitOfWork.start(
+            self.db,
             AIConversationCreate(
                 conversation_type="smart_wizard",
                 task_id=task_id,
@@ -1020,6 +1026,7 @@ Respond ONLY with valid JSON:
                 },
             )
         )
+        conversation = uow.conversation
 
         try:
             # Get configured language
@@ -1035,7 +1042,8 @@ Respond ONLY with valid JSON:
 
             # Call AI
             response = await self.client.send_message(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt.messages(),
+                system=prompt.system_blocks(),
                 model=conversation.model,
                 temperature=conversation.temperature,
                 max_tokens=2048,
@@ -1064,8 +1072,7 @@ Respond ONLY with valid JSON:
                 }
 
             # Store questions in conversation context for refine step
-            await self.update_conversation(
-                conversation.id,
+            uow.update(
                 AIConversationUpdate(
                     result={
                         "step": "analyze_complete",
@@ -1077,19 +1084,19 @@ Respond ONLY with valid JSON:
             )
 
             # Save messages
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="user",
                     content=f"Analyze task for SMART: {task_title}",
                     sequence=0,
                     token_count=response["usage"]["input_tokens"],
+                    cache_read_tokens=response["usage"]["cache_read_input_tokens"],
+                    cache_write_tokens=response["usage"]["cache_creation_input_tokens"],
                     model_used=conversation.model,
                 ),
             )
 
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="assistant",
                     content=response["content"],
@@ -1099,12 +1106,11 @@ Respond ONLY with valid JSON:
                 ),
             )
 
+            await uow.commit()
             return conversation, analysis_data
 
         except Exception as e:
-            await self.update_conversation(
-                conversation.id, AIConversationUpdate(status="failed")
-            )
+            await uow.fail()
             raise e
 
     async def refine_task_smart(
@@ -1143,6 +1149,12 @@ Respond ONLY with valid JSON:
         task_title = context.get("task_title", "")
         task_description = context.get("task_description", "")
 
+        # Sequence numbers for the new messages
+        messages = await self.get_conversation_messages(conversation.id)
+        message_count = len(messages)
+
+        uow = ConversationUnitOfWork.resume(self.db, conversation)
+
         try:
             # Get configured language
             language = await self.get_ai_language()
@@ -1160,7 +1172,8 @@ Respond ONLY with valid JSON:
 
             # Call AI
             response = await self.client.send_message(
-                messages=[{"role": "user", "content": prompt}],
+                messages=prompt.messages(),
+                system=prompt.system_blocks(),
                 model=conversation.model,
                 temperature=0.5,  # Moderate temperature for structured output
                 max_tokens=3000,
@@ -1210,8 +1223,7 @@ Respond ONLY with valid JSON:
                     raise ValueError(f"AI returned invalid JSON format. Please try again.")
 
             # Update conversation with proposal
-            await self.update_conversation(
-                conversation.id,
+            uow.update(
                 AIConversationUpdate(
                     result={
                         **result,
@@ -1222,28 +1234,24 @@ Respond ONLY with valid JSON:
                 ),
             )
 
-            # Save messages
-            messages = await self.get_conversation_messages(conversation.id)
-            message_count = len(messages)
-
             # Format answers for user message
             answers_text = "\n".join([f"Q{a['question_id']}: {a['value']}" for a in answers])
             if additional_context:
                 answers_text += f"\n\nДополнительно: {additional_context}"
 
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="user",
                     content=f"Answers:\n{answers_text}",
                     sequence=message_count,
                     token_count=response["usage"]["input_tokens"],
+                    cache_read_tokens=response["usage"]["cache_read_input_tokens"],
+                    cache_write_tokens=response["usage"]["cache_creation_input_tokens"],
                     model_used=conversation.model,
                 ),
             )
 
-            await self.add_message(
-                conversation.id,
+            uow.add_message(
                 AIMessageCreate(
                     role="assistant",
                     content=response["content"],
@@ -1259,12 +1267,11 @@ Respond ONLY with valid JSON:
                 "description": task_description,
             }
 
+            await uow.commit()
             return conversation, {"proposal": proposal_data, "original_task": original_task}
 
         except Exception as e:
-            await self.update_conversation(
-                conversation.id, AIConversationUpdate(status="failed")
-            )
+            await uow.fail()
             raise e
 
     async def apply_smart_proposal(
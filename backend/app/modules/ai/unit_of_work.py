@@ -0,0 +1,121 @@
+"""
+SmartTask360 — AI Conversation Unit of Work
+
+Accumulates a conversation, its messages and status changes in memory and
+writes them in a single transaction once the model has responded.
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.ai.models import AIConversation, AIMessage
+from app.modules.ai.schemas import (
+    AIConversationCreate,
+    AIConversationUpdate,
+    AIMessageCreate,
+)
+
+
+class ConversationUnitOfWork:
+    """
+    Unit of work for one AI turn.
+
+    Nothing touches the database until `commit()` is called, so an AI flow
+    costs one write round trip regardless of how many messages and status
+    updates it records.
+
+    Usage:
+        uow = ConversationUnitOfWork.start(db, AIConversationCreate(...))
+        response = await client.send_message(...)
+        uow.add_message(AIMessageCreate(role="user", ...))
+        uow.add_message(AIMessageCreate(role="assistant", ...))
+        uow.update(AIConversationUpdate(status="completed", result=...))
+        await uow.commit()
+    """
+
+    def __init__(self, db: AsyncSession, conversation: AIConversation, is_new: bool):
+        self.db = db
+        self.conversation = conversation
+        self.is_new = is_new
+        self.messages: list[AIMessage] = []
+
+    @classmethod
+    def start(
+        cls, db: AsyncSession, conversation_data: AIConversationCreate
+    ) -> "ConversationUnitOfWork":
+        """Stage a new conversation (ID is assigned client-side)"""
+        now = datetime.utcnow()
+        conversation = AIConversation(
+            id=uuid4(),
+            conversation_type=conversation_data.conversation_type,
+            task_id=conversation_data.task_id,
+            user_id=conversation_data.user_id,
+            model=conversation_data.model,
+            temperature=conversation_data.temperature,
+            context=conversation_data.context,
+            status="active",
+            created_at=now,
+            updated_at=now,
+        )
+        return cls(db, conversation, is_new=True)
+
+    @classmethod
+    def resume(
+        cls, db: AsyncSession, conversation: AIConversation
+    ) -> "ConversationUnitOfWork":
+        """Wrap an already persisted conversation"""
+        return cls(db, conversation, is_new=False)
+
+    def add_message(self, message_data: AIMessageCreate) -> AIMessage:
+        """Stage a message for the conversation"""
+        message = AIMessage(
+            id=uuid4(),
+            conversation_id=self.conversation.id,
+            role=message_data.role,
+            content=message_data.content,
+            sequence=message_data.sequence,
+            token_count=message_data.token_count,
+            cache_read_tokens=message_data.cache_read_tokens,
+            cache_write_tokens=message_data.cache_write_tokens,
+            model_used=message_data.model_used,
+            created_at=datetime.utcnow(),
+        )
+        self.messages.append(message)
+        return message
+
+    def update(self, update_data: AIConversationUpdate) -> AIConversation:
+        """Apply status/result changes to the staged conversation"""
+        if update_data.status is not None:
+            self.conversation.status = update_data.status
+            if update_data.status == "completed":
+                self.conversation.completed_at = datetime.utcnow()
+
+        if update_data.result is not None:
+            self.conversation.result = update_data.result
+
+        self.conversation.updated_at = datetime.utcnow()
+        return self.conversation
+
+    async def commit(self) -> AIConversation:
+        """Write the conversation and all staged messages in one transaction"""
+        if self.is_new:
+            self.db.add(self.conversation)
+        self.db.add_all(self.messages)
+        await self.db.commit()
+        self.is_new = False
+        self.messages = []
+        return self.conversation
+
+    async def fail(self) -> AIConversation:
+        """
+        Discard staged messages and persist the conversation as failed.
+
+        Rolls back first so a failed flush (or any other pending change in
+        the session) does not leak into the failure record.
+        """
+        await self.db.rollback()
+        self.messages = []
+        self.update(AIConversationUpdate(status="failed"))
+        return await self.commit()
@@ -5,10 +5,19 @@ SmartTask360 — Board models (Kanban boards)
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
+from app.core.lexorank import DEFAULT_RANK
 
 
 class Board(Base):
@@ -137,8 +146,10 @@ class BoardTask(Base):
         index=True,
     )
 
-    # Position within column
-    order_index: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Position within column: fractional rank (see app.core.lexorank)
+    order_index: Mapped[str] = mapped_column(
+        String(64, collation="C"), nullable=False, default=DEFAULT_RANK
+    )
 
     # When task was added to board
     added_at: Mapped[datetime] = mapped_column(
@@ -151,6 +162,7 @@ class BoardTask(Base):
 
     __table_args__ = (
         UniqueConstraint("board_id", "task_id", name="uq_board_task"),
+        Index("ix_board_tasks_column_order", "column_id", "order_index"),
     )
 
     def __repr__(self) -> str:
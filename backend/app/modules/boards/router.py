@@ -4,10 +4,11 @@ SmartTask360 — Board router (API endpoints)
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user, get_db
+from app.core.lexorank import needs_rebalance
 from app.core.types import BoardMemberRole
 from app.modules.boards.schemas import (
     BoardColumnCreate,
@@ -29,7 +30,7 @@ from app.modules.boards.schemas import (
     BoardUpdate,
     MoveResult,
 )
-from app.modules.boards.service import BoardService
+from app.modules.boards.service import BoardService, rebalance_column_job
 from app.modules.tasks.models import Task
 from app.modules.users.models import User
 
@@ -153,16 +154,14 @@ async def get_board(
     # Collect task IDs for batch tag fetching
     task_ids = [bt.task_id for bt in board_tasks]
     tasks_tags = await task_service.get_tasks_tags(task_ids)
+    comment_counts_by_task = await comment_service.get_unread_counts(current_user.id, task_ids)
 
     task_responses = []
     for bt in board_tasks:
         result = await db.execute(select(Task).where(Task.id == bt.task_id))
         task = result.scalar_one_or_none()
         if task:
-            # Get comment counts for this task
-            comment_counts = await comment_service.get_unread_comments_count(
-                current_user.id, bt.task_id
-            )
+            comment_counts = comment_counts_by_task[bt.task_id]
             # Get tags for this task
             tag_briefs = [
                 TagBrief(id=tag.id, name=tag.name, color=tag.color)
@@ -448,6 +447,7 @@ async def reorder_columns(
 async def add_task_to_board(
     board_id: UUID,
     task_data: BoardTaskAdd,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -463,6 +463,8 @@ async def add_task_to_board(
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
 
+    if needs_rebalance(board_task.order_index):
+        background_tasks.add_task(rebalance_column_job, board_task.column_id)
     return BoardTaskResponse.model_validate(board_task)
 
 
@@ -492,12 +494,16 @@ async def move_task(
     board_id: UUID,
     task_id: UUID,
     move_data: BoardTaskMove,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Move task to different column and/or position.
     Handles WIP limits and optional status sync.
+
+    Only the moved card is written; its column is rebalanced in the
+    background when position keys grow too long.
     """
     service = BoardService(db)
 
@@ -513,6 +519,8 @@ async def move_task(
         else:
             raise HTTPException(status_code=400, detail=result.message)
 
+    if needs_rebalance(result.task.order_index):
+        background_tasks.add_task(rebalance_column_job, result.task.column_id)
     return result
 
 
@@ -524,6 +532,7 @@ async def reorder_tasks_in_column(
     board_id: UUID,
     column_id: UUID,
     task_ids: list[UUID],
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -544,6 +553,8 @@ async def reorder_tasks_in_column(
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
 
+    if any(needs_rebalance(bt.order_index) for bt in board_tasks):
+        background_tasks.add_task(rebalance_column_job, column_id)
     return [BoardTaskResponse.model_validate(bt) for bt in board_tasks]
 
 
@@ -133,14 +133,14 @@ class BoardTaskAdd(BaseModel):
 
     task_id: UUID
     column_id: UUID
-    order_index: int | None = None  # If None, will be set to end of column
+    position: int | None = Field(None, ge=0)  # Index in the column; None = end
 
 
 class BoardTaskMove(BaseModel):
     """Schema for moving a task on the board"""
 
     column_id: UUID
-    order_index: int | None = None  # If None, will be set to end of column
+    position: int | None = Field(None, ge=0)  # Index in the column; None = end
     force: bool = False  # Force move even if WIP limit is reached
 
 
@@ -151,7 +151,7 @@ class BoardTaskResponse(BaseModel):
     board_id: UUID
     task_id: UUID
     column_id: UUID
-    order_index: int
+    order_index: str  # Fractional rank within the column
     added_at: datetime
     moved_at: datetime
 
@@ -165,7 +165,7 @@ class BoardTaskWithDetails(BaseModel):
     board_id: UUID
     task_id: UUID
     column_id: UUID
-    order_index: int
+    order_index: str  # Fractional rank within the column
     added_at: datetime
     moved_at: datetime
 
@@ -6,9 +6,10 @@ from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import delete as sql_delete
-from sqlalchemy import func, select, update
+from sqlalchemy import bindparam, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.lexorank import rank_between, rerank, spread_ranks
 from app.core.types import BoardMemberRole, TaskStatus
 from app.modules.boards.models import Board, BoardColumn, BoardMember, BoardTask
 from app.modules.boards.schemas import (
@@ -366,17 +367,7 @@ class BoardService:
                     f"Column '{column.name}' has reached WIP limit of {column.wip_limit}"
                 )
 
-        # Determine order_index
-        if task_data.order_index is None:
-            result = await self.db.execute(
-                select(func.max(BoardTask.order_index)).where(
-                    BoardTask.column_id == task_data.column_id
-                )
-            )
-            max_order = result.scalar() or -1
-            order_index = max_order + 1
-        else:
-            order_index = task_data.order_index
+        order_index = await self._rank_at_position(task_data.column_id, task_data.position)
 
         board_task = BoardTask(
             board_id=board_id,
@@ -439,25 +430,10 @@ class BoardService:
                 elif current_count >= target_column.wip_limit - 1:
                     wip_warning = True  # Approaching limit
 
-        # Determine new order_index
-        if move_data.order_index is None:
-            result = await self.db.execute(
-                select(func.max(BoardTask.order_index)).where(
-                    BoardTask.column_id == move_data.column_id
-                )
-            )
-            max_order = result.scalar() or -1
-            new_order = max_order + 1
-        else:
-            new_order = move_data.order_index
-            # Shift tasks in target column
-            await self.db.execute(
-                update(BoardTask)
-                .where(BoardTask.column_id == move_data.column_id)
-                .where(BoardTask.order_index >= new_order)
-                .where(BoardTask.id != board_task.id)
-                .values(order_index=BoardTask.order_index + 1)
-            )
+        # Only the moved card gets a new rank; its neighbours stay as they are
+        new_order = await self._rank_at_position(
+            move_data.column_id, move_data.position, exclude_id=board_task.id
+        )
 
         # Update board task
         old_column_id = board_task.column_id
@@ -516,15 +492,24 @@ class BoardService:
         if not await self._can_modify_board(column.board_id, user_id):
             raise PermissionError("No permission to reorder tasks")
 
-        for i, task_id in enumerate(task_ids):
-            await self.db.execute(
-                update(BoardTask)
-                .where(BoardTask.column_id == column_id)
-                .where(BoardTask.task_id == task_id)
-                .values(order_index=i)
+        result = await self.db.execute(
+            select(BoardTask.task_id, BoardTask.id, BoardTask.order_index).where(
+                BoardTask.column_id == column_id, BoardTask.task_id.in_(task_ids)
             )
+        )
+        placements = {row.task_id: row for row in result.all()}
+        ordered = [placements[task_id] for task_id in task_ids if task_id in placements]
 
-        await self.db.commit()
+        # Cards already in the right relative order keep their rank
+        changes = rerank([row.order_index for row in ordered])
+        if changes:
+            await self.db.execute(
+                update(BoardTask.__table__)
+                .where(BoardTask.__table__.c.id == bindparam("b_id"))
+                .values(order_index=bindparam("b_rank")),
+                [{"b_id": ordered[i].id, "b_rank": rank} for i, rank in changes.items()],
+            )
+            await self.db.commit()
 
         result = await self.db.execute(
             select(BoardTask)
@@ -533,6 +518,69 @@ class BoardService:
         )
         return list(result.scalars().all())
 
+    async def _rank_at_position(
+        self, column_id: UUID, position: int | None, exclude_id: UUID | None = None
+    ) -> str:
+        """
+        Rank that puts a card at `position` in a column (None = at the end).
+
+        Reads at most the two neighbouring ranks; other cards are not touched
+        unless neighbours share a rank, in which case the column is
+        rebalanced first.
+        """
+        stmt = select(BoardTask.order_index).where(BoardTask.column_id == column_id)
+        if exclude_id is not None:
+            stmt = stmt.where(BoardTask.id != exclude_id)
+
+        if position == 0:
+            result = await self.db.execute(stmt.order_by(BoardTask.order_index).limit(1))
+            neighbours = [None, result.scalar()]
+        else:
+            neighbours = []
+            if position is not None:
+                result = await self.db.execute(
+                    stmt.order_by(BoardTask.order_index).offset(position - 1).limit(2)
+                )
+                neighbours = list(result.scalars().all())
+            if not neighbours:  # At or past the end of the column
+                result = await self.db.execute(
+                    stmt.order_by(BoardTask.order_index.desc()).limit(1)
+                )
+                neighbours = [result.scalar()]
+
+        before = neighbours[0]
+        after = neighbours[1] if len(neighbours) > 1 else None
+        if before is not None and after is not None and before >= after:
+            await self.rebalance_column(column_id)
+            return await self._rank_at_position(column_id, position, exclude_id)
+        return rank_between(before, after)
+
+    async def rebalance_column(self, column_id: UUID) -> int:
+        """
+        Re-spread the ranks of a column as short, evenly spaced keys.
+
+        Returns:
+            Number of cards re-ranked
+        """
+        result = await self.db.execute(
+            select(BoardTask.id)
+            .where(BoardTask.column_id == column_id)
+            .order_by(BoardTask.order_index, BoardTask.id)
+            .with_for_update()
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            return 0
+
+        await self.db.execute(
+            update(BoardTask.__table__)
+            .where(BoardTask.__table__.c.id == bindparam("b_id"))
+            .values(order_index=bindparam("b_rank")),
+            [{"b_id": card_id, "b_rank": rank} for card_id, rank in zip(ids, spread_ranks(len(ids)))],
+        )
+        await self.db.commit()
+        return len(ids)
+
     # =========================================================================
     # Member Management
     # =========================================================================
@@ -706,3 +754,11 @@ class BoardService:
             "task_count": task_count.scalar() or 0,
             "member_count": member_count.scalar() or 0,
         }
+
+
+async def rebalance_column_job(column_id: UUID) -> None:
+    """Background task: rebalance a board column in its own session"""
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as db:
+        await BoardService(db).rebalance_column(column_id)
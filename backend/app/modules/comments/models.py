@@ -5,19 +5,21 @@ SmartTask360 — Comment model
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, Table, Column
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, Table, Column, text
 from sqlalchemy.dialects.postgresql import ARRAY, UUID as PgUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
 
 
-# Association table for tracking read comments per user
-comment_read_status = Table(
-    "comment_read_status",
+# Last-read watermark per (user, task): comments on the task created after
+# read_at are unread for the user. One row per task a user has opened,
+# instead of one row per comment read.
+comment_read_watermarks = Table(
+    "comment_read_watermarks",
     Base.metadata,
     Column("user_id", PgUUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
-    Column("comment_id", PgUUID(as_uuid=True), ForeignKey("comments.id", ondelete="CASCADE"), primary_key=True),
+    Column("task_id", PgUUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
     Column("read_at", DateTime, nullable=False, default=datetime.utcnow),
 )
 
@@ -32,6 +34,20 @@ class Comment(Base):
     """
 
     __tablename__ = "comments"
+    __table_args__ = (
+        # Unread counts scan a task's comments newer than a watermark
+        Index("ix_comments_task_created", "task_id", "created_at"),
+        # Reply counts and reply lists of a page of comments
+        Index("ix_comments_reply_to_created", "reply_to_id", "created_at"),
+        # Keyset pages of a task's top-level comments, (created_at, id) order
+        Index(
+            "ix_comments_task_top_level",
+            "task_id",
+            "created_at",
+            "id",
+            postgresql_where=text("reply_to_id IS NULL"),
+        ),
+    )
 
     # Primary key
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
@@ -4,19 +4,28 @@ SmartTask360 — Comments API endpoints
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user, get_db
+from app.core.dependencies import get_current_user, get_db, get_uow
+from app.core.pagination import CursorPage
+from app.core.unit_of_work import UnitOfWork
 from app.modules.comments.schemas import (
+    CommentCounts,
+    CommentCountsRequest,
     CommentCreate,
     CommentResponse,
+    CommentThreadItem,
     CommentUpdate,
     ReactionCreate,
     ReactionResponse,
     ReactionSummary,
 )
-from app.modules.comments.service import CommentService, ReactionService
+from app.modules.comments.service import (
+    CommentService,
+    ReactionService,
+    notify_mentions_job,
+)
 from app.modules.users.models import User
 
 router = APIRouter(prefix="/comments", tags=["comments"])
@@ -36,6 +45,63 @@ async def get_task_comments(
     return comments
 
 
+@router.get("/tasks/{task_id}/comments/page", response_model=CursorPage[CommentResponse])
+async def get_task_comments_page(
+    task_id: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    before: str | None = None,
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get a window of task comments (oldest first within the page).
+
+    Without cursors returns the newest comments; pass `older_cursor` as
+    `before` to scroll back, `newer_cursor` as `after` to load new ones.
+    """
+    service = CommentService(db)
+    try:
+        return await service.get_task_comments_page(task_id, limit=limit, before=before, after=after)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/tasks/{task_id}/thread", response_model=CursorPage[CommentThreadItem])
+async def get_task_comment_thread(
+    task_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    before: str | None = None,
+    after: str | None = None,
+    replies: int = Query(3, ge=0, le=20),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get a window of top-level comments with their first `replies` replies,
+    reply counts and reactions (three queries). Cursors work as in
+    /tasks/{task_id}/comments/page.
+    """
+    service = CommentService(db)
+    try:
+        return await service.get_task_thread(
+            task_id,
+            current_user.id,
+            limit=limit,
+            before=before,
+            after=after,
+            replies_per_comment=replies,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.get("/{comment_id}", response_model=CommentResponse)
 async def get_comment(
     comment_id: UUID,
@@ -58,10 +124,12 @@ async def get_comment(
 @router.get("/{comment_id}/replies", response_model=list[CommentResponse])
 async def get_comment_replies(
     comment_id: UUID,
+    after: str | None = None,
+    limit: int | None = Query(None, ge=1, le=200),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get all replies to a comment (threaded comments)"""
+    """Get replies to a comment (threaded comments), optionally after a cursor"""
     service = CommentService(db)
 
     # Verify comment exists
@@ -72,21 +140,44 @@ async def get_comment_replies(
             detail="Comment not found",
         )
 
-    replies = await service.get_comment_replies(comment_id)
+    try:
+        replies = await service.get_comment_replies(comment_id, after=after, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     return replies
 
 
 @router.post("/", response_model=CommentResponse, status_code=status.HTTP_201_CREATED)
 async def create_comment(
     comment_data: CommentCreate,
-    db: AsyncSession = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    uow: UnitOfWork = Depends(get_uow),
     current_user: User = Depends(get_current_user),
 ):
-    """Create new comment"""
-    service = CommentService(db)
+    """
+    Create new comment.
+
+    Mentioned users are notified in the background after the response, so
+    the fan-out does not hold up the request.
+    """
+    service = CommentService(uow.db, uow)
 
     try:
-        comment = await service.create(comment_data, author_id=current_user.id)
+        comment = await service.create(
+            comment_data, author_id=current_user.id, notify_mentions=False
+        )
+        await uow.commit()
+        if comment.mentioned_user_ids:
+            background_tasks.add_task(
+                notify_mentions_job,
+                comment.mentioned_user_ids,
+                comment.task_id,
+                comment.content,
+                current_user.id,
+            )
         return comment
     except ValueError as e:
         raise HTTPException(
@@ -185,6 +276,18 @@ async def get_task_unread_count(
     return counts
 
 
+@router.post("/tasks/unread-counts", response_model=list[CommentCounts])
+async def get_unread_counts(
+    data: CommentCountsRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get comment, unread and unread-mention counts for many tasks at once"""
+    service = CommentService(db)
+    counts = await service.get_unread_counts(current_user.id, data.task_ids)
+    return [CommentCounts(task_id=task_id, **c) for task_id, c in counts.items()]
+
+
 # Reaction endpoints
 @router.get("/{comment_id}/reactions", response_model=list[ReactionSummary])
 async def get_comment_reactions(
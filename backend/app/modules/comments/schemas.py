@@ -38,6 +38,22 @@ class CommentResponse(BaseModel):
     updated_at: datetime
 
 
+# Read tracking schemas
+class CommentCountsRequest(BaseModel):
+    """Tasks to fetch comment counts for (e.g. every card on a board)"""
+
+    task_ids: list[UUID] = Field(..., min_length=1, max_length=1000)
+
+
+class CommentCounts(BaseModel):
+    """Comment counts of one task for the current user"""
+
+    task_id: UUID
+    total: int = 0
+    unread: int = 0
+    unread_mentions: int = 0
+
+
 # Reaction schemas
 class ReactionCreate(BaseModel):
     """Schema for adding a reaction"""
@@ -64,3 +80,13 @@ class ReactionSummary(BaseModel):
     count: int
     user_ids: list[UUID]
     has_current_user: bool = False
+
+
+# Thread schemas
+class CommentThreadItem(CommentResponse):
+    """Comment with everything a thread view renders next to it"""
+
+    reply_count: int = 0
+    reactions: list[ReactionSummary] = []
+    # First replies (top-level comments of a thread page only)
+    replies: list["CommentThreadItem"] = []
@@ -4,17 +4,41 @@ SmartTask360 — Comment service (business logic)
 
 import re
 from uuid import UUID
-from collections import defaultdict
-from datetime import datetime
 
-from sqlalchemy import select, delete, func, insert, or_
+from sqlalchemy import (
+    String,
+    Uuid,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PgUUID, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.modules.comments.models import Comment, comment_read_status
+from app.core.pagination import CursorPage, decode_cursor, encode_cursor
+from app.core.unit_of_work import UnitOfWork
+from app.modules.comments.models import Comment, comment_read_watermarks
 from app.modules.comments.reactions import CommentReaction
-from app.modules.comments.schemas import CommentCreate, CommentUpdate, ReactionSummary
+from app.modules.comments.schemas import (
+    CommentCreate,
+    CommentResponse,
+    CommentThreadItem,
+    CommentUpdate,
+    ReactionSummary,
+)
 from app.modules.task_history.service import TaskHistoryService
+from app.modules.tasks import counters
 from app.modules.task_history.schemas import TaskHistoryCreate
+from app.modules.users.directory import user_directory
 from app.modules.users.models import User
 
 
@@ -25,8 +49,9 @@ MENTION_PATTERN = re.compile(r'@([А-Яа-яЁёA-Za-z]+(?:\s+[А-Яа-яЁёA-Z
 class CommentService:
     """Service for comment operations"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, uow: UnitOfWork | None = None):
         self.db = db
+        self.uow = uow or UnitOfWork.standalone(db)
 
     async def get_by_id(self, comment_id: UUID) -> Comment | None:
         """Get comment by ID"""
@@ -41,16 +66,14 @@ class CommentService:
         if not names:
             return {}
 
-        # Build conditions for each name
-        conditions = []
-        for name in names:
-            name_lower = name.lower().strip()
-            conditions.append(func.lower(User.name) == name_lower)
+        if await user_directory.ensure_built(self.db):
+            return user_directory.resolve_names(names)
 
+        lowered = sorted({name.lower().strip() for name in names})
         result = await self.db.execute(
             select(User.id, User.name)
             .where(User.is_active == True)
-            .where(or_(*conditions))
+            .where(func.lower(User.name) == any_(bindparam("b_names", lowered, type_=ARRAY(String))))
         )
 
         # Build map: lowercase name -> user_id
@@ -79,19 +102,221 @@ class CommentService:
         )
         return list(result.scalars().all())
 
-    async def get_comment_replies(self, comment_id: UUID) -> list[Comment]:
-        """Get all replies to a comment (threaded comments)"""
-        result = await self.db.execute(
+    async def get_comment_replies(
+        self, comment_id: UUID, after: str | None = None, limit: int | None = None
+    ) -> list[Comment]:
+        """
+        Get replies to a comment (threaded comments), oldest first.
+
+        `after` is the cursor of the last reply already shown (e.g. the
+        last of the replies embedded in a thread page).
+        """
+        query = (
             select(Comment)
             .where(Comment.reply_to_id == comment_id)
-            .order_by(Comment.created_at)
+            .order_by(Comment.created_at, Comment.id)
+            .limit(limit)
         )
+        if after:
+            query = query.where(self._position() > tuple_(*decode_cursor(after)))
+        result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    # ============== Keyset pages ==============
+
+    @staticmethod
+    def _position():
+        """A comment's place in chronological order (ties broken by ID)"""
+        return tuple_(Comment.created_at, Comment.id)
+
+    def _keyset(self, query, limit: int, before: str | None, after: str | None):
+        """
+        Bound and order a Comment query for one page, fetching one extra row
+        to tell whether more remain in the direction of travel.
+
+        Without cursors the page is the newest `limit` comments.
+        """
+        if after:
+            return (
+                query.where(self._position() > tuple_(*decode_cursor(after)))
+                .order_by(Comment.created_at, Comment.id)
+                .limit(limit + 1)
+            )
+        if before:
+            query = query.where(self._position() < tuple_(*decode_cursor(before)))
+        return query.order_by(Comment.created_at.desc(), Comment.id.desc()).limit(limit + 1)
+
+    @staticmethod
+    def _trim(comments: list[Comment], limit: int, after: str | None) -> list[Comment]:
+        """Drop the look-ahead row from a page sorted oldest first"""
+        if len(comments) <= limit:
+            return comments
+        return comments[:limit] if after else comments[-limit:]
+
+    @staticmethod
+    def _window(
+        comments: list[Comment], has_more: bool, before: str | None, after: str | None, items: list
+    ) -> CursorPage:
+        """Cursors and has_older/has_newer for a page sorted oldest first"""
+        if not comments:
+            return CursorPage(items=items, older_cursor=before, newer_cursor=after)
+        return CursorPage(
+            items=items,
+            older_cursor=encode_cursor(comments[0].created_at, comments[0].id),
+            newer_cursor=encode_cursor(comments[-1].created_at, comments[-1].id),
+            has_older=True if after else has_more,
+            has_newer=has_more if after else before is not None,
+        )
+
+    async def get_task_comments_page(
+        self,
+        task_id: UUID,
+        limit: int = 50,
+        before: str | None = None,
+        after: str | None = None,
+    ) -> CursorPage[CommentResponse]:
+        """
+        Keyset page of a task's comments: newest first by default, then
+        `before` to scroll back and `after` to catch up.
+
+        Raises:
+            ValueError: If a cursor is malformed
+        """
+        result = await self.db.execute(
+            self._keyset(select(Comment).where(Comment.task_id == task_id), limit, before, after)
+        )
+        fetched = sorted(result.scalars().all(), key=lambda c: (c.created_at, c.id))
+        comments = self._trim(fetched, limit, after)
+
+        return self._window(
+            comments,
+            len(fetched) > limit,
+            before,
+            after,
+            [CommentResponse.model_validate(comment) for comment in comments],
+        )
+
+    async def get_task_thread(
+        self,
+        task_id: UUID,
+        current_user_id: UUID,
+        limit: int = 20,
+        before: str | None = None,
+        after: str | None = None,
+        replies_per_comment: int = 3,
+    ) -> CursorPage[CommentThreadItem]:
+        """
+        Keyset page of top-level comments, each with its first replies.
+
+        One query loads the page and, through a LATERAL join, the first
+        `replies_per_comment` replies of every comment on it; two more
+        attach reply counts and reactions. Further replies are loaded with
+        get_comment_replies(after=<cursor of the last embedded reply>).
+
+        Raises:
+            ValueError: If a cursor is malformed
+        """
+        page = self._keyset(
+            select(Comment).where(Comment.task_id == task_id, Comment.reply_to_id.is_(None)),
+            limit,
+            before,
+            after,
+        ).subquery("page")
+        parent = aliased(Comment, page)
+
+        if replies_per_comment > 0:
+            first_replies = (
+                select(Comment)
+                .where(Comment.reply_to_id == page.c.id)
+                .order_by(Comment.created_at, Comment.id)
+                .limit(replies_per_comment)
+                .lateral("first_replies")
+            )
+            reply = aliased(Comment, first_replies)
+            query = (
+                select(parent, reply)
+                .outerjoin(first_replies, true())
+                .order_by(
+                    page.c.created_at, page.c.id, first_replies.c.created_at, first_replies.c.id
+                )
+            )
+        else:
+            query = select(parent, literal(None)).order_by(page.c.created_at, page.c.id)
+
+        fetched: list[Comment] = []
+        replies: dict[UUID, list[Comment]] = {}
+        for parent_comment, reply_comment in (await self.db.execute(query)).all():
+            if parent_comment.id not in replies:
+                fetched.append(parent_comment)
+                replies[parent_comment.id] = []
+            if reply_comment is not None:
+                replies[parent_comment.id].append(reply_comment)
+
+        comments = self._trim(fetched, limit, after)
+        embedded = [r for comment in comments for r in replies[comment.id]]
+        details = await self.with_thread_details(comments + embedded, current_user_id)
+        by_id = {item.id: item for item in details}
+
+        items = []
+        for comment in comments:
+            item = by_id[comment.id]
+            item.replies = [by_id[r.id] for r in replies[comment.id]]
+            items.append(item)
+
+        return self._window(comments, len(fetched) > limit, before, after, items)
+
+    async def get_reply_counts(self, comment_ids: list[UUID]) -> dict[UUID, int]:
+        """Number of direct replies per comment, in one grouped query"""
+        counts = dict.fromkeys(comment_ids, 0)
+        if not comment_ids:
+            return counts
+        result = await self.db.execute(
+            select(Comment.reply_to_id, func.count())
+            .where(
+                Comment.reply_to_id
+                == any_(bindparam("b_comments", list(comment_ids), type_=ARRAY(Uuid)))
+            )
+            .group_by(Comment.reply_to_id)
+        )
+        counts.update(result.all())
+        return counts
+
+    async def with_thread_details(
+        self, comments: list[Comment], current_user_id: UUID
+    ) -> list[CommentThreadItem]:
+        """
+        Attach reply counts and reaction summaries to a page of comments.
+
+        Two grouped queries for the whole page, however many comments it has.
+        """
+        comment_ids = [comment.id for comment in comments]
+        reply_counts = await self.get_reply_counts(comment_ids)
+        reactions = await ReactionService(self.db).get_reactions_summaries(
+            comment_ids, current_user_id
+        )
+        return [
+            CommentThreadItem(
+                **CommentResponse.model_validate(comment).model_dump(),
+                reply_count=reply_counts[comment.id],
+                reactions=reactions[comment.id],
+            )
+            for comment in comments
+        ]
+
     async def create(
-        self, comment_data: CommentCreate, author_id: UUID, author_type: str = "user"
+        self,
+        comment_data: CommentCreate,
+        author_id: UUID,
+        author_type: str = "user",
+        notify_mentions: bool = True,
     ) -> Comment:
-        """Create new comment with @mention support"""
+        """
+        Create new comment with @mention support.
+
+        With notify_mentions=False the mentioned users are only recorded on
+        the comment; the caller fans out the notifications afterwards (e.g.
+        `notify_mentions_job` via BackgroundTasks).
+        """
         # Validate reply_to_id if provided
         if comment_data.reply_to_id:
             parent_comment = await self.get_by_id(comment_data.reply_to_id)
@@ -124,13 +349,14 @@ class CommentService:
 
         self.db.add(comment)
         await self.db.flush()
+        await counters.adjust(self.db, comment_data.task_id, comments_count=1)
 
         # Record history entry for comment creation
-        history_service = TaskHistoryService(self.db)
+        history_service = TaskHistoryService(self.db, self.uow)
         await history_service.create_entry(
             TaskHistoryCreate(
                 task_id=comment_data.task_id,
-                user_id=author_id,
+                changed_by_id=author_id,
                 action="commented",
                 field_name=None,
                 old_value=None,
@@ -139,11 +365,8 @@ class CommentService:
             )
         )
 
-        await self.db.commit()
-        await self.db.refresh(comment)
-
-        # Send notifications to mentioned users (after commit)
-        if mentioned_user_ids:
+        # Notify mentioned users in the same transaction as the comment
+        if mentioned_user_ids and notify_mentions:
             await self._notify_mentioned_users(
                 mentioned_user_ids=mentioned_user_ids,
                 task_id=comment_data.task_id,
@@ -151,6 +374,7 @@ class CommentService:
                 author_id=author_id,
             )
 
+        await self.uow.save()
         return comment
 
     async def _notify_mentioned_users(
@@ -168,17 +392,14 @@ class CommentService:
         result = await self.db.execute(select(Task.title).where(Task.id == task_id))
         task_title = result.scalar_one_or_none() or "Задача"
 
-        notification_service = NotificationService(self.db)
-
-        for user_id in mentioned_user_ids:
-            if user_id != author_id:  # Don't notify yourself
-                await notification_service.notify_task_mention(
-                    mentioned_user_id=user_id,
-                    task_id=task_id,
-                    task_title=task_title,
-                    mentioner_id=author_id,
-                    context=comment_content[:200],
-                )
+        notification_service = NotificationService(self.db, self.uow)
+        await notification_service.notify_task_mentions(
+            mentioned_user_ids=mentioned_user_ids,
+            task_id=task_id,
+            task_title=task_title,
+            mentioner_id=author_id,
+            context=comment_content[:200],
+        )
 
     async def update(
         self, comment_id: UUID, comment_data: CommentUpdate, user_id: UUID
@@ -209,8 +430,25 @@ class CommentService:
         if comment.author_id != user_id:
             raise ValueError("Only comment author can delete the comment")
 
+        # Attachments of the comment go with it (FK cascade)
+        from app.modules.documents.models import Document
+
+        result = await self.db.execute(
+            select(func.count(Document.id), func.coalesce(func.sum(Document.file_size), 0)).where(
+                Document.comment_id == comment_id
+            )
+        )
+        documents, documents_size = result.one()
+
         # Hard delete (comments are not soft-deleted in this version)
         await self.db.delete(comment)
+        await counters.adjust(
+            self.db,
+            comment.task_id,
+            comments_count=-1,
+            documents_count=-documents,
+            documents_size=-int(documents_size),
+        )
         await self.db.commit()
         return True
 
@@ -230,80 +468,136 @@ class CommentService:
     async def mark_comments_as_read(
         self, user_id: UUID, comment_ids: list[UUID]
     ) -> int:
-        """Mark comments as read for a user. Returns number of newly marked."""
-        if not comment_ids:
-            return 0
-
-        # Use insert with on_conflict_do_nothing for idempotency
-        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        """
+        Mark comments as read for a user.
 
-        values = [
-            {"user_id": user_id, "comment_id": cid, "read_at": datetime.utcnow()}
-            for cid in comment_ids
-        ]
+        Moves the user's watermark on each affected task forward to the
+        newest of the given comments (never backwards), which also marks
+        older comments on those tasks as read.
 
-        stmt = pg_insert(comment_read_status).values(values)
-        stmt = stmt.on_conflict_do_nothing()
+        Returns:
+            Number of tasks whose watermark moved
+        """
+        if not comment_ids:
+            return 0
 
-        result = await self.db.execute(stmt)
+        newest = (
+            select(
+                literal(user_id, PgUUID(as_uuid=True)).label("user_id"),
+                Comment.task_id,
+                func.max(Comment.created_at).label("read_at"),
+            )
+            .where(Comment.id == any_(bindparam("b_comments", comment_ids, type_=ARRAY(Uuid))))
+            .group_by(Comment.task_id)
+        )
+        result = await self.db.execute(
+            self._upsert_watermarks(
+                pg_insert(comment_read_watermarks).from_select(
+                    ["user_id", "task_id", "read_at"], newest
+                )
+            )
+        )
         await self.db.commit()
         return result.rowcount
 
     async def mark_task_comments_as_read(self, user_id: UUID, task_id: UUID) -> int:
-        """Mark all comments on a task as read for a user."""
-        # Get all comment IDs for the task
-        result = await self.db.execute(
-            select(Comment.id).where(Comment.task_id == task_id)
+        """
+        Mark all comments on a task as read for a user (one upsert).
+
+        The watermark moves to the newest created_at the database can see,
+        not to the time of this call, so comments posted afterwards stay
+        unread. created_at comes from the app clock at insert, though: a
+        comment stamped before the newest visible one but committed after
+        this call (a slow concurrent insert) counts as read.
+
+        Returns:
+            Number of comments that were unread before
+        """
+        counts = await self.get_unread_counts(user_id, [task_id])
+        newest = (
+            select(
+                literal(user_id, PgUUID(as_uuid=True)).label("user_id"),
+                Comment.task_id,
+                func.max(Comment.created_at).label("read_at"),
+            )
+            .where(Comment.task_id == task_id)
+            .group_by(Comment.task_id)
+        )
+        await self.db.execute(
+            self._upsert_watermarks(
+                pg_insert(comment_read_watermarks).from_select(
+                    ["user_id", "task_id", "read_at"], newest
+                )
+            )
+        )
+        await self.db.commit()
+        return counts[task_id]["unread"]
+
+    @staticmethod
+    def _upsert_watermarks(stmt):
+        """ON CONFLICT clause that only ever moves a watermark forward"""
+        return stmt.on_conflict_do_update(
+            index_elements=["user_id", "task_id"],
+            set_={"read_at": stmt.excluded.read_at},
+            where=comment_read_watermarks.c.read_at < stmt.excluded.read_at,
         )
-        comment_ids = [row[0] for row in result.all()]
 
-        if not comment_ids:
-            return 0
+    async def get_unread_counts(
+        self, user_id: UUID, task_ids: list[UUID]
+    ) -> dict[UUID, dict]:
+        """
+        Comment counts for many tasks in one query.
 
-        return await self.mark_comments_as_read(user_id, comment_ids)
+        A comment is unread when it was created after the user's watermark
+        for its task (or the user never opened the task). Own comments are
+        not counted as unread.
 
-    async def get_unread_comments_count(
-        self, user_id: UUID, task_id: UUID
-    ) -> dict:
-        """Get count of unread comments and unread mentions for a task."""
-        from sqlalchemy import and_, not_
+        Returns:
+            task_id -> {"total", "unread", "unread_mentions"}, for every
+            requested task (zeros when it has no comments)
+        """
+        counts = {
+            task_id: {"total": 0, "unread": 0, "unread_mentions": 0}
+            for task_id in task_ids
+        }
+        if not task_ids:
+            return counts
 
-        # Subquery for read comments
-        read_subq = select(comment_read_status.c.comment_id).where(
-            comment_read_status.c.user_id == user_id
+        watermarks = comment_read_watermarks
+        is_new = or_(
+            watermarks.c.read_at.is_(None), Comment.created_at > watermarks.c.read_at
         )
-
-        # Total unread comments
-        total_unread_result = await self.db.execute(
-            select(func.count(Comment.id)).where(
-                Comment.task_id == task_id,
-                ~Comment.id.in_(read_subq),
-                Comment.author_id != user_id,  # Don't count own comments
+        result = await self.db.execute(
+            select(
+                Comment.task_id,
+                func.count().label("total"),
+                func.count().filter(is_new, Comment.author_id != user_id).label("unread"),
+                func.count()
+                .filter(is_new, Comment.mentioned_user_ids.any(user_id))
+                .label("unread_mentions"),
             )
-        )
-        total_unread = total_unread_result.scalar() or 0
-
-        # Unread mentions (comments where user is mentioned and not read)
-        unread_mentions_result = await self.db.execute(
-            select(func.count(Comment.id)).where(
-                Comment.task_id == task_id,
-                ~Comment.id.in_(read_subq),
-                Comment.mentioned_user_ids.any(user_id),
+            .select_from(Comment)
+            .outerjoin(
+                watermarks,
+                and_(watermarks.c.task_id == Comment.task_id, watermarks.c.user_id == user_id),
             )
+            .where(Comment.task_id == any_(bindparam("b_tasks", list(task_ids), type_=ARRAY(Uuid))))
+            .group_by(Comment.task_id)
         )
-        unread_mentions = unread_mentions_result.scalar() or 0
-
-        # Total comments
-        total_result = await self.db.execute(
-            select(func.count(Comment.id)).where(Comment.task_id == task_id)
-        )
-        total = total_result.scalar() or 0
+        for row in result.all():
+            counts[row.task_id] = {
+                "total": row.total,
+                "unread": row.unread,
+                "unread_mentions": row.unread_mentions,
+            }
+        return counts
 
-        return {
-            "total": total,
-            "unread": total_unread,
-            "unread_mentions": unread_mentions,
-        }
+    async def get_unread_comments_count(
+        self, user_id: UUID, task_id: UUID
+    ) -> dict:
+        """Get count of unread comments and unread mentions for a task."""
+        counts = await self.get_unread_counts(user_id, [task_id])
+        return counts[task_id]
 
 
 class ReactionService:
@@ -316,31 +610,50 @@ class ReactionService:
         self, comment_id: UUID, current_user_id: UUID
     ) -> list[ReactionSummary]:
         """Get reactions summary grouped by emoji with counts and user lists"""
-        # Query all reactions for this comment
-        result = await self.db.execute(
-            select(CommentReaction)
-            .where(CommentReaction.comment_id == comment_id)
-            .order_by(CommentReaction.created_at)
-        )
-        reactions = result.scalars().all()
+        summaries = await self.get_reactions_summaries([comment_id], current_user_id)
+        return summaries[comment_id]
 
-        # Group by emoji
-        emoji_groups: dict[str, list[UUID]] = defaultdict(list)
-        for reaction in reactions:
-            emoji_groups[reaction.emoji].append(reaction.user_id)
+    async def get_reactions_summaries(
+        self, comment_ids: list[UUID], current_user_id: UUID
+    ) -> dict[UUID, list[ReactionSummary]]:
+        """
+        Reaction summaries for many comments in one grouped query.
+
+        Emojis are listed in the order they were first used on each comment,
+        users in the order they reacted.
+        """
+        summaries: dict[UUID, list[ReactionSummary]] = {
+            comment_id: [] for comment_id in comment_ids
+        }
+        if not comment_ids:
+            return summaries
 
-        # Build summary list
-        summaries = []
-        for emoji, user_ids in emoji_groups.items():
-            summaries.append(
+        first_used = func.min(CommentReaction.created_at)
+        result = await self.db.execute(
+            select(
+                CommentReaction.comment_id,
+                CommentReaction.emoji,
+                func.count().label("count"),
+                func.array_agg(
+                    aggregate_order_by(CommentReaction.user_id, CommentReaction.created_at)
+                ).label("user_ids"),
+            )
+            .where(
+                CommentReaction.comment_id
+                == any_(bindparam("b_comments", list(comment_ids), type_=ARRAY(Uuid)))
+            )
+            .group_by(CommentReaction.comment_id, CommentReaction.emoji)
+            .order_by(CommentReaction.comment_id, first_used)
+        )
+        for row in result.all():
+            summaries[row.comment_id].append(
                 ReactionSummary(
-                    emoji=emoji,
-                    count=len(user_ids),
-                    user_ids=user_ids,
-                    has_current_user=current_user_id in user_ids,
+                    emoji=row.emoji,
+                    count=row.count,
+                    user_ids=row.user_ids,
+                    has_current_user=current_user_id in row.user_ids,
                 )
             )
-
         return summaries
 
     async def toggle_reaction(
@@ -395,3 +708,18 @@ class ReactionService:
         )
         await self.db.commit()
         return result.rowcount > 0
+
+
+async def notify_mentions_job(
+    mentioned_user_ids: list[UUID], task_id: UUID, comment_content: str, author_id: UUID
+) -> None:
+    """Background task: notify users mentioned in a comment in its own session"""
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as db:
+        await CommentService(db)._notify_mentioned_users(
+            mentioned_user_ids=mentioned_user_ids,
+            task_id=task_id,
+            comment_content=comment_content,
+            author_id=author_id,
+        )
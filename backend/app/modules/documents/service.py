@@ -7,12 +7,13 @@ from datetime import datetime
 from typing import BinaryIO
 from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.storage import storage_service
 from app.modules.documents.models import Document
 from app.modules.documents.schemas import DocumentStats, DocumentUpdate
+from app.modules.tasks import counters
 
 
 class DocumentService:
@@ -96,6 +97,7 @@ class DocumentService:
         )
 
         self.db.add(document)
+        await counters.adjust(self.db, task_id, documents_count=1, documents_size=file_size)
         await self.db.commit()
         await self.db.refresh(document)
         return document
@@ -178,21 +180,17 @@ class DocumentService:
 
         # Delete from database
         await self.db.delete(document)
+        await counters.adjust(
+            self.db, document.task_id, documents_count=-1, documents_size=-document.file_size
+        )
         await self.db.commit()
         return True
 
     async def get_task_stats(self, task_id: UUID) -> DocumentStats:
-        """Get document statistics for a task"""
-        result = await self.db.execute(
-            select(
-                func.count(Document.id).label("count"),
-                func.sum(Document.file_size).label("total_size"),
-            ).where(Document.task_id == task_id)
-        )
-
-        row = result.one()
-        total_count = row.count or 0
-        total_size = row.total_size or 0
+        """Get document statistics for a task (maintained counters)"""
+        task_counts = (await counters.get_counters(self.db, [task_id]))[task_id]
+        total_count = task_counts["documents_count"]
+        total_size = task_counts["documents_size"]
         total_size_mb = round(total_size / (1024 * 1024), 2) if total_size > 0 else 0.0
 
         return DocumentStats(
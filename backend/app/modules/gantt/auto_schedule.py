@@ -0,0 +1,305 @@
+"""
+SmartTask360 — Automatic scheduling
+
+Two passes over planned task dates, both producing new dates without
+touching the database (GanttService turns them into a diff and applies it):
+
+1. Propagation: when a predecessor slips, push its successors later so
+   every FS/SS/FF/SF + lag constraint holds again. Vectorized per
+   topological level, like the CPM engine.
+2. Leveling (optional): a serial list scheduler. Tasks are taken in
+   priority order among those whose predecessors are placed, and each is
+   put at the first day where its assignee has spare capacity for the
+   whole bar. Capacity is tracked per user in NumPy day arrays; a task that
+   fits on its ready day is checked with one slice, otherwise finding a slot
+   is one vectorized scan instead of a day-by-day loop. Per-task bookkeeping
+   (dependency bounds, ready queue) runs on plain Python values, as the
+   per-call overhead of NumPy dominates at one task at a time.
+
+Dates are int64 minutes since the epoch. Tasks only ever move later, by
+whole days, keeping their length and time of day; fixed tasks never move.
+"""
+
+import heapq
+
+import numpy as np
+
+from app.modules.gantt.scheduling import FF, SF, SS, DependencyGraph, edge_positions
+
+MINUTES_PER_DAY = 24 * 60
+
+REASON_NONE = 0
+REASON_DEPENDENCY = 1
+REASON_RESOURCE = 2
+
+_EPOCH_DAY = np.datetime64("1970-01-01", "D")
+
+
+def _edge_bounds(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    durations: np.ndarray,
+    pred: np.ndarray,
+    succ: np.ndarray,
+    kind: np.ndarray,
+    lag: np.ndarray,
+) -> np.ndarray:
+    """Earliest successor start allowed by each edge"""
+    anchor = np.where((kind == SS) | (kind == SF), starts[pred], ends[pred])
+    bound = anchor + lag * MINUTES_PER_DAY
+    return bound - np.where((kind == FF) | (kind == SF), durations[succ], 0)
+
+
+def _shift_days(ready: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Whole days a task must move so it starts no earlier than `ready`"""
+    return np.maximum(0, -((starts - ready) // MINUTES_PER_DAY))
+
+
+def propagate_dates(
+    starts: np.ndarray, ends: np.ndarray, graph: DependencyGraph, fixed: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Push successors of slipped tasks later until all dependencies hold.
+
+    Returns:
+        (new starts, new ends); tasks on dependency cycles are left as is
+    """
+    starts = np.asarray(starts, dtype=np.int64).copy()
+    ends = np.asarray(ends, dtype=np.int64).copy()
+    durations = ends - starts
+    ready = np.full(graph.num_tasks, np.iinfo(np.int64).min, dtype=np.int64)
+
+    for level in graph.topological_levels()[1:]:
+        pos = edge_positions(graph.in_indptr, level)
+        succ = graph.in_succ[pos]
+        bounds = _edge_bounds(
+            starts, ends, durations, graph.in_pred[pos], succ, graph.in_type[pos], graph.in_lag[pos]
+        )
+        np.maximum.at(ready, succ, bounds)
+
+        shift = _shift_days(ready[level], starts[level]) * MINUTES_PER_DAY
+        shift[fixed[level]] = 0
+        starts[level] += shift
+        ends[level] += shift
+
+    return starts, ends
+
+
+def _sliding_max(values: np.ndarray, width: int) -> np.ndarray:
+    """Max of every window of `width` consecutive values (van Herk / Gil-Werman)"""
+    n = len(values)
+    blocks = -(-n // width)
+    padded = np.full(blocks * width, -np.inf)
+    padded[:n] = values
+    padded = padded.reshape(blocks, width)
+    prefix = np.maximum.accumulate(padded, axis=1).ravel()
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+    return np.maximum(suffix[: n - width + 1], prefix[width - 1 : n])
+
+
+class _CapacityProfile:
+    """Booked hours per user per day, growing on demand"""
+
+    def __init__(self, first_day: int, hours_per_day: float):
+        self.first_day = first_day
+        self.hours_per_day = hours_per_day
+        self.length = 0
+        self.horizon = 0  # Nothing is booked from this day on
+        self.workday = np.zeros(0, dtype=bool)
+        self.workdays_before = np.zeros(1, dtype=np.int64)
+        self.booked: dict[int, np.ndarray] = {}
+
+    def _ensure(self, length: int) -> None:
+        if length <= self.length:
+            return
+        length = max(length, self.length * 2, 64)
+        days = _EPOCH_DAY + np.arange(self.first_day, self.first_day + length)
+        self.workday = np.is_busday(days)
+        self.workdays_before = np.concatenate(([0], np.cumsum(self.workday)))
+        for user, row in self.booked.items():
+            self.booked[user] = np.concatenate([row, np.zeros(length - len(row))])
+        self.length = length
+
+    def _row(self, user: int) -> np.ndarray:
+        if user not in self.booked:
+            self.booked[user] = np.zeros(self.length)
+        return self.booked[user]
+
+    def first_fit(self, user: int, ready_day: int, span: int, hours: float) -> tuple[int, float]:
+        """
+        First working day >= ready_day where a bar covering [day, day + span]
+        fits the user's capacity.
+
+        Hours are spread evenly over the working days of the bar, so the
+        daily rate depends on where it lands.
+
+        Returns:
+            (day, hours per working day)
+        """
+        width = span + 1
+        self._ensure(ready_day + width)
+        row = self._row(user)
+
+        # Fast path: the bar fits on its ready day (booked hours are zero on
+        # non-working days, so the plain window max is the working-day max)
+        if self.workday[ready_day]:
+            count = int(self.workdays_before[ready_day + width] - self.workdays_before[ready_day])
+            rate = hours / max(count, 1)
+            limit = max(self.hours_per_day, rate) + 1e-9
+            if row[ready_day : ready_day + width].max() + rate <= limit:
+                return ready_day, rate
+
+        # Past the horizon the user is free; a week later there is a workday
+        last_start = max(ready_day, self.horizon) + 7
+        self._ensure(last_start + width)
+        workday = self.workday[ready_day : last_start + width]
+        row = self._row(user)[ready_day : last_start + width]
+        before = self.workdays_before[ready_day : last_start + width + 1]
+        counts = before[width:] - before[:-width]
+        rates = hours / np.maximum(counts, 1)
+        # A task heavier than a full day only fits on otherwise free days
+        limit = np.maximum(self.hours_per_day, rates) + 1e-9
+        fits = (_sliding_max(row, width) + rates <= limit) & workday[: len(counts)]
+        offset = int(np.argmax(fits))
+        return ready_day + offset, float(rates[offset])
+
+    def book(self, user: int, day: int, span: int, rate: float) -> None:
+        self._ensure(day + span + 1)
+        row = self._row(user)
+        row[day : day + span + 1] += rate * self.workday[day : day + span + 1]
+        self.horizon = max(self.horizon, day + span + 1)
+
+
+def level_resources(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    graph: DependencyGraph,
+    fixed: np.ndarray,
+    users: np.ndarray,
+    hours: np.ndarray,
+    priorities: np.ndarray,
+    hours_per_day: float = 8.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Priority-based serial list scheduling.
+
+    Args:
+        starts / ends: Current dates (minutes since epoch)
+        graph: Dependencies over the same task indices
+        fixed: Tasks that must not move (their load is still booked)
+        users: Assignee index per task, -1 for none
+        hours: Estimated hours per task (0 = no load)
+        priorities: Higher is scheduled first among ready tasks
+
+    Returns:
+        (new starts, new ends), respecting dependencies and capacity
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    new_starts = starts.copy()
+    new_ends = ends.copy()
+    if graph.num_tasks == 0:
+        return new_starts, new_ends
+
+    durations = ends - starts
+    start_days = starts // MINUTES_PER_DAY
+    spans = (ends // MINUTES_PER_DAY - start_days).astype(np.int64)
+    first_day = int(start_days.min())
+    profile = _CapacityProfile(first_day, hours_per_day)
+
+    # Fixed tasks keep their load where they are
+    loaded = (users >= 0) & (hours > 0)
+    for i in np.flatnonzero(fixed & loaded):
+        day = int(start_days[i]) - first_day
+        workdays = int(np.busday_count(_EPOCH_DAY + start_days[i], _EPOCH_DAY + start_days[i] + spans[i] + 1))
+        profile.book(int(users[i]), day, int(spans[i]), float(hours[i]) / max(1, workdays))
+
+    # Per-task values as Python lists - the loop below touches one task at a time
+    starts_list = starts.tolist()
+    ends_list = ends.tolist()
+    new_starts_list = list(starts_list)
+    new_ends_list = list(ends_list)
+    durations_list = durations.tolist()
+    start_days_list = start_days.tolist()
+    spans_list = spans.tolist()
+    users_list = np.asarray(users).tolist()
+    hours_list = np.asarray(hours, dtype=float).tolist()
+    priorities_list = np.asarray(priorities).tolist()
+    fixed_list = np.asarray(fixed).tolist()
+    loaded_list = loaded.tolist()
+    in_indptr = graph.in_indptr.tolist()
+    in_pred = graph.in_pred.tolist()
+    in_type = graph.in_type.tolist()
+    in_lag = graph.in_lag.tolist()
+    out_indptr = graph.out_indptr.tolist()
+    out_succ = graph.out_succ.tolist()
+
+    in_degree = np.diff(graph.in_indptr).tolist()
+    heap = [(-priorities_list[i], starts_list[i], i) for i, d in enumerate(in_degree) if d == 0]
+    heapq.heapify(heap)
+
+    while heap:
+        _, _, i = heapq.heappop(heap)
+
+        if not fixed_list[i]:
+            # Same rule as _edge_bounds / _shift_days, one edge at a time
+            shift = 0
+            if in_indptr[i] < in_indptr[i + 1]:
+                ready = None
+                for pos in range(in_indptr[i], in_indptr[i + 1]):
+                    pred, kind = in_pred[pos], in_type[pos]
+                    anchor = new_starts_list[pred] if kind == SS or kind == SF else new_ends_list[pred]
+                    bound = anchor + in_lag[pos] * MINUTES_PER_DAY
+                    if kind == FF or kind == SF:
+                        bound -= durations_list[i]
+                    ready = bound if ready is None else max(ready, bound)
+                shift = max(0, -((starts_list[i] - ready) // MINUTES_PER_DAY))
+
+            if loaded_list[i]:
+                ready_day = start_days_list[i] - first_day + shift
+                day, rate = profile.first_fit(users_list[i], ready_day, spans_list[i], hours_list[i])
+                profile.book(users_list[i], day, spans_list[i], rate)
+                shift = day - (start_days_list[i] - first_day)
+
+            new_starts_list[i] = starts_list[i] + shift * MINUTES_PER_DAY
+            new_ends_list[i] = ends_list[i] + shift * MINUTES_PER_DAY
+
+        for succ in out_succ[out_indptr[i] : out_indptr[i + 1]]:
+            in_degree[succ] -= 1
+            if in_degree[succ] == 0:
+                heapq.heappush(heap, (-priorities_list[succ], starts_list[succ], succ))
+
+    new_starts = np.array(new_starts_list, dtype=np.int64)
+    new_ends = np.array(new_ends_list, dtype=np.int64)
+    return new_starts, new_ends
+
+
+def auto_schedule(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    graph: DependencyGraph,
+    fixed: np.ndarray,
+    level: bool = False,
+    users: np.ndarray | None = None,
+    hours: np.ndarray | None = None,
+    priorities: np.ndarray | None = None,
+    hours_per_day: float = 8.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Propagate dependencies and optionally level resources.
+
+    Returns:
+        (new starts, new ends, reason per task: REASON_NONE / _DEPENDENCY / _RESOURCE)
+    """
+    propagated_starts, propagated_ends = propagate_dates(starts, ends, graph, fixed)
+    new_starts, new_ends = propagated_starts, propagated_ends
+
+    if level:
+        new_starts, new_ends = level_resources(
+            starts, ends, graph, fixed, users, hours, priorities, hours_per_day
+        )
+
+    reasons = np.full(graph.num_tasks, REASON_NONE, dtype=np.int8)
+    reasons[new_starts > starts] = REASON_DEPENDENCY
+    reasons[new_starts > propagated_starts] = REASON_RESOURCE
+    return new_starts, new_ends, reasons
@@ -4,20 +4,27 @@ SmartTask360 — Gantt Chart API Routes
 API endpoints for task dependencies, baselines, and Gantt data.
 """
 
+from datetime import date, datetime, timedelta
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.dependencies import get_current_user, get_db
 from app.modules.gantt.schemas import (
+    AutoScheduleRequest,
+    AutoScheduleResponse,
+    BaselineVarianceResponse,
     BulkBaselineCreate,
     BulkDependencyCreate,
     GanttDateUpdate,
     GanttResponse,
+    ProjectBaselineCreate,
     TaskBaselineResponse,
     TaskDependencyCreate,
     TaskDependencyResponse,
+    WorkloadResponse,
 )
 from app.modules.gantt.service import GanttService
 from app.modules.tasks.schemas import TaskResponse
@@ -32,16 +39,83 @@ router = APIRouter(prefix="/gantt", tags=["gantt"])
 @router.get("/projects/{project_id}", response_model=GanttResponse)
 async def get_gantt_data(
     project_id: UUID,
+    start: datetime | None = Query(None, description="Visible window start"),
+    end: datetime | None = Query(None, description="Visible window end"),
+    depth: int | None = Query(
+        None, ge=0, description="Expand hierarchy to this depth; deeper tasks are rolled up"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> GanttResponse:
     """
     Get Gantt chart data for a project.
 
-    Returns all tasks with calculated dates, dependencies, and critical path.
+    Returns tasks with calculated dates, dependencies, and critical path.
+    Without parameters all tasks are returned. With a date window only rows
+    overlapping it are returned; with a depth, subtrees below that depth are
+    collapsed into summary bars on their ancestor row.
     """
     service = GanttService(db)
-    return await service.get_gantt_data(project_id)
+    return await service.get_gantt_data(
+        project_id, window_start=start, window_end=end, max_depth=depth
+    )
+
+
+@router.post("/projects/{project_id}/auto-schedule", response_model=AutoScheduleResponse)
+async def auto_schedule_project(
+    project_id: UUID,
+    data: AutoScheduleRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> AutoScheduleResponse:
+    """
+    Automatically reschedule a project.
+
+    Pushes successors of slipped tasks later until every dependency holds
+    and, with level_resources, delays lower-priority tasks of overallocated
+    assignees. Returns the list of moved tasks; with apply=true the new
+    dates are saved in one bulk update.
+    """
+    service = GanttService(db)
+    return await service.auto_schedule_project(
+        project_id, level_resources=data.level_resources, apply=data.apply
+    )
+
+
+@router.get("/workload", response_model=WorkloadResponse)
+async def get_workload(
+    project_id: UUID | None = Query(None, description="Load from this project's tasks"),
+    department_id: UUID | None = Query(None, description="Load of this department's members"),
+    start: date | None = Query(None, description="First day (default: today)"),
+    end: date | None = Query(None, description="Last day (default: start + 12 weeks)"),
+    granularity: str = Query("day", pattern=r"^(day|week)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> WorkloadResponse:
+    """
+    Resource workload histogram.
+
+    Spreads estimated hours of each task over its working days and returns
+    allocated hours, capacity, utilization and overallocation per user.
+    """
+    if project_id is None and department_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="project_id or department_id is required",
+        )
+
+    start = start or date.today()
+    end = end or start + timedelta(weeks=12)
+    if end < start or (end - start).days >= settings.WORKLOAD_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must be 1-{settings.WORKLOAD_MAX_DAYS} days",
+        )
+
+    service = GanttService(db)
+    return await service.get_workload(
+        start, end, project_id=project_id, department_id=department_id, granularity=granularity
+    )
 
 
 # ============== Dependencies ==============
@@ -75,19 +149,16 @@ async def create_dependencies_bulk(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> list[TaskDependencyResponse]:
-    """Create multiple task dependencies at once."""
+    """
+    Create multiple task dependencies at once.
+
+    The whole batch is validated against the dependency graph in one pass
+    and written in a single transaction; invalid items are skipped.
+    """
     service = GanttService(db)
-    results = []
-    errors = []
-
-    for dep_data in data.dependencies:
-        try:
-            result = await service.create_dependency(dep_data, current_user.id)
-            results.append(result)
-        except ValueError as e:
-            errors.append(
-                f"Dependency {dep_data.predecessor_id} -> {dep_data.successor_id}: {str(e)}"
-            )
+    results, errors = await service.create_dependencies_bulk(
+        data.dependencies, current_user.id
+    )
 
     if errors and not results:
         raise HTTPException(
@@ -164,6 +235,36 @@ async def create_baselines_bulk(
     )
 
 
+@router.post(
+    "/projects/{project_id}/baselines", response_model=list[TaskBaselineResponse]
+)
+async def create_project_baseline(
+    project_id: UUID,
+    data: ProjectBaselineCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> list[TaskBaselineResponse]:
+    """Baseline every task of a project in one statement."""
+    service = GanttService(db)
+    return await service.create_project_baseline(
+        project_id, data.baseline_name, current_user.id
+    )
+
+
+@router.get("/projects/{project_id}/variance", response_model=BaselineVarianceResponse)
+async def get_baseline_variance(
+    project_id: UUID,
+    baseline_number: int | None = Query(
+        None, ge=1, description="Baseline to compare with (default: latest per task)"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> BaselineVarianceResponse:
+    """Compare current planned dates and hours with a baseline."""
+    service = GanttService(db)
+    return await service.get_baseline_variance(project_id, baseline_number)
+
+
 @router.get("/tasks/{task_id}/baselines", response_model=list[TaskBaselineResponse])
 async def get_task_baselines(
     task_id: UUID,
@@ -0,0 +1,318 @@
+"""
+SmartTask360 — Cached project schedules
+
+Per-project CPM schedules kept in process memory, like the task similarity
+index. GanttService builds a schedule on first use; edits are then applied
+incrementally instead of recomputing the whole project:
+
+- ES/EF are re-propagated only downstream of the changed task
+- LS/LF are re-propagated only upstream of it
+
+Latest dates are stored as the distance to the project end ("tail"), so a
+change of the overall project duration shifts them all without touching
+them. Every change bumps `ProjectSchedule.version`.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+
+from app.modules.gantt.scheduling import (
+    DEPENDENCY_TYPE_CODES,
+    FF,
+    FS,
+    SF,
+    SS,
+    DependencyGraph,
+    Schedule,
+    compute_schedule,
+    task_duration,
+)
+
+
+class ProjectSchedule:
+    """
+    Mutable CPM schedule of one project.
+
+    Adjacency lists (index -> [(other index, type code, lag)]) back the
+    incremental updates; full recomputes go through the array engine.
+    """
+
+    def __init__(
+        self,
+        task_ids: list[UUID],
+        durations: list[int],
+        edges: list[tuple[int, int, int, int]],
+    ):
+        self.task_ids = task_ids
+        self.index = {task_id: i for i, task_id in enumerate(task_ids)}
+        self.durations = np.asarray(durations, dtype=np.int64)
+        self.out_edges: list[list[tuple[int, int, int]]] = [[] for _ in task_ids]
+        self.in_edges: list[list[tuple[int, int, int]]] = [[] for _ in task_ids]
+        for pred, succ, kind, lag in edges:
+            self.out_edges[pred].append((succ, kind, lag))
+            self.in_edges[succ].append((pred, kind, lag))
+
+        self.version = 0
+        self.recompute()
+
+    @classmethod
+    def from_tasks(cls, tasks: list[Any], dependencies: list[Any]) -> "ProjectSchedule":
+        """Build from task rows and dependency rows (edges outside the task set are ignored)"""
+        task_ids = [t.id for t in tasks]
+        index = {task_id: i for i, task_id in enumerate(task_ids)}
+        edges = [
+            (
+                index[dep.predecessor_id],
+                index[dep.successor_id],
+                DEPENDENCY_TYPE_CODES.get(dep.dependency_type, FS),
+                dep.lag_days,
+            )
+            for dep in dependencies
+            if dep.predecessor_id in index and dep.successor_id in index
+        ]
+        return cls(task_ids, [task_duration(t) for t in tasks], edges)
+
+    def __contains__(self, task_id: UUID) -> bool:
+        return task_id in self.index
+
+    # ============== Full Recompute ==============
+
+    def recompute(self) -> None:
+        """Recompute everything with the array engine"""
+        edges = [
+            (pred, succ, kind, lag)
+            for pred, out in enumerate(self.out_edges)
+            for succ, kind, lag in out
+        ]
+        if edges:
+            preds, succs, kinds, lags = (np.asarray(col, dtype=np.int64) for col in zip(*edges))
+        else:
+            preds = succs = kinds = lags = np.empty(0, dtype=np.int64)
+
+        schedule = compute_schedule(
+            self.durations, DependencyGraph(len(self.task_ids), preds, succs, kinds, lags)
+        )
+        self.es = schedule.es
+        self.ef = schedule.ef
+        self.tail = schedule.project_duration - schedule.lf
+        self.scheduled = schedule.scheduled
+        self.order = schedule.order
+        self.rank = np.empty(len(self.task_ids), dtype=np.int64)
+        self.rank[self.order] = np.arange(len(self.order))
+        self.is_acyclic = bool(self.scheduled.all())
+        self.version += 1
+
+    # ============== Incremental Updates ==============
+
+    def set_duration(self, task_id: UUID, duration: int) -> int:
+        """
+        Change a task's duration.
+
+        Returns:
+            Number of tasks whose values were re-evaluated
+        """
+        v = self.index[task_id]
+        if self.durations[v] == duration:
+            return 0
+
+        self.durations[v] = duration
+        if not self.is_acyclic:
+            self.recompute()
+            return len(self.task_ids)
+
+        self.version += 1
+        upstream = {v} | {pred for pred, _, _ in self.in_edges[v]}
+        return self._propagate_forward({v}) + self._propagate_backward(upstream)
+
+    def add_dependency(
+        self, predecessor_id: UUID, successor_id: UUID, dependency_type: str, lag_days: int
+    ) -> int:
+        """Add an edge; falls back to a full recompute if it breaks the topological order"""
+        pred, succ = self.index[predecessor_id], self.index[successor_id]
+        kind = DEPENDENCY_TYPE_CODES.get(dependency_type, FS)
+        self.out_edges[pred].append((succ, kind, lag_days))
+        self.in_edges[succ].append((pred, kind, lag_days))
+
+        if not self.is_acyclic or self.rank[pred] > self.rank[succ]:
+            self.recompute()
+            return len(self.task_ids)
+
+        self.version += 1
+        return self._propagate_forward({succ}) + self._propagate_backward({pred})
+
+    def remove_dependency(self, predecessor_id: UUID, successor_id: UUID) -> int:
+        """Remove an edge (removal never invalidates the topological order)"""
+        pred, succ = self.index[predecessor_id], self.index[successor_id]
+        self.out_edges[pred] = [e for e in self.out_edges[pred] if e[0] != succ]
+        self.in_edges[succ] = [e for e in self.in_edges[succ] if e[0] != pred]
+
+        if not self.is_acyclic:
+            self.recompute()
+            return len(self.task_ids)
+
+        self.version += 1
+        return self._propagate_forward({succ}) + self._propagate_backward({pred})
+
+    def _propagate_forward(self, seeds: set[int]) -> int:
+        """Re-evaluate ES/EF of seeds and everything downstream whose values change"""
+        es, ef, d, rank = self.es, self.ef, self.durations, self.rank
+        heap = [(rank[v], v) for v in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        evaluated = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            queued.discard(v)
+            evaluated += 1
+
+            start = 0
+            for pred, kind, lag in self.in_edges[v]:
+                if kind == SS:
+                    bound = es[pred] + lag
+                elif kind == FF:
+                    bound = ef[pred] + lag - d[v]
+                elif kind == SF:
+                    bound = es[pred] + lag - d[v]
+                else:
+                    bound = ef[pred] + lag
+                if bound > start:
+                    start = bound
+
+            if start == es[v] and start + d[v] == ef[v]:
+                continue
+            es[v] = start
+            ef[v] = start + d[v]
+
+            for succ, _, _ in self.out_edges[v]:
+                if succ not in queued:
+                    queued.add(succ)
+                    heapq.heappush(heap, (rank[succ], succ))
+
+        return evaluated
+
+    def _propagate_backward(self, seeds: set[int]) -> int:
+        """Re-evaluate the tail (project end - LF) of seeds and everything upstream"""
+        tail, d, rank = self.tail, self.durations, self.rank
+        heap = [(-rank[v], v) for v in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        evaluated = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            queued.discard(v)
+            evaluated += 1
+
+            value = 0
+            for succ, kind, lag in self.out_edges[v]:
+                if kind == SS:
+                    bound = tail[succ] + d[succ] - d[v] + lag
+                elif kind == FF:
+                    bound = tail[succ] + lag
+                elif kind == SF:
+                    bound = tail[succ] - d[v] + lag
+                else:
+                    bound = tail[succ] + d[succ] + lag
+                if bound > value:
+                    value = bound
+
+            if value == tail[v]:
+                continue
+            tail[v] = value
+
+            for pred, _, _ in self.in_edges[v]:
+                if pred not in queued:
+                    queued.add(pred)
+                    heapq.heappush(heap, (-rank[pred], pred))
+
+        return evaluated
+
+    # ============== Results ==============
+
+    def to_schedule(self) -> Schedule:
+        """Snapshot as a Schedule (ES/EF/LS/LF arrays)"""
+        project_duration = int(self.ef[self.scheduled].max()) if self.order.size else 0
+        lf = project_duration - self.tail
+        return Schedule(
+            es=self.es.copy(),
+            ef=self.ef.copy(),
+            ls=lf - self.durations,
+            lf=lf,
+            scheduled=self.scheduled.copy(),
+            order=self.order.copy(),
+            project_duration=project_duration,
+        )
+
+
+class ProjectScheduleCache:
+    """
+    Process-wide map of project ID -> ProjectSchedule.
+
+    Each project also has a generation counter, bumped on invalidation, so a
+    schedule built from data loaded before a concurrent edit is not stored.
+    """
+
+    def __init__(self):
+        self._schedules: dict[UUID, ProjectSchedule] = {}
+        self._generations: dict[UUID, int] = defaultdict(int)
+
+    def get(self, project_id: UUID) -> ProjectSchedule | None:
+        return self._schedules.get(project_id)
+
+    def generation(self, project_id: UUID) -> int:
+        return self._generations[project_id]
+
+    def store(self, project_id: UUID, schedule: ProjectSchedule, generation: int) -> bool:
+        """Cache a freshly built schedule unless the project changed meanwhile"""
+        if self._generations[project_id] != generation:
+            return False
+        self._schedules[project_id] = schedule
+        return True
+
+    def invalidate(self, project_id: UUID | None) -> None:
+        if project_id is None:
+            return
+        self._generations[project_id] += 1
+        self._schedules.pop(project_id, None)
+
+    def task_changed(self, task: Any) -> None:
+        """
+        Apply a task edit.
+
+        Duration changes are propagated incrementally; a task that was added,
+        deleted or moved to another project invalidates the affected schedules.
+        """
+        for project_id, schedule in list(self._schedules.items()):
+            if task.id in schedule and (project_id != task.project_id or task.is_deleted):
+                self.invalidate(project_id)
+
+        if task.project_id is None:
+            return
+        schedule = self._schedules.get(task.project_id)
+        if schedule is None or task.is_deleted:
+            return
+        if task.id not in schedule:
+            self.invalidate(task.project_id)
+            return
+        schedule.set_duration(task.id, task_duration(task))
+
+    def dependency_added(
+        self, predecessor_id: UUID, successor_id: UUID, dependency_type: str, lag_days: int
+    ) -> None:
+        for schedule in self._schedules.values():
+            if predecessor_id in schedule and successor_id in schedule:
+                schedule.add_dependency(predecessor_id, successor_id, dependency_type, lag_days)
+
+    def dependency_removed(self, predecessor_id: UUID, successor_id: UUID) -> None:
+        for schedule in self._schedules.values():
+            if predecessor_id in schedule and successor_id in schedule:
+                schedule.remove_dependency(predecessor_id, successor_id)
+
+
+# Process-wide cache shared by all requests
+project_schedule_cache = ProjectScheduleCache()
@@ -0,0 +1,343 @@
+"""
+SmartTask360 — Scheduling engine (Critical Path Method)
+
+Array-backed CPM over dense integer task indices. Dependencies are stored
+as CSR adjacency arrays (out-edges grouped by predecessor, in-edges grouped
+by successor). An iterative Kahn sort splits the graph into topological
+levels; forward and backward passes then process one whole level per
+NumPy operation, so there is no recursion. Levels narrower than
+NARROW_LEVEL (long chains) are walked with a plain loop over the CSR
+arrays instead, where a dozen NumPy calls per level would cost more than
+the work itself.
+
+Dependency semantics (d = duration, all values in days):
+- FS: ES(succ) >= EF(pred) + lag
+- SS: ES(succ) >= ES(pred) + lag
+- FF: EF(succ) >= EF(pred) + lag
+- SF: EF(succ) >= ES(pred) + lag
+
+Tasks on (or downstream of) a dependency cycle cannot be ordered; they are
+reported with `scheduled == False` and never marked critical.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+DEPENDENCY_TYPE_CODES = {"FS": 0, "SS": 1, "FF": 2, "SF": 3}
+
+FS, SS, FF, SF = 0, 1, 2, 3
+
+# Levels with fewer tasks are processed by scalar loops
+NARROW_LEVEL = 64
+
+
+def effective_start(task) -> datetime | None:
+    """Get effective start date for Gantt display"""
+    # Priority: planned_start_date > started_at > created_at
+    if task.planned_start_date:
+        return task.planned_start_date
+    if task.started_at:
+        return task.started_at
+    # Fallback to created_at only if we have an end date
+    if task.planned_end_date or task.due_date:
+        return task.created_at
+    return None
+
+
+def effective_end(task) -> datetime | None:
+    """Get effective end date for Gantt display"""
+    # Priority: planned_end_date > due_date > completed_at
+    if task.planned_end_date:
+        return task.planned_end_date
+    if task.due_date:
+        return task.due_date
+    if task.completed_at:
+        return task.completed_at
+    # Calculate from estimated hours if we have a start
+    start = effective_start(task)
+    if start and task.estimated_hours:
+        # Assume 8 hours per day
+        days = int(task.estimated_hours / 8) or 1
+        return start + timedelta(days=days)
+    return None
+
+
+def task_duration(task) -> int:
+    """Task duration in whole days for CPM"""
+    if task.is_milestone:
+        return 0
+    if task.estimated_hours:
+        # Assume 8 hours per day
+        return max(1, int(task.estimated_hours / 8))
+    start = effective_start(task)
+    end = effective_end(task)
+    if start and end:
+        return max(1, (end - start).days)
+    # Default duration
+    return 1
+
+
+def edge_positions(indptr: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Positions of all CSR entries belonging to `nodes`, concatenated"""
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.cumsum(counts) - counts
+    return np.arange(total, dtype=np.int64) + np.repeat(starts - offsets, counts)
+
+
+class DependencyGraph:
+    """
+    Task dependency graph in CSR form.
+
+    Edge arrays are kept twice, sorted by predecessor (out_*) and by
+    successor (in_*), so both passes can gather a level's edges by slicing.
+    """
+
+    def __init__(
+        self,
+        num_tasks: int,
+        predecessors: np.ndarray,
+        successors: np.ndarray,
+        types: np.ndarray,
+        lags: np.ndarray,
+    ):
+        self.num_tasks = num_tasks
+        predecessors = np.asarray(predecessors, dtype=np.int64)
+        successors = np.asarray(successors, dtype=np.int64)
+        types = np.asarray(types, dtype=np.int8)
+        lags = np.asarray(lags, dtype=np.int64)
+
+        out_order = np.argsort(predecessors, kind="stable")
+        self.out_indptr = self._indptr(predecessors[out_order], num_tasks)
+        self.out_pred = predecessors[out_order]
+        self.out_succ = successors[out_order]
+        self.out_type = types[out_order]
+        self.out_lag = lags[out_order]
+
+        in_order = np.argsort(successors, kind="stable")
+        self.in_indptr = self._indptr(successors[in_order], num_tasks)
+        self.in_pred = predecessors[in_order]
+        self.in_succ = successors[in_order]
+        self.in_type = types[in_order]
+        self.in_lag = lags[in_order]
+
+    @staticmethod
+    def _indptr(sorted_keys: np.ndarray, num_tasks: int) -> np.ndarray:
+        counts = np.bincount(sorted_keys, minlength=num_tasks)
+        indptr = np.zeros(num_tasks + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return indptr
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.out_succ)
+
+    @classmethod
+    def from_edges(
+        cls, num_tasks: int, edges: list[tuple[int, int, str, int]]
+    ) -> "DependencyGraph":
+        """Build from (predecessor index, successor index, 'FS'|'SS'|'FF'|'SF', lag_days)"""
+        if not edges:
+            empty = np.empty(0, dtype=np.int64)
+            return cls(num_tasks, empty, empty, empty, empty)
+
+        preds, succs, types, lags = zip(*edges)
+        return cls(
+            num_tasks,
+            np.fromiter(preds, dtype=np.int64, count=len(edges)),
+            np.fromiter(succs, dtype=np.int64, count=len(edges)),
+            np.fromiter(
+                (DEPENDENCY_TYPE_CODES.get(t, FS) for t in types),
+                dtype=np.int8,
+                count=len(edges),
+            ),
+            np.fromiter(lags, dtype=np.int64, count=len(edges)),
+        )
+
+    def topological_levels(self) -> list[np.ndarray]:
+        """
+        Iterative Kahn sort grouped by level.
+
+        Every task in level k only has predecessors in levels < k. Tasks
+        that never reach in-degree zero (cycles) are left out.
+        """
+        in_degree = np.diff(self.in_indptr)
+        frontier = np.flatnonzero(in_degree == 0)
+        in_degree = in_degree.copy()
+
+        levels = []
+        while frontier.size:
+            levels.append(frontier)
+            if frontier.size < NARROW_LEVEL:
+                frontier = self._next_frontier_scalar(frontier, in_degree)
+                continue
+            targets = self.out_succ[edge_positions(self.out_indptr, frontier)]
+            if not targets.size:
+                break
+            np.subtract.at(in_degree, targets, 1)
+            targets = np.unique(targets)
+            frontier = targets[in_degree[targets] == 0]
+        return levels
+
+    def _next_frontier_scalar(self, frontier: np.ndarray, in_degree: np.ndarray) -> np.ndarray:
+        """Kahn step for a narrow frontier, one edge at a time"""
+        out_indptr, out_succ = self.out_indptr, self.out_succ
+        ready = []
+        for node in frontier.tolist():
+            for target in out_succ[out_indptr[node] : out_indptr[node + 1]].tolist():
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.append(target)
+        ready.sort()
+        return np.array(ready, dtype=np.int64)
+
+
+class Schedule:
+    """CPM result; all arrays are indexed by task index"""
+
+    def __init__(
+        self,
+        es: np.ndarray,
+        ef: np.ndarray,
+        ls: np.ndarray,
+        lf: np.ndarray,
+        scheduled: np.ndarray,
+        order: np.ndarray,
+        project_duration: int,
+    ):
+        self.es = es
+        self.ef = ef
+        self.ls = ls
+        self.lf = lf
+        self.scheduled = scheduled
+        self.order = order
+        self.project_duration = project_duration
+
+    @property
+    def total_float(self) -> np.ndarray:
+        return self.ls - self.es
+
+    @property
+    def critical(self) -> np.ndarray:
+        """Boolean mask of zero-float tasks"""
+        return self.scheduled & (self.total_float == 0)
+
+    def critical_path(self) -> np.ndarray:
+        """Indices of critical tasks in topological order"""
+        return self.order[self.critical[self.order]]
+
+
+def compute_schedule(durations: np.ndarray, graph: DependencyGraph) -> Schedule:
+    """
+    Run forward and backward CPM passes.
+
+    Args:
+        durations: Task durations in days (int array of length graph.num_tasks)
+        graph: Dependency graph over the same task indices
+
+    Returns:
+        Schedule with ES/EF/LS/LF per task (start of project = day 0)
+    """
+    n = graph.num_tasks
+    durations = np.asarray(durations, dtype=np.int64)
+    levels = graph.topological_levels()
+    order = np.concatenate(levels) if levels else np.empty(0, dtype=np.int64)
+
+    scheduled = np.zeros(n, dtype=bool)
+    scheduled[order] = True
+
+    # Forward pass: ES = max(0, constraints from predecessors)
+    es = np.zeros(n, dtype=np.int64)
+    ef = durations.copy()
+    for level in levels[1:]:
+        if level.size < NARROW_LEVEL:
+            _forward_scalar(level, graph, durations, es, ef)
+            continue
+        pos = edge_positions(graph.in_indptr, level)
+        pred = graph.in_pred[pos]
+        succ = graph.in_succ[pos]
+        kind = graph.in_type[pos]
+        lag = graph.in_lag[pos]
+
+        pred_bound = np.where((kind == SS) | (kind == SF), es[pred], ef[pred])
+        candidate = pred_bound + lag
+        candidate -= np.where((kind == FF) | (kind == SF), durations[succ], 0)
+        np.maximum.at(es, succ, candidate)
+        ef[level] = es[level] + durations[level]
+
+    project_duration = int(ef[scheduled].max()) if order.size else 0
+
+    # Backward pass: LF = min(project end, constraints from successors)
+    lf = np.full(n, project_duration, dtype=np.int64)
+    ls = lf - durations
+    for level in reversed(levels[:-1]):
+        if level.size < NARROW_LEVEL:
+            _backward_scalar(level, graph, durations, scheduled, ls, lf)
+            continue
+        pos = edge_positions(graph.out_indptr, level)
+        pos = pos[scheduled[graph.out_succ[pos]]]
+        pred = graph.out_pred[pos]
+        succ = graph.out_succ[pos]
+        kind = graph.out_type[pos]
+        lag = graph.out_lag[pos]
+
+        succ_bound = np.where((kind == FS) | (kind == SS), ls[succ], lf[succ])
+        candidate = succ_bound - lag
+        candidate += np.where((kind == SS) | (kind == SF), durations[pred], 0)
+        np.minimum.at(lf, pred, candidate)
+        ls[level] = lf[level] - durations[level]
+
+    return Schedule(
+        es=es,
+        ef=ef,
+        ls=ls,
+        lf=lf,
+        scheduled=scheduled,
+        order=order,
+        project_duration=project_duration,
+    )
+
+
+def _forward_scalar(
+    level: np.ndarray, graph: DependencyGraph, durations: np.ndarray, es: np.ndarray, ef: np.ndarray
+) -> None:
+    """Forward pass over a narrow level, same rules as the vectorized branch"""
+    for succ in level.tolist():
+        start = 0
+        for pos in range(graph.in_indptr[succ], graph.in_indptr[succ + 1]):
+            pred = graph.in_pred[pos]
+            kind = graph.in_type[pos]
+            bound = (es[pred] if kind == SS or kind == SF else ef[pred]) + graph.in_lag[pos]
+            if kind == FF or kind == SF:
+                bound -= durations[succ]
+            start = max(start, bound)
+        es[succ] = start
+        ef[succ] = start + durations[succ]
+
+
+def _backward_scalar(
+    level: np.ndarray,
+    graph: DependencyGraph,
+    durations: np.ndarray,
+    scheduled: np.ndarray,
+    ls: np.ndarray,
+    lf: np.ndarray,
+) -> None:
+    """Backward pass over a narrow level, same rules as the vectorized branch"""
+    for pred in level.tolist():
+        finish = lf[pred]
+        for pos in range(graph.out_indptr[pred], graph.out_indptr[pred + 1]):
+            succ = graph.out_succ[pos]
+            if not scheduled[succ]:
+                continue
+            kind = graph.out_type[pos]
+            bound = (ls[succ] if kind == FS or kind == SS else lf[succ]) - graph.out_lag[pos]
+            if kind == SS or kind == SF:
+                bound += durations[pred]
+            finish = min(finish, bound)
+        lf[pred] = finish
+        ls[pred] = finish - durations[pred]
@@ -4,7 +4,7 @@ SmartTask360 — Gantt Chart Schemas
 Pydantic schemas for task dependencies, baselines, and Gantt data.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 from typing import Any
@@ -90,6 +90,44 @@ class TaskBaselineResponse(BaseModel):
     created_by: UUID | None
 
 
+class ProjectBaselineCreate(BaseModel):
+    """Schema for baselining all tasks of a project"""
+
+    baseline_name: str | None = Field(None, max_length=100)
+
+
+class TaskBaselineVariance(BaseModel):
+    """Baseline vs current plan for one task (variance > 0 = later/more)"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    task_id: UUID
+    title: str
+    baseline_number: int
+
+    baseline_start_date: datetime | None
+    baseline_end_date: datetime | None
+    baseline_hours: Decimal | None
+
+    planned_start_date: datetime | None
+    planned_end_date: datetime | None
+    estimated_hours: Decimal | None
+
+    start_variance_days: float | None
+    end_variance_days: float | None
+    hours_variance: Decimal | None
+
+
+class BaselineVarianceResponse(BaseModel):
+    """Baseline vs current plan for a project"""
+
+    project_id: UUID
+    baseline_number: int | None  # None = latest baseline of each task
+    tasks: list[TaskBaselineVariance]
+    slipped_count: int = 0  # Tasks whose end date moved later
+    max_end_variance_days: float | None = None
+
+
 # ============== Gantt Data Schemas ==============
 
 
@@ -127,6 +165,20 @@ class GanttTaskData(BaseModel):
     # Critical path flag
     is_critical: bool = False
 
+    # CPM schedule in days from project start (None if on a dependency cycle)
+    early_start: int | None = None
+    early_finish: int | None = None
+    late_start: int | None = None
+    late_finish: int | None = None
+    total_float: int | None = None
+
+    # Rolled-up summary of a collapsed subtree (see max_depth)
+    is_collapsed: bool = False
+    collapsed_count: int = 0
+    summary_start_date: datetime | None = None
+    summary_end_date: datetime | None = None
+    has_critical_descendants: bool = False
+
     # Assignee info
     assignee_id: UUID | None
     assignee_name: str | None = None
@@ -146,6 +198,9 @@ class GanttResponse(BaseModel):
     # Critical path task IDs
     critical_path: list[UUID] = []
 
+    # Version of the cached project schedule the CPM values come from
+    schedule_version: int | None = None
+
 
 class BulkDependencyCreate(BaseModel):
     """Schema for creating multiple dependencies at once"""
@@ -173,3 +228,65 @@ class CriticalPathResponse(BaseModel):
     critical_path: list[UUID]  # Task IDs in order
     total_duration_days: int
     tasks: list[GanttTaskData]
+
+
+# ============== Workload Schemas ==============
+
+
+class UserWorkload(BaseModel):
+    """Per-period load of one user (lists follow WorkloadResponse.periods)"""
+
+    user_id: UUID
+    user_name: str | None = None
+
+    allocated_hours: list[float]
+    capacity_hours: list[float]
+    utilization: list[float]  # allocated / capacity
+    overallocated_hours: list[float]  # hours above capacity
+
+    total_allocated_hours: float
+    total_overallocated_hours: float
+    peak_utilization: float
+
+
+class WorkloadResponse(BaseModel):
+    """Resource workload histogram"""
+
+    granularity: str  # day | week
+    start_date: date
+    end_date: date
+    periods: list[date]  # Period start dates
+    users: list[UserWorkload]
+
+
+# ============== Auto-Scheduling Schemas ==============
+
+
+class AutoScheduleRequest(BaseModel):
+    """Options for automatic scheduling of a project"""
+
+    level_resources: bool = False  # Also resolve assignee overallocation
+    apply: bool = False  # False = preview only
+
+
+class AutoScheduleChange(BaseModel):
+    """A task moved by auto-scheduling"""
+
+    task_id: UUID
+    title: str
+    old_start_date: datetime
+    old_end_date: datetime
+    new_start_date: datetime
+    new_end_date: datetime
+    shift_days: int
+    reason: str  # dependency | resource
+
+
+class AutoScheduleResponse(BaseModel):
+    """Diff produced by auto-scheduling"""
+
+    project_id: UUID
+    applied: bool
+    level_resources: bool
+    tasks_considered: int
+    changes: list[AutoScheduleChange]
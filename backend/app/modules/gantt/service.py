@@ -4,26 +4,64 @@ SmartTask360 — Gantt Chart Service
 Business logic for task dependencies, baselines, and critical path calculation.
 """
 
+import asyncio
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import and_, delete, func, select
+import numpy as np
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    String,
+    Uuid,
+    and_,
+    any_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.types import TaskPriority, TaskStatus
+from app.modules.gantt.auto_schedule import (
+    MINUTES_PER_DAY,
+    REASON_RESOURCE,
+    auto_schedule,
+)
 from app.modules.gantt.models import TaskBaseline, TaskDependency
+from app.modules.gantt.schedule_cache import ProjectSchedule, project_schedule_cache
+from app.modules.gantt.scheduling import DependencyGraph, effective_end, effective_start
 from app.modules.gantt.schemas import (
+    AutoScheduleChange,
+    AutoScheduleResponse,
+    BaselineVarianceResponse,
     DependencyType,
     GanttDateUpdate,
     GanttResponse,
     GanttTaskData,
     TaskBaselineCreate,
     TaskBaselineResponse,
+    TaskBaselineVariance,
     TaskDependencyBrief,
     TaskDependencyCreate,
     TaskDependencyResponse,
+    UserWorkload,
+    WorkloadResponse,
 )
+from app.modules.gantt.workload import compute_workload
 from app.modules.tasks.models import Task
 from app.modules.users.models import User
 
@@ -65,8 +103,94 @@ class GanttService:
         await self.db.commit()
         await self.db.refresh(dependency)
 
+        project_schedule_cache.dependency_added(
+            dependency.predecessor_id,
+            dependency.successor_id,
+            dependency.dependency_type,
+            dependency.lag_days,
+        )
+
         return TaskDependencyResponse.model_validate(dependency)
 
+    async def create_dependencies_bulk(
+        self, items: list[TaskDependencyCreate], user_id: UUID
+    ) -> tuple[list[TaskDependencyResponse], list[str]]:
+        """
+        Create multiple dependencies, validating the whole batch in one pass.
+
+        Task existence, duplicates and cycles are checked against data loaded
+        with a fixed number of queries; dependencies accepted earlier in the
+        batch count when checking later ones. Valid dependencies are written
+        with one INSERT ... RETURNING and a single commit.
+
+        Returns:
+            (created dependencies, error messages for rejected items)
+        """
+        if not items:
+            return [], []
+
+        task_ids = {d.predecessor_id for d in items} | {d.successor_id for d in items}
+        result = await self.db.execute(select(Task.id).where(Task.id.in_(task_ids)))
+        existing_tasks = set(result.scalars().all())
+
+        result = await self.db.execute(
+            select(TaskDependency.predecessor_id, TaskDependency.successor_id).where(
+                and_(
+                    TaskDependency.predecessor_id.in_({d.predecessor_id for d in items}),
+                    TaskDependency.successor_id.in_({d.successor_id for d in items}),
+                )
+            )
+        )
+        existing_pairs = {(row.predecessor_id, row.successor_id) for row in result}
+
+        graph = await self._load_downstream_graph({d.successor_id for d in items})
+
+        rows = []
+        errors = []
+        for data in items:
+            label = f"Dependency {data.predecessor_id} -> {data.successor_id}"
+            if data.predecessor_id not in existing_tasks:
+                errors.append(f"{label}: Predecessor task {data.predecessor_id} not found")
+                continue
+            if data.successor_id not in existing_tasks:
+                errors.append(f"{label}: Successor task {data.successor_id} not found")
+                continue
+            if (data.predecessor_id, data.successor_id) in existing_pairs:
+                errors.append(f"{label}: Dependency already exists")
+                continue
+            if self._is_reachable(graph, data.successor_id, data.predecessor_id):
+                errors.append(f"{label}: This dependency would create a circular reference")
+                continue
+
+            graph[data.predecessor_id].add(data.successor_id)
+            existing_pairs.add((data.predecessor_id, data.successor_id))
+            rows.append(
+                {
+                    "predecessor_id": data.predecessor_id,
+                    "successor_id": data.successor_id,
+                    "dependency_type": data.dependency_type.value,
+                    "lag_days": data.lag_days,
+                    "created_by": user_id,
+                }
+            )
+
+        dependencies = []
+        if rows:
+            result = await self.db.scalars(
+                insert(TaskDependency).returning(TaskDependency, sort_by_parameter_order=True), rows
+            )
+            dependencies = result.all()
+            await self.db.commit()
+            for dependency in dependencies:
+                project_schedule_cache.dependency_added(
+                    dependency.predecessor_id,
+                    dependency.successor_id,
+                    dependency.dependency_type,
+                    dependency.lag_days,
+                )
+
+        return [TaskDependencyResponse.model_validate(d) for d in dependencies], errors
+
     async def delete_dependency(
         self, predecessor_id: UUID, successor_id: UUID
     ) -> bool:
@@ -79,6 +203,8 @@ class GanttService:
         )
         result = await self.db.execute(stmt)
         await self.db.commit()
+        if result.rowcount > 0:
+            project_schedule_cache.dependency_removed(predecessor_id, successor_id)
         return result.rowcount > 0
 
     async def get_task_dependencies(
@@ -111,27 +237,56 @@ class GanttService:
         self, predecessor_id: UUID, successor_id: UUID
     ) -> bool:
         """Check if adding this dependency would create a cycle"""
-        # Use BFS to check if successor can reach predecessor
-        visited = set()
-        queue = [successor_id]
+        # The edge closes a cycle if predecessor is reachable from successor
+        graph = await self._load_downstream_graph({successor_id})
+        return self._is_reachable(graph, successor_id, predecessor_id)
 
-        while queue:
-            current = queue.pop(0)
-            if current == predecessor_id:
-                return True
+    async def _load_downstream_graph(
+        self, start_ids: set[UUID]
+    ) -> dict[UUID, set[UUID]]:
+        """
+        Load every dependency edge reachable from start_ids in one query.
 
-            if current in visited:
-                continue
-            visited.add(current)
+        Uses a recursive CTE walking predecessor -> successor; UNION (not
+        UNION ALL) makes it terminate even if the stored graph has a cycle.
 
-            # Get all successors of current task
-            stmt = select(TaskDependency.successor_id).where(
-                TaskDependency.predecessor_id == current
+        Returns:
+            Adjacency map: predecessor_id -> set of successor_ids
+        """
+        edges = (
+            select(TaskDependency.predecessor_id, TaskDependency.successor_id)
+            .where(TaskDependency.predecessor_id.in_(start_ids))
+            .cte("reachable_edges", recursive=True)
+        )
+        edges = edges.union(
+            select(TaskDependency.predecessor_id, TaskDependency.successor_id).join(
+                edges, TaskDependency.predecessor_id == edges.c.successor_id
             )
-            result = await self.db.execute(stmt)
-            successors = result.scalars().all()
-            queue.extend(successors)
+        )
+        result = await self.db.execute(select(edges.c.predecessor_id, edges.c.successor_id))
+
+        graph: dict[UUID, set[UUID]] = defaultdict(set)
+        for pred_id, succ_id in result:
+            graph[pred_id].add(succ_id)
+        return graph
 
+    @staticmethod
+    def _is_reachable(
+        graph: dict[UUID, set[UUID]], source_id: UUID, target_id: UUID
+    ) -> bool:
+        """Iterative DFS over an adjacency map"""
+        if source_id == target_id:
+            return True
+
+        visited = {source_id}
+        stack = [source_id]
+        while stack:
+            for next_id in graph.get(stack.pop(), ()):
+                if next_id == target_id:
+                    return True
+                if next_id not in visited:
+                    visited.add(next_id)
+                    stack.append(next_id)
         return False
 
     # ============== Baselines ==============
@@ -171,20 +326,155 @@ class GanttService:
     async def create_bulk_baselines(
         self, task_ids: list[UUID], baseline_name: str | None, user_id: UUID
     ) -> list[TaskBaselineResponse]:
-        """Create baselines for multiple tasks at once"""
-        baselines = []
-        for task_id in task_ids:
-            try:
-                baseline = await self.create_baseline(
-                    TaskBaselineCreate(task_id=task_id, baseline_name=baseline_name),
-                    user_id,
-                )
-                baselines.append(baseline)
-            except ValueError:
-                # Skip tasks that don't exist
-                continue
+        """Create baselines for multiple tasks at once (tasks that don't exist are skipped)"""
+        if not task_ids:
+            return []
+        return await self._insert_baselines(Task.id.in_(task_ids), baseline_name, user_id)
+
+    async def create_project_baseline(
+        self, project_id: UUID, baseline_name: str | None, user_id: UUID
+    ) -> list[TaskBaselineResponse]:
+        """Baseline every non-deleted task of a project"""
+        return await self._insert_baselines(
+            and_(Task.project_id == project_id, Task.is_deleted == False),
+            baseline_name,
+            user_id,
+        )
+
+    async def _insert_baselines(
+        self, task_filter: Any, baseline_name: str | None, user_id: UUID
+    ) -> list[TaskBaselineResponse]:
+        """
+        Snapshot all tasks matching task_filter with one INSERT ... SELECT.
+
+        Each task gets its own next baseline number (max existing + 1, from
+        a grouped join), so numbering matches create_baseline().
+        """
+        latest = (
+            select(
+                TaskBaseline.task_id,
+                func.max(TaskBaseline.baseline_number).label("max_number"),
+            )
+            .where(TaskBaseline.task_id.in_(select(Task.id).where(task_filter)))
+            .group_by(TaskBaseline.task_id)
+            .subquery()
+        )
+        rows = (
+            select(
+                func.gen_random_uuid(),
+                Task.id,
+                func.coalesce(latest.c.max_number, 0) + 1,
+                literal(baseline_name, String),
+                Task.planned_start_date,
+                Task.planned_end_date,
+                Task.estimated_hours,
+                func.timezone("utc", func.now()),
+                literal(user_id, Uuid),
+            )
+            .select_from(Task)
+            .outerjoin(latest, latest.c.task_id == Task.id)
+            .where(task_filter)
+        )
+        columns = TaskBaseline.__table__.c
+        stmt = (
+            insert(TaskBaseline)
+            .from_select(
+                [
+                    columns.id,
+                    columns.task_id,
+                    columns.baseline_number,
+                    columns.baseline_name,
+                    columns.planned_start_date,
+                    columns.planned_end_date,
+                    columns.estimated_hours,
+                    columns.created_at,
+                    columns.created_by,
+                ],
+                rows,
+            )
+            .returning(*columns)
+        )
+        result = await self.db.execute(stmt)
+        baselines = [TaskBaselineResponse.model_validate(row) for row in result.all()]
+        await self.db.commit()
         return baselines
 
+    async def get_baseline_variance(
+        self, project_id: UUID, baseline_number: int | None = None
+    ) -> BaselineVarianceResponse:
+        """
+        Compare current planned dates/hours with a baseline, computed in SQL.
+
+        Uses the given baseline number, or each task's latest baseline.
+        Tasks without a matching baseline are not included.
+        """
+        project_filter = and_(Task.project_id == project_id, Task.is_deleted == False)
+
+        ranked = (
+            select(
+                TaskBaseline.task_id,
+                TaskBaseline.baseline_number,
+                TaskBaseline.planned_start_date,
+                TaskBaseline.planned_end_date,
+                TaskBaseline.estimated_hours,
+                func.row_number()
+                .over(
+                    partition_by=TaskBaseline.task_id,
+                    order_by=TaskBaseline.baseline_number.desc(),
+                )
+                .label("rank"),
+            )
+            .join(Task, Task.id == TaskBaseline.task_id)
+            .where(project_filter)
+        )
+        if baseline_number is not None:
+            ranked = ranked.where(TaskBaseline.baseline_number == baseline_number)
+        ranked = ranked.subquery()
+
+        def days_between(later, earlier):
+            return func.round(
+                cast(func.extract("epoch", later - earlier) / 86400, Numeric), 2
+            )
+
+        stmt = (
+            select(
+                Task.id.label("task_id"),
+                Task.title,
+                ranked.c.baseline_number,
+                ranked.c.planned_start_date.label("baseline_start_date"),
+                ranked.c.planned_end_date.label("baseline_end_date"),
+                ranked.c.estimated_hours.label("baseline_hours"),
+                Task.planned_start_date,
+                Task.planned_end_date,
+                Task.estimated_hours,
+                days_between(
+                    Task.planned_start_date, ranked.c.planned_start_date
+                ).label("start_variance_days"),
+                days_between(
+                    Task.planned_end_date, ranked.c.planned_end_date
+                ).label("end_variance_days"),
+                (Task.estimated_hours - ranked.c.estimated_hours).label("hours_variance"),
+            )
+            .join(ranked, and_(ranked.c.task_id == Task.id, ranked.c.rank == 1))
+            .where(project_filter)
+            .order_by(Task.path)
+        )
+        result = await self.db.execute(stmt)
+        tasks = [TaskBaselineVariance.model_validate(row) for row in result.all()]
+
+        return BaselineVarianceResponse(
+            project_id=project_id,
+            baseline_number=baseline_number,
+            tasks=tasks,
+            slipped_count=sum(
+                1 for t in tasks if t.end_variance_days is not None and t.end_variance_days > 0
+            ),
+            max_end_variance_days=max(
+                (t.end_variance_days for t in tasks if t.end_variance_days is not None),
+                default=None,
+            ),
+        )
+
     async def get_task_baselines(self, task_id: UUID) -> list[TaskBaselineResponse]:
         """Get all baselines for a task"""
         stmt = (
@@ -207,21 +497,117 @@ class GanttService:
 
     # ============== Gantt Data ==============
 
-    async def get_gantt_data(self, project_id: UUID) -> GanttResponse:
-        """Get Gantt chart data for a project"""
-        # Get all tasks for project
-        stmt = (
-            select(Task)
-            .where(
-                and_(
-                    Task.project_id == project_id,
-                    Task.is_deleted == False,
+    async def get_gantt_data(
+        self,
+        project_id: UUID,
+        window_start: datetime | None = None,
+        window_end: datetime | None = None,
+        max_depth: int | None = None,
+    ) -> GanttResponse:
+        """
+        Get Gantt chart data for a project.
+
+        Args:
+            window_start/window_end: Only return rows whose bar (or collapsed
+                subtree) overlaps this range; undated rows are always returned
+            max_depth: Expand the hierarchy down to this depth; deeper tasks
+                are rolled up into a summary bar on their ancestor at max_depth
+
+        The critical path and CPM values always come from the cached
+        full-project schedule, regardless of what is visible.
+        """
+        # Task dates are stored as naive UTC
+        window_start, window_end = (
+            d.astimezone(timezone.utc).replace(tzinfo=None) if d and d.tzinfo else d
+            for d in (window_start, window_end)
+        )
+
+        start_expr, end_expr = self._effective_date_columns()
+        bar_end = func.coalesce(end_expr, start_expr)
+        project_filter = and_(Task.project_id == project_id, Task.is_deleted == False)
+        is_windowed = window_start is not None or window_end is not None
+
+        def overlaps_window(start, end):
+            conditions = []
+            if window_end is not None:
+                conditions.append(start <= window_end)
+            if window_start is not None:
+                conditions.append(end >= window_start)
+            return or_(start.is_(None), and_(*conditions))
+
+        # Critical path and per-task schedule from the cached project schedule
+        full_load = not is_windowed and max_depth is None
+        if full_load:
+            # Everything is visible anyway - build the schedule from these rows
+            result = await self.db.execute(
+                select(Task).where(project_filter).order_by(Task.path)
+            )
+            tasks = list(result.scalars().all())
+            deps_result = await self.db.execute(
+                select(TaskDependency).where(
+                    TaskDependency.successor_id.in_([t.id for t in tasks])
                 )
             )
-            .order_by(Task.path)
-        )
-        result = await self.db.execute(stmt)
-        tasks = result.scalars().all()
+            all_deps = list(deps_result.scalars().all())
+            project_schedule = await self.get_project_schedule(
+                project_id, tasks, all_deps
+            )
+        else:
+            project_schedule = await self.get_project_schedule(project_id)
+
+        schedule = project_schedule.to_schedule()
+        critical_path = [project_schedule.task_ids[i] for i in schedule.critical_path()]
+        critical_set = set(critical_path)
+
+        # Roll up subtrees below max_depth into their ancestor at max_depth
+        summaries: dict[UUID, Any] = {}
+        if max_depth is not None:
+            # Literal offsets keep the GROUP BY expression identical to the SELECT one
+            ancestor_label = cast(
+                func.subpath(Task.path, literal_column(str(int(max_depth))), literal_column("1")),
+                String,
+            )
+            rollup_stmt = (
+                select(
+                    ancestor_label.label("ancestor"),
+                    func.count().label("task_count"),
+                    func.min(start_expr).label("start"),
+                    func.max(bar_end).label("end"),
+                    func.bool_or(
+                        Task.id == any_(bindparam("critical_ids", critical_path, type_=ARRAY(Uuid)))
+                    ).label("has_critical"),
+                )
+                .where(and_(project_filter, Task.depth > max_depth))
+                .group_by(ancestor_label)
+            )
+            if is_windowed:
+                rollup_stmt = rollup_stmt.having(
+                    overlaps_window(func.min(start_expr), func.max(bar_end))
+                )
+            for row in (await self.db.execute(rollup_stmt)).all():
+                summaries[UUID(row.ancestor.replace("_", "-"))] = row
+
+        if not full_load:
+            stmt = select(Task).where(project_filter).order_by(Task.path)
+            if max_depth is not None:
+                stmt = stmt.where(Task.depth <= max_depth)
+            if is_windowed:
+                stmt = stmt.where(
+                    or_(
+                        overlaps_window(start_expr, bar_end),
+                        Task.id.in_(list(summaries)),
+                    )
+                )
+            result = await self.db.execute(stmt)
+            tasks = list(result.scalars().all())
+            all_deps = []
+            if tasks:
+                deps_result = await self.db.execute(
+                    select(TaskDependency).where(
+                        TaskDependency.successor_id.in_([t.id for t in tasks])
+                    )
+                )
+                all_deps = list(deps_result.scalars().all())
 
         if not tasks:
             return GanttResponse(
@@ -229,19 +615,10 @@ class GanttService:
                 project_id=project_id,
                 min_date=None,
                 max_date=None,
-                critical_path=[],
+                critical_path=critical_path,
+                schedule_version=project_schedule.version,
             )
 
-        # Get all task IDs
-        task_ids = [t.id for t in tasks]
-
-        # Get dependencies for all tasks
-        deps_stmt = select(TaskDependency).where(
-            TaskDependency.successor_id.in_(task_ids)
-        )
-        deps_result = await self.db.execute(deps_stmt)
-        all_deps = deps_result.scalars().all()
-
         # Group dependencies by successor
         deps_by_successor: dict[UUID, list[TaskDependencyBrief]] = defaultdict(list)
         for dep in all_deps:
@@ -254,7 +631,7 @@ class GanttService:
             )
 
         # Get assignee names
-        assignee_ids = [t.assignee_id for t in tasks if t.assignee_id]
+        assignee_ids = {t.assignee_id for t in tasks if t.assignee_id}
         assignee_names: dict[UUID, str] = {}
         if assignee_ids:
             users_stmt = select(User).where(User.id.in_(assignee_ids))
@@ -262,10 +639,6 @@ class GanttService:
             users = users_result.scalars().all()
             assignee_names = {u.id: u.name for u in users}
 
-        # Calculate critical path
-        critical_path = await self._calculate_critical_path(tasks, all_deps)
-        critical_set = set(critical_path)
-
         # Build Gantt task data
         gantt_tasks = []
         min_date = None
@@ -275,18 +648,22 @@ class GanttService:
             # Calculate effective dates
             start_date = self._get_effective_start(task)
             end_date = self._get_effective_end(task)
+            summary = summaries.get(task.id)
 
-            # Track min/max dates
-            if start_date:
-                if min_date is None or start_date < min_date:
-                    min_date = start_date
-            if end_date:
-                if max_date is None or end_date > max_date:
-                    max_date = end_date
+            # Track min/max dates (including collapsed subtrees)
+            for value in (start_date, summary.start if summary else None):
+                if value and (min_date is None or value < min_date):
+                    min_date = value
+            for value in (end_date, summary.end if summary else None):
+                if value and (max_date is None or value > max_date):
+                    max_date = value
 
             # Calculate progress
             progress = self._calculate_progress(task)
 
+            index = project_schedule.index.get(task.id)
+            is_scheduled = index is not None and bool(schedule.scheduled[index])
+
             gantt_task = GanttTaskData(
                 id=task.id,
                 title=task.title,
@@ -306,6 +683,18 @@ class GanttService:
                 depth=task.depth,
                 dependencies=deps_by_successor.get(task.id, []),
                 is_critical=task.id in critical_set,
+                early_start=int(schedule.es[index]) if is_scheduled else None,
+                early_finish=int(schedule.ef[index]) if is_scheduled else None,
+                late_start=int(schedule.ls[index]) if is_scheduled else None,
+                late_finish=int(schedule.lf[index]) if is_scheduled else None,
+                total_float=int(schedule.ls[index] - schedule.es[index])
+                if is_scheduled
+                else None,
+                is_collapsed=summary is not None,
+                collapsed_count=summary.task_count if summary else 0,
+                summary_start_date=summary.start if summary else None,
+                summary_end_date=summary.end if summary else None,
+                has_critical_descendants=bool(summary.has_critical) if summary else False,
                 assignee_id=task.assignee_id,
                 assignee_name=assignee_names.get(task.assignee_id)
                 if task.assignee_id
@@ -319,36 +708,43 @@ class GanttService:
             min_date=min_date,
             max_date=max_date,
             critical_path=critical_path,
+            schedule_version=project_schedule.version,
+        )
+
+    def _effective_date_columns(self) -> tuple[Any, Any]:
+        """SQL equivalents of effective_start() / effective_end()"""
+        start = func.coalesce(
+            Task.planned_start_date,
+            Task.started_at,
+            case(
+                (
+                    or_(Task.planned_end_date.isnot(None), Task.due_date.isnot(None)),
+                    Task.created_at,
+                ),
+            ),
         )
+        # Assume 8 hours per day
+        estimated_days = cast(func.greatest(func.floor(Task.estimated_hours / 8), 1), Integer)
+        end = func.coalesce(
+            Task.planned_end_date,
+            Task.due_date,
+            Task.completed_at,
+            case(
+                (
+                    Task.estimated_hours > 0,
+                    start + func.make_interval(0, 0, 0, estimated_days),
+                ),
+            ),
+        )
+        return start, end
 
     def _get_effective_start(self, task: Task) -> datetime | None:
         """Get effective start date for Gantt display"""
-        # Priority: planned_start_date > started_at > created_at
-        if task.planned_start_date:
-            return task.planned_start_date
-        if task.started_at:
-            return task.started_at
-        # Fallback to created_at only if we have an end date
-        if task.planned_end_date or task.due_date:
-            return task.created_at
-        return None
+        return effective_start(task)
 
     def _get_effective_end(self, task: Task) -> datetime | None:
         """Get effective end date for Gantt display"""
-        # Priority: planned_end_date > due_date > completed_at
-        if task.planned_end_date:
-            return task.planned_end_date
-        if task.due_date:
-            return task.due_date
-        if task.completed_at:
-            return task.completed_at
-        # Calculate from estimated hours if we have a start
-        start = self._get_effective_start(task)
-        if start and task.estimated_hours:
-            # Assume 8 hours per day
-            days = int(task.estimated_hours / 8) or 1
-            return start + timedelta(days=days)
-        return None
+        return effective_end(task)
 
     def _calculate_progress(self, task: Task) -> int:
         """Calculate task progress percentage"""
@@ -365,142 +761,62 @@ class GanttService:
 
     # ============== Critical Path Method (CPM) ==============
 
-    async def _calculate_critical_path(
-        self, tasks: list[Task], dependencies: list[TaskDependency]
-    ) -> list[UUID]:
+    async def get_project_schedule(
+        self,
+        project_id: UUID,
+        tasks: list[Task] | None = None,
+        dependencies: list[TaskDependency] | None = None,
+    ) -> ProjectSchedule:
         """
-        Calculate critical path using CPM algorithm.
+        Get the cached CPM schedule of a project, building it on a miss.
 
-        The critical path is the longest path through the project,
-        determining the minimum project duration.
+        Callers that already loaded the project's tasks and dependencies can
+        pass them to avoid reloading; a cached schedule whose task set no
+        longer matches them is rebuilt.
         """
-        if not tasks:
-            return []
-
-        # Build task lookup and duration map
-        task_map = {t.id: t for t in tasks}
-        task_ids = set(task_map.keys())
-
-        # Calculate duration for each task (in days)
-        durations: dict[UUID, int] = {}
-        for task in tasks:
-            if task.is_milestone:
-                durations[task.id] = 0
-            elif task.estimated_hours:
-                # Assume 8 hours per day
-                durations[task.id] = max(1, int(task.estimated_hours / 8))
-            else:
-                # Default duration
-                start = self._get_effective_start(task)
-                end = self._get_effective_end(task)
-                if start and end:
-                    durations[task.id] = max(1, (end - start).days)
-                else:
-                    durations[task.id] = 1
-
-        # Build dependency graph
-        predecessors: dict[UUID, list[tuple[UUID, str, int]]] = defaultdict(list)
-        successors: dict[UUID, list[tuple[UUID, str, int]]] = defaultdict(list)
-
-        for dep in dependencies:
-            if dep.predecessor_id in task_ids and dep.successor_id in task_ids:
-                predecessors[dep.successor_id].append(
-                    (dep.predecessor_id, dep.dependency_type, dep.lag_days)
-                )
-                successors[dep.predecessor_id].append(
-                    (dep.successor_id, dep.dependency_type, dep.lag_days)
+        schedule = project_schedule_cache.get(project_id)
+        if schedule is not None and (
+            tasks is None
+            or (
+                len(schedule.task_ids) == len(tasks)
+                and all(t.id in schedule for t in tasks)
+            )
+        ):
+            return schedule
+
+        generation = project_schedule_cache.generation(project_id)
+        if tasks is None:
+            # Only the columns CPM durations are derived from
+            result = await self.db.execute(
+                select(
+                    Task.id,
+                    Task.is_milestone,
+                    Task.estimated_hours,
+                    Task.planned_start_date,
+                    Task.planned_end_date,
+                    Task.due_date,
+                    Task.started_at,
+                    Task.completed_at,
+                    Task.created_at,
+                ).where(and_(Task.project_id == project_id, Task.is_deleted == False))
+            )
+            tasks = result.all()
+        if dependencies is None:
+            result = await self.db.execute(
+                select(
+                    TaskDependency.predecessor_id,
+                    TaskDependency.successor_id,
+                    TaskDependency.dependency_type,
+                    TaskDependency.lag_days,
                 )
+                .join(Task, Task.id == TaskDependency.successor_id)
+                .where(and_(Task.project_id == project_id, Task.is_deleted == False))
+            )
+            dependencies = result.all()
 
-        # Forward pass - calculate earliest start (ES) and earliest finish (EF)
-        es: dict[UUID, int] = {}  # Earliest start
-        ef: dict[UUID, int] = {}  # Earliest finish
-
-        # Find tasks with no predecessors (start tasks)
-        start_tasks = [t.id for t in tasks if t.id not in predecessors]
-
-        # Topological sort for forward pass
-        visited = set()
-        order = []
-
-        def visit(task_id: UUID):
-            if task_id in visited:
-                return
-            visited.add(task_id)
-            for succ_id, _, _ in successors.get(task_id, []):
-                if succ_id in task_ids:
-                    visit(succ_id)
-            order.append(task_id)
-
-        for start in start_tasks:
-            visit(start)
-        order.reverse()
-
-        # Calculate ES and EF
-        for task_id in order:
-            if task_id not in predecessors:
-                es[task_id] = 0
-            else:
-                max_ef = 0
-                for pred_id, dep_type, lag in predecessors[task_id]:
-                    if pred_id not in ef:
-                        continue
-                    if dep_type == "FS":
-                        # Finish-to-Start: successor starts after predecessor finishes
-                        max_ef = max(max_ef, ef[pred_id] + lag)
-                    elif dep_type == "SS":
-                        # Start-to-Start: both start together (plus lag)
-                        max_ef = max(max_ef, es.get(pred_id, 0) + lag)
-                    elif dep_type == "FF":
-                        # Finish-to-Finish: both finish together
-                        max_ef = max(max_ef, ef[pred_id] - durations[task_id] + lag)
-                    elif dep_type == "SF":
-                        # Start-to-Finish: successor finishes when predecessor starts
-                        max_ef = max(
-                            max_ef, es.get(pred_id, 0) - durations[task_id] + lag
-                        )
-                es[task_id] = max(0, max_ef)
-            ef[task_id] = es[task_id] + durations[task_id]
-
-        # Find project duration
-        project_duration = max(ef.values()) if ef else 0
-
-        # Backward pass - calculate latest start (LS) and latest finish (LF)
-        ls: dict[UUID, int] = {}  # Latest start
-        lf: dict[UUID, int] = {}  # Latest finish
-
-        # Find tasks with no successors (end tasks)
-        end_tasks = [t.id for t in tasks if t.id not in successors]
-
-        # Calculate LS and LF (reverse order)
-        for task_id in reversed(order):
-            if task_id not in successors or task_id in end_tasks:
-                lf[task_id] = project_duration
-            else:
-                min_ls = project_duration
-                for succ_id, dep_type, lag in successors[task_id]:
-                    if succ_id not in ls:
-                        continue
-                    if dep_type == "FS":
-                        min_ls = min(min_ls, ls[succ_id] - lag)
-                    elif dep_type == "SS":
-                        min_ls = min(min_ls, ls[succ_id] + durations[task_id] - lag)
-                    elif dep_type == "FF":
-                        min_ls = min(min_ls, lf[succ_id] - lag)
-                    elif dep_type == "SF":
-                        min_ls = min(min_ls, lf[succ_id] + durations[task_id] - lag)
-                lf[task_id] = min_ls
-            ls[task_id] = lf[task_id] - durations[task_id]
-
-        # Calculate float (slack) and identify critical path
-        # Critical tasks have zero float (ES == LS)
-        critical_tasks = []
-        for task_id in order:
-            if task_id in es and task_id in ls:
-                slack = ls[task_id] - es[task_id]
-                if slack == 0:
-                    critical_tasks.append(task_id)
-
-        return critical_tasks
+        schedule = ProjectSchedule.from_tasks(tasks, dependencies)
+        project_schedule_cache.store(project_id, schedule, generation)
+        return schedule
 
     # ============== Date Updates ==============
 
@@ -520,4 +836,257 @@ class GanttService:
         task.updated_at = datetime.utcnow()
         await self.db.commit()
         await self.db.refresh(task)
+
+        # Re-propagates only the affected part of the cached schedule
+        project_schedule_cache.task_changed(task)
         return task
+
+    # ============== Auto-Scheduling ==============
+
+    async def auto_schedule_project(
+        self, project_id: UUID, level_resources: bool = False, apply: bool = False
+    ) -> AutoScheduleResponse:
+        """
+        Shift planned dates so dependencies hold, optionally leveling assignees.
+
+        Only tasks with both planned dates take part; done and cancelled tasks
+        stay where they are. With apply=False the diff is only previewed,
+        otherwise all moved tasks are written in one bulk UPDATE.
+        """
+        result = await self.db.execute(
+            select(
+                Task.id,
+                Task.title,
+                Task.status,
+                Task.priority,
+                Task.assignee_id,
+                Task.estimated_hours,
+                Task.planned_start_date,
+                Task.planned_end_date,
+            ).where(
+                and_(
+                    Task.project_id == project_id,
+                    Task.is_deleted == False,
+                    Task.planned_start_date.isnot(None),
+                    Task.planned_end_date.isnot(None),
+                )
+            )
+        )
+        tasks = result.all()
+        index = {t.id: i for i, t in enumerate(tasks)}
+
+        result = await self.db.execute(
+            select(
+                TaskDependency.predecessor_id,
+                TaskDependency.successor_id,
+                TaskDependency.dependency_type,
+                TaskDependency.lag_days,
+            ).where(TaskDependency.successor_id.in_(list(index)))
+        )
+        graph = DependencyGraph.from_edges(
+            len(tasks),
+            [
+                (index[dep.predecessor_id], index[dep.successor_id], dep.dependency_type, dep.lag_days)
+                for dep in result.all()
+                if dep.predecessor_id in index
+            ],
+        )
+
+        starts = np.array([t.planned_start_date for t in tasks], dtype="datetime64[m]").astype(np.int64)
+        ends = np.array([t.planned_end_date for t in tasks], dtype="datetime64[m]").astype(np.int64)
+        ends = np.maximum(starts, ends)
+        fixed = np.array(
+            [t.status in (TaskStatus.DONE.value, TaskStatus.CANCELLED.value) for t in tasks], dtype=bool
+        )
+
+        users = hours = priorities = None
+        if level_resources:
+            user_index: dict[UUID, int] = {}
+            users = np.array(
+                [
+                    user_index.setdefault(t.assignee_id, len(user_index)) if t.assignee_id else -1
+                    for t in tasks
+                ],
+                dtype=np.int64,
+            )
+            hours = np.array([float(t.estimated_hours or 0) for t in tasks])
+            priority_rank = {p.value: i for i, p in enumerate(TaskPriority)}
+            priorities = np.array([priority_rank.get(t.priority, 1) for t in tasks], dtype=np.int64)
+
+        # CPU-bound (seconds for tens of thousands of tasks with leveling) -
+        # keep it off the event loop
+        new_starts, _, reasons = await asyncio.to_thread(
+            auto_schedule,
+            starts,
+            ends,
+            graph,
+            fixed,
+            level=level_resources,
+            users=users,
+            hours=hours,
+            priorities=priorities,
+            hours_per_day=settings.WORKLOAD_HOURS_PER_DAY,
+        )
+        shifts = (new_starts - starts) // MINUTES_PER_DAY
+
+        changes = []
+        for i in np.flatnonzero(shifts > 0):
+            task = tasks[i]
+            delta = timedelta(days=int(shifts[i]))
+            changes.append(
+                AutoScheduleChange(
+                    task_id=task.id,
+                    title=task.title,
+                    old_start_date=task.planned_start_date,
+                    old_end_date=task.planned_end_date,
+                    new_start_date=task.planned_start_date + delta,
+                    new_end_date=task.planned_end_date + delta,
+                    shift_days=int(shifts[i]),
+                    reason="resource" if reasons[i] == REASON_RESOURCE else "dependency",
+                )
+            )
+
+        if apply and changes:
+            tasks_table = Task.__table__
+            stmt = (
+                update(tasks_table)
+                .where(tasks_table.c.id == bindparam("b_id"))
+                .values(
+                    planned_start_date=bindparam("b_start"),
+                    planned_end_date=bindparam("b_end"),
+                    updated_at=datetime.utcnow(),
+                )
+            )
+            await self.db.execute(
+                stmt,
+                [
+                    {"b_id": c.task_id, "b_start": c.new_start_date, "b_end": c.new_end_date}
+                    for c in changes
+                ],
+            )
+            await self.db.commit()
+            project_schedule_cache.invalidate(project_id)
+
+        return AutoScheduleResponse(
+            project_id=project_id,
+            applied=apply and bool(changes),
+            level_resources=level_resources,
+            tasks_considered=len(tasks),
+            changes=changes,
+        )
+
+    # ============== Resource Workload ==============
+
+    async def get_workload(
+        self,
+        start_date: date,
+        end_date: date,
+        project_id: UUID | None = None,
+        department_id: UUID | None = None,
+        granularity: str = "day",
+    ) -> WorkloadResponse:
+        """
+        Per-user workload histogram.
+
+        For a project: load from the project's tasks on their assignees.
+        For a department: total load of every active member of the department.
+        Cancelled, deleted, unassigned and unestimated tasks are ignored.
+        """
+        start_expr, end_expr = self._effective_date_columns()
+        bar_end = func.coalesce(end_expr, start_expr)
+        horizon_start = datetime.combine(start_date, datetime.min.time())
+        horizon_end = datetime.combine(end_date, datetime.max.time())
+
+        stmt = select(
+            Task.assignee_id,
+            Task.planned_start_date,
+            Task.planned_end_date,
+            Task.due_date,
+            Task.started_at,
+            Task.completed_at,
+            Task.created_at,
+            Task.estimated_hours,
+        ).where(
+            and_(
+                Task.is_deleted == False,
+                Task.status != TaskStatus.CANCELLED.value,
+                Task.assignee_id.isnot(None),
+                Task.estimated_hours > 0,
+                start_expr <= horizon_end,
+                bar_end >= horizon_start,
+            )
+        )
+
+        users: list[Any] = []
+        if department_id is not None:
+            result = await self.db.execute(
+                select(User.id, User.name)
+                .where(and_(User.department_id == department_id, User.is_active == True))
+                .order_by(User.name)
+            )
+            users = list(result.all())
+            stmt = stmt.where(Task.assignee_id.in_([u.id for u in users]))
+        if project_id is not None:
+            stmt = stmt.where(Task.project_id == project_id)
+
+        rows = (await self.db.execute(stmt)).all() if project_id or users else []
+
+        if department_id is None:
+            assignee_ids = {row.assignee_id for row in rows}
+            if assignee_ids:
+                result = await self.db.execute(
+                    select(User.id, User.name)
+                    .where(User.id.in_(assignee_ids))
+                    .order_by(User.name)
+                )
+                users = list(result.all())
+
+        user_index = {u.id: i for i, u in enumerate(users)}
+        spans = []
+        for row in rows:
+            start = effective_start(row)
+            end = effective_end(row) or start
+            if row.assignee_id not in user_index or start is None:
+                continue
+            spans.append(
+                (user_index[row.assignee_id], start.date(), max(start, end).date(), row.estimated_hours)
+            )
+
+        workload = compute_workload(
+            [u.id for u in users],
+            np.array([s[0] for s in spans], dtype=np.int64),
+            np.array([s[1] for s in spans], dtype="datetime64[D]"),
+            np.array([s[2] for s in spans], dtype="datetime64[D]"),
+            np.array([float(s[3]) for s in spans], dtype=np.float64),
+            start_date,
+            end_date,
+            hours_per_day=settings.WORKLOAD_HOURS_PER_DAY,
+        )
+        if granularity == "week":
+            workload = workload.by_week()
+
+        allocated = workload.allocated.round(2)
+        capacity = workload.capacity.round(2)
+        utilization = workload.utilization.round(3)
+        overallocated = workload.overallocated.round(2)
+
+        return WorkloadResponse(
+            granularity=granularity,
+            start_date=start_date,
+            end_date=end_date,
+            periods=workload.periods,
+            users=[
+                UserWorkload(
+                    user_id=user.id,
+                    user_name=user.name,
+                    allocated_hours=allocated[i].tolist(),
+                    capacity_hours=capacity[i].tolist(),
+                    utilization=utilization[i].tolist(),
+                    overallocated_hours=overallocated[i].tolist(),
+                    total_allocated_hours=round(float(workload.allocated[i].sum()), 2),
+                    total_overallocated_hours=round(float(workload.overallocated[i].sum()), 2),
+                    peak_utilization=float(utilization[i].max()) if utilization.shape[1] else 0.0,
+                )
+                for i, user in enumerate(users)
+            ],
+        )
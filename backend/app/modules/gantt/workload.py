@@ -0,0 +1,131 @@
+"""
+SmartTask360 — Resource workload engine
+
+Spreads each task's estimated hours evenly over the working days (Mon-Fri)
+between its effective start and end, per assignee, and compares the result
+with daily capacity.
+
+Everything is vectorized over a (users x days) NumPy matrix: each task adds
+its daily rate at its first day and removes it after its last day in a
+difference array, one cumulative sum turns that into daily load, and a
+working-day mask zeroes weekends. Cost is O(tasks + users * days).
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+
+class Workload:
+    """Workload matrices; rows follow `user_ids`, columns follow `periods`"""
+
+    def __init__(
+        self,
+        user_ids: list,
+        periods: list[date],
+        allocated: np.ndarray,
+        capacity: np.ndarray,
+    ):
+        self.user_ids = user_ids
+        self.periods = periods
+        self.allocated = allocated
+        self.capacity = capacity
+
+    @property
+    def utilization(self) -> np.ndarray:
+        """allocated / capacity (0 where there is no capacity)"""
+        return np.divide(
+            self.allocated,
+            self.capacity,
+            out=np.zeros_like(self.allocated),
+            where=self.capacity > 0,
+        )
+
+    @property
+    def overallocated(self) -> np.ndarray:
+        """Hours above capacity (includes work planned on non-working days)"""
+        return np.maximum(self.allocated - self.capacity, 0)
+
+    def by_week(self) -> "Workload":
+        """Aggregate daily columns into weeks starting on Monday"""
+        if not self.periods:
+            return self
+        days = np.array(self.periods, dtype="datetime64[D]")
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        week_ids = (days.astype(np.int64) + 3) // 7
+        starts = np.flatnonzero(np.r_[True, week_ids[1:] != week_ids[:-1]])
+        return Workload(
+            self.user_ids,
+            [self.periods[i] - timedelta(days=self.periods[i].weekday()) for i in starts],
+            np.add.reduceat(self.allocated, starts, axis=1),
+            np.add.reduceat(self.capacity, starts, axis=1),
+        )
+
+
+def compute_workload(
+    user_ids: list,
+    task_users: np.ndarray,
+    task_starts: np.ndarray,
+    task_ends: np.ndarray,
+    task_hours: np.ndarray,
+    horizon_start: date,
+    horizon_end: date,
+    hours_per_day: float = 8.0,
+) -> Workload:
+    """
+    Build the daily workload of users over [horizon_start, horizon_end].
+
+    Args:
+        user_ids: Row labels; task_users index into this list
+        task_users: Assignee row per task (int array)
+        task_starts / task_ends: First and last day of each task (inclusive,
+            datetime64[D] arrays); tasks may extend beyond the horizon
+        task_hours: Estimated hours per task
+        horizon_start / horizon_end: Inclusive day range to report
+        hours_per_day: Capacity per working day
+
+    Returns:
+        Daily Workload; hours of the part of a task outside the horizon
+        are not counted
+    """
+    first = np.datetime64(horizon_start, "D")
+    num_days = (np.datetime64(horizon_end, "D") - first).astype(np.int64) + 1
+    num_users = len(user_ids)
+    periods = [horizon_start + timedelta(days=i) for i in range(num_days)]
+    days = first + np.arange(num_days)
+    is_workday = np.is_busday(days)
+
+    capacity = np.zeros((num_users, num_days))
+    capacity[:, is_workday] = hours_per_day
+
+    task_users = np.asarray(task_users, dtype=np.int64)
+    starts = np.asarray(task_starts, dtype="datetime64[D]")
+    ends_excl = np.asarray(task_ends, dtype="datetime64[D]") + 1
+    hours = np.asarray(task_hours, dtype=np.float64)
+
+    # Tasks with no working day in their span (e.g. weekend-only) are
+    # treated as running on all of their days
+    workdays = np.busday_count(starts, ends_excl)
+    all_days = (ends_excl - starts).astype(np.int64)
+    weekend_only = workdays == 0
+    rate = hours / np.where(weekend_only, np.maximum(all_days, 1), workdays)
+
+    # Clip spans to the horizon (columns 0..num_days, end exclusive)
+    col_start = np.clip((starts - first).astype(np.int64), 0, num_days)
+    col_end = np.clip((ends_excl - first).astype(np.int64), 0, num_days)
+    visible = col_end > col_start
+
+    allocated = np.zeros((num_users, num_days))
+    for mask, day_mask in (
+        (visible & ~weekend_only, is_workday),
+        (visible & weekend_only, None),
+    ):
+        if not mask.any():
+            continue
+        diff = np.zeros((num_users, num_days + 1))
+        np.add.at(diff, (task_users[mask], col_start[mask]), rate[mask])
+        np.add.at(diff, (task_users[mask], col_end[mask]), -rate[mask])
+        load = np.cumsum(diff[:, :-1], axis=1)
+        allocated += load if day_mask is None else load * day_mask
+
+    return Workload(list(user_ids), periods, allocated, capacity)
@@ -0,0 +1,174 @@
+"""
+SmartTask360 — Unread notification counters
+
+Unread notifications per (user, type), with the high/urgent subset, kept in
+`notification_unread_counters` so the notification bell reads a handful of
+counter rows instead of aggregating over `notifications` on every poll.
+
+NotificationService updates the counters in the same transaction as the
+notification rows: `add` after inserts, `apply` around UPDATE/DELETE
+statements (the statement's RETURNING rows are grouped in SQL, so marking
+thousands of notifications read costs two round trips). Deltas go through
+INSERT ... ON CONFLICT DO UPDATE SET x = x + delta, so concurrent writers
+never lose an update.
+
+`reconcile` recomputes everything from `notifications` and fixes any drift;
+run it nightly:
+
+    python -m app.modules.notifications.counters
+"""
+
+import asyncio
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import and_, func, select, true, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.notifications.models import Notification, notification_unread_counters
+
+_table = notification_unread_counters
+
+HIGH_PRIORITIES = ("high", "urgent")
+
+_upsert = pg_insert(_table)
+_ADJUST = _upsert.on_conflict_do_update(
+    index_elements=[_table.c.user_id, _table.c.type],
+    set_={
+        "unread": _table.c.unread + _upsert.excluded.unread,
+        "unread_high": _table.c.unread_high + _upsert.excluded.unread_high,
+    },
+)
+
+
+async def adjust_many(db: AsyncSession, deltas: dict[tuple[UUID, str], list[int]]) -> None:
+    """
+    Apply {(user_id, type): [unread delta, unread_high delta]} in one statement.
+
+    Rows are written in key order so concurrent writers lock counter rows
+    in the same order.
+    """
+    rows = [
+        {"user_id": user_id, "type": type_, "unread": unread, "unread_high": unread_high}
+        for (user_id, type_), (unread, unread_high) in sorted(deltas.items())
+        if unread or unread_high
+    ]
+    if rows:
+        await db.execute(_ADJUST, rows)
+
+
+async def add(db: AsyncSession, notifications: Iterable[tuple[UUID, str, str]]) -> None:
+    """Count new unread notifications given as (user_id, type, priority)"""
+    deltas: dict[tuple[UUID, str], list[int]] = {}
+    for user_id, type_, priority in notifications:
+        delta = deltas.setdefault((user_id, type_), [0, 0])
+        delta[0] += 1
+        delta[1] += priority in HIGH_PRIORITIES
+    await adjust_many(db, deltas)
+
+
+async def apply(db: AsyncSession, stmt, rows_were_unread: bool = False) -> int:
+    """
+    Run an UPDATE or DELETE on notifications and subtract the unread rows it
+    touched from the counters.
+
+    Args:
+        stmt: update(Notification)/delete(Notification) without RETURNING
+        rows_were_unread: True when the statement only touches unread rows
+            (marking as read), so RETURNING's new is_read is not consulted
+
+    Returns:
+        Number of notifications the statement touched
+    """
+    changed = stmt.returning(
+        Notification.user_id, Notification.type, Notification.priority, Notification.is_read
+    ).cte("changed")
+    unread = true() if rows_were_unread else changed.c.is_read == False
+    result = await db.execute(
+        select(
+            changed.c.user_id,
+            changed.c.type,
+            func.count().label("touched"),
+            func.count().filter(unread).label("unread"),
+            func.count()
+            .filter(and_(unread, changed.c.priority.in_(HIGH_PRIORITIES)))
+            .label("unread_high"),
+        ).group_by(changed.c.user_id, changed.c.type)
+    )
+
+    touched = 0
+    deltas = {}
+    for row in result.all():
+        touched += row.touched
+        deltas[(row.user_id, row.type)] = [-row.unread, -row.unread_high]
+    await adjust_many(db, deltas)
+    return touched
+
+
+async def get_unread(db: AsyncSession, user_id: UUID) -> dict[str, tuple[int, int]]:
+    """{type: (unread, unread_high)} for types with unread notifications"""
+    result = await db.execute(
+        select(_table.c.type, _table.c.unread, _table.c.unread_high)
+        .where(_table.c.user_id == user_id, _table.c.unread > 0)
+        .order_by(_table.c.type)
+    )
+    return {row.type: (row.unread, row.unread_high) for row in result.all()}
+
+
+async def reconcile(db: AsyncSession) -> int:
+    """
+    Recompute all counters from `notifications`.
+
+    Returns:
+        Number of counter rows inserted or corrected
+    """
+    actual = (
+        select(
+            Notification.user_id,
+            Notification.type,
+            func.count(),
+            func.count().filter(Notification.priority.in_(HIGH_PRIORITIES)),
+        )
+        .where(Notification.is_read == False)
+        .group_by(Notification.user_id, Notification.type)
+    )
+    stmt = pg_insert(_table).from_select(["user_id", "type", "unread", "unread_high"], actual)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[_table.c.user_id, _table.c.type],
+        set_={"unread": stmt.excluded.unread, "unread_high": stmt.excluded.unread_high},
+        where=(_table.c.unread != stmt.excluded.unread)
+        | (_table.c.unread_high != stmt.excluded.unread_high),
+    )
+    upserted = await db.execute(stmt)
+
+    # Counters whose unread notifications are all gone
+    unread_left = (
+        select(Notification.id)
+        .where(
+            Notification.user_id == _table.c.user_id,
+            Notification.type == _table.c.type,
+            Notification.is_read == False,
+        )
+        .exists()
+    )
+    zeroed = await db.execute(
+        update(_table)
+        .where((_table.c.unread != 0) | (_table.c.unread_high != 0), ~unread_left)
+        .values(unread=0, unread_high=0)
+    )
+    await db.commit()
+    return upserted.rowcount + zeroed.rowcount
+
+
+async def main() -> None:
+    """Entry point for the nightly reconciliation job"""
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as db:
+        fixed = await reconcile(db)
+    print(f"Notification counters reconciled: {fixed} row(s) inserted or corrected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,389 @@
+"""
+SmartTask360 — Email digests of unread notifications
+
+Each run walks users with email enabled in keyset batches. Per batch, one
+query loads recipients with their digest settings and last digest time, and
+one windowed query loads the newest unread notifications of every due
+recipient, so the number of queries grows with batches, not users.
+Messages are rendered from templates compiled at import time and handed to
+an EmailTransport in batches by a fixed pool of senders. Rendering blocks
+on a bounded queue when the transport falls behind.
+
+A user is due when their digest period (instant, hourly, daily, weekly)
+has elapsed since the last digest and they are outside their quiet hours
+(compared with server time). Successful sends move the user's
+notification_digest_state watermark, committed after every batch, so an
+interrupted run does not resend what was already delivered.
+
+Run on a schedule (e.g. every 5 minutes; the period check does the rest):
+
+    python -m app.modules.notifications.digest
+"""
+
+import asyncio
+import html
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from email.message import EmailMessage
+from email.utils import formataddr
+from string import Template
+from uuid import UUID
+
+from sqlalchemy import Uuid, any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.types import EmailDigest
+from app.modules.notifications import partitions
+from app.modules.notifications.mailer import EmailTransport, get_transport
+from app.modules.notifications.models import (
+    Notification,
+    NotificationSettings,
+    notification_digest_state,
+)
+from app.modules.notifications.schemas import DigestRunResult
+from app.modules.users.models import User
+
+DIGEST_PERIODS = {
+    EmailDigest.INSTANT.value: timedelta(0),
+    EmailDigest.HOURLY.value: timedelta(hours=1),
+    EmailDigest.DAILY.value: timedelta(days=1),
+    EmailDigest.WEEKLY.value: timedelta(weeks=1),
+}
+
+# A user's first digest covers at most this far back
+FIRST_DIGEST_LOOKBACK = timedelta(weeks=1)
+
+# Settings defaults for users without a notification_settings row
+DEFAULT_DIGEST = EmailDigest.DAILY.value
+
+
+# ============================================================================
+# Templates (compiled once)
+# ============================================================================
+
+SUBJECT = Template("SmartTask360: новых уведомлений — $count")
+
+TEXT_BODY = Template(
+    "Здравствуйте, $name!\n\n"
+    "Непрочитанные уведомления:\n\n"
+    "$items"
+    "$more"
+    "\nВсе уведомления: $app_url/notifications\n"
+)
+TEXT_ITEM = Template("• $title$times\n$content$link\n")
+
+HTML_BODY = Template(
+    "<html><body>"
+    "<p>Здравствуйте, $name!</p>"
+    "<p>Непрочитанные уведомления:</p>"
+    "<ul>$items</ul>"
+    "$more"
+    '<p><a href="$app_url/notifications">Все уведомления</a></p>'
+    "</body></html>"
+)
+HTML_ITEM = Template("<li><b>$title</b>$times$content$link</li>")
+
+
+@dataclass
+class DigestRecipient:
+    user_id: UUID
+    email: str
+    name: str
+    digest: str
+    last_sent_at: datetime | None = None
+    quiet_hours_start: time | None = None
+    quiet_hours_end: time | None = None
+    items: list = field(default_factory=list)  # Notification rows, newest first
+    total: int = 0  # Pending notifications (items holds at most DIGEST_MAX_ITEMS)
+
+
+def is_due(digest: str, last_sent_at: datetime | None, now: datetime) -> bool:
+    """Whether the user's digest period has elapsed since their last digest"""
+    period = DIGEST_PERIODS.get(digest)
+    if period is None:
+        return False
+    return last_sent_at is None or now - last_sent_at >= period
+
+
+def in_quiet_hours(start: time | None, end: time | None, at: time) -> bool:
+    """Whether `at` falls in [start, end); windows may wrap midnight"""
+    if start is None or end is None or start == end:
+        return False
+    if start < end:
+        return start <= at < end
+    return at >= start or at < end
+
+
+def _link(item) -> str:
+    if item.entity_type == "task" and item.entity_id:
+        return f"{settings.APP_URL}/tasks/{item.entity_id}"
+    return ""
+
+
+def render_digest(recipient: DigestRecipient) -> EmailMessage:
+    """Build the digest email (plain text + HTML) for one recipient"""
+    text_items, html_items = [], []
+    for item in recipient.items:
+        times = f" (×{item.group_count})" if item.group_count > 1 else ""
+        link = _link(item)
+        text_items.append(
+            TEXT_ITEM.substitute(
+                title=item.title,
+                times=times,
+                content=f"  {item.content}\n" if item.content else "",
+                link=f"  {link}\n" if link else "",
+            )
+        )
+        html_items.append(
+            HTML_ITEM.substitute(
+                title=html.escape(item.title),
+                times=times,
+                content=f"<br>{html.escape(item.content)}" if item.content else "",
+                link=f'<br><a href="{html.escape(link)}">Открыть</a>' if link else "",
+            )
+        )
+
+    more = recipient.total - len(recipient.items)
+    values = {"name": recipient.name, "app_url": settings.APP_URL}
+
+    message = EmailMessage()
+    message["From"] = settings.EMAIL_FROM
+    message["To"] = formataddr((recipient.name, recipient.email))
+    message["Subject"] = SUBJECT.substitute(count=recipient.total)
+    message.set_content(
+        TEXT_BODY.substitute(
+            values, items="\n".join(text_items), more=f"\n…и ещё {more}\n" if more else ""
+        )
+    )
+    message.add_alternative(
+        HTML_BODY.substitute(
+            values,
+            name=html.escape(recipient.name),
+            items="".join(html_items),
+            more=f"<p>…и ещё {more}</p>" if more else "",
+        ),
+        subtype="html",
+    )
+    return message
+
+
+class NotificationDigest:
+    """
+    One digest run over all users.
+
+    Flow per batch of users: load recipients -> keep due ones outside quiet
+    hours -> load their pending notifications -> render -> queue for the
+    sender pool -> record delivered digests.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        transport: EmailTransport | None = None,
+        user_batch: int | None = None,
+        send_batch: int | None = None,
+        send_workers: int | None = None,
+    ):
+        self.db = db
+        self.transport = transport or get_transport()
+        self.user_batch = user_batch or settings.DIGEST_USER_BATCH
+        self.send_batch = send_batch or settings.DIGEST_SEND_BATCH
+        self.send_workers = send_workers or settings.DIGEST_SEND_WORKERS
+        self._delivered: list[UUID] = []
+        self._result = DigestRunResult()
+
+    async def run(self, now: datetime | None = None) -> DigestRunResult:
+        """Send every due digest"""
+        now = now or datetime.utcnow()
+        self._result = DigestRunResult()
+        # Bounded: rendering waits here when the transport falls behind
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.send_workers * 2)
+        senders = [asyncio.create_task(self._sender(queue)) for _ in range(self.send_workers)]
+
+        try:
+            after_id = None
+            while True:
+                recipients = await self._load_recipients(after_id)
+                if not recipients:
+                    break
+                after_id = recipients[-1].user_id
+                self._result.recipients += len(recipients)
+
+                due = [r for r in recipients if is_due(r.digest, r.last_sent_at, now)]
+                self._result.due += len(due)
+                awake = [
+                    r
+                    for r in due
+                    if not in_quiet_hours(r.quiet_hours_start, r.quiet_hours_end, now.time())
+                ]
+                self._result.quiet += len(due) - len(awake)
+
+                pending = [r for r in await self._load_pending(awake, now) if r.items]
+                for start in range(0, len(pending), self.send_batch):
+                    chunk = pending[start : start + self.send_batch]
+                    await queue.put((chunk, [render_digest(r) for r in chunk]))
+
+                await self._record_delivered(now)
+
+            await queue.join()
+            await self._record_delivered(now)
+        finally:
+            for sender in senders:
+                sender.cancel()
+            await asyncio.gather(*senders, return_exceptions=True)
+
+        return self._result
+
+    async def _sender(self, queue: asyncio.Queue) -> None:
+        """Hand queued message batches to the transport"""
+        while True:
+            recipients, messages = await queue.get()
+            try:
+                results = await self.transport.send_batch(messages)
+            except Exception as e:
+                print(f"Digest batch of {len(messages)} failed: {e}")
+                results = [False] * len(messages)
+            for recipient, ok in zip(recipients, results):
+                if ok:
+                    self._delivered.append(recipient.user_id)
+                    self._result.sent += 1
+                else:
+                    self._result.failed += 1
+            queue.task_done()
+
+    # ------------------------------------------------------------------
+    # Data access (one statement each, per batch)
+    # ------------------------------------------------------------------
+
+    async def _load_recipients(self, after_id: UUID | None) -> list[DigestRecipient]:
+        """Next batch of active users with email digests enabled"""
+        digest = func.coalesce(NotificationSettings.email_digest, DEFAULT_DIGEST)
+        query = (
+            select(
+                User.id,
+                User.email,
+                User.name,
+                digest.label("digest"),
+                NotificationSettings.quiet_hours_enabled,
+                NotificationSettings.quiet_hours_start,
+                NotificationSettings.quiet_hours_end,
+                notification_digest_state.c.last_sent_at,
+            )
+            .select_from(User)
+            .outerjoin(NotificationSettings, NotificationSettings.user_id == User.id)
+            .outerjoin(
+                notification_digest_state, notification_digest_state.c.user_id == User.id
+            )
+            .where(
+                User.is_active == True,
+                func.coalesce(NotificationSettings.email_enabled, True) == True,
+                digest != EmailDigest.DISABLED.value,
+            )
+            .order_by(User.id)
+            .limit(self.user_batch)
+        )
+        if after_id:
+            query = query.where(User.id > after_id)
+
+        result = await self.db.execute(query)
+        return [
+            DigestRecipient(
+                user_id=row.id,
+                email=row.email,
+                name=row.name,
+                digest=row.digest,
+                last_sent_at=row.last_sent_at,
+                quiet_hours_start=row.quiet_hours_start if row.quiet_hours_enabled else None,
+                quiet_hours_end=row.quiet_hours_end if row.quiet_hours_enabled else None,
+            )
+            for row in result.all()
+        ]
+
+    async def _load_pending(
+        self, recipients: list[DigestRecipient], now: datetime
+    ) -> list[DigestRecipient]:
+        """
+        Attach each recipient's newest unread notifications since their last
+        digest (up to DIGEST_MAX_ITEMS, plus the total) in one query.
+        """
+        if not recipients:
+            return recipients
+        by_id = {r.user_id: r for r in recipients}
+
+        state = notification_digest_state
+        ranked = (
+            select(
+                Notification.user_id,
+                Notification.title,
+                Notification.content,
+                Notification.entity_type,
+                Notification.entity_id,
+                Notification.group_count,
+                func.row_number()
+                .over(
+                    partition_by=Notification.user_id,
+                    order_by=(Notification.created_at.desc(), Notification.id.desc()),
+                )
+                .label("rank"),
+                func.count().over(partition_by=Notification.user_id).label("total"),
+            )
+            .select_from(Notification)
+            .outerjoin(state, state.c.user_id == Notification.user_id)
+            .where(
+                Notification.user_id
+                == any_(bindparam("b_users", list(by_id), type_=ARRAY(Uuid))),
+                Notification.is_read == False,
+                # Partition pruning; nothing older survives retention anyway
+                Notification.created_at >= partitions.retention_floor(now.date()),
+                Notification.created_at > func.coalesce(
+                    state.c.last_sent_at, now - FIRST_DIGEST_LOOKBACK
+                ),
+                # Later rows belong to the next digest (the watermark is `now`)
+                Notification.created_at <= now,
+            )
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(ranked)
+            .where(ranked.c.rank <= settings.DIGEST_MAX_ITEMS)
+            .order_by(ranked.c.user_id, ranked.c.rank)
+        )
+        for row in result.all():
+            recipient = by_id[row.user_id]
+            recipient.items.append(row)
+            recipient.total = row.total
+        return recipients
+
+    async def _record_delivered(self, sent_at: datetime) -> None:
+        """Move the watermark of users whose digest was delivered"""
+        delivered, self._delivered = self._delivered, []
+        if not delivered:
+            return
+        stmt = pg_insert(notification_digest_state)
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[notification_digest_state.c.user_id],
+                set_={"last_sent_at": stmt.excluded.last_sent_at},
+            ),
+            [{"user_id": user_id, "last_sent_at": sent_at} for user_id in sorted(delivered)],
+        )
+        await self.db.commit()
+
+
+async def main() -> None:
+    """Entry point for the scheduled digest job"""
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as db:
+        result = await NotificationDigest(db).run()
+    print(
+        f"Email digests: {result.sent} sent, {result.failed} failed, "
+        f"{result.quiet} deferred for quiet hours ({result.due} due of {result.recipients})"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
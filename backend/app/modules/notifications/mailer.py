@@ -0,0 +1,116 @@
+"""
+SmartTask360 — Email transports
+
+Outgoing mail goes through an EmailTransport: SMTP in production, .eml
+files for local runs (settings.EMAIL_TRANSPORT = "file"), and an in-memory
+sink for tests. Transports take messages in batches so SMTP can reuse one
+connection for many messages.
+"""
+
+import asyncio
+import os
+import smtplib
+from abc import ABC, abstractmethod
+from email.message import EmailMessage
+from uuid import uuid4
+
+from app.core.config import settings
+
+
+class EmailTransport(ABC):
+    """Delivers email messages"""
+
+    @abstractmethod
+    async def send_batch(self, messages: list[EmailMessage]) -> list[bool]:
+        """Send messages, return per-message success (same order)"""
+
+
+class SmtpTransport(EmailTransport):
+    """
+    SMTP delivery: one connection (STARTTLS + login when configured) per
+    batch, run in a worker thread so the event loop keeps rendering.
+    """
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool | None = None,
+    ):
+        self.host = host or settings.SMTP_HOST
+        self.port = port or settings.SMTP_PORT
+        self.username = settings.SMTP_USERNAME if username is None else username
+        self.password = settings.SMTP_PASSWORD if password is None else password
+        self.starttls = settings.SMTP_STARTTLS if starttls is None else starttls
+
+    async def send_batch(self, messages: list[EmailMessage]) -> list[bool]:
+        return await asyncio.to_thread(self._send_batch, messages)
+
+    def _send_batch(self, messages: list[EmailMessage]) -> list[bool]:
+        results = []
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=30) as smtp:
+                if self.starttls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password)
+                for message in messages:
+                    try:
+                        smtp.send_message(message)
+                        results.append(True)
+                    except smtplib.SMTPRecipientsRefused:
+                        results.append(False)
+        except (OSError, smtplib.SMTPException) as e:
+            print(f"SMTP batch failed after {len(results)} message(s): {e}")
+        return results + [False] * (len(messages) - len(results))
+
+
+class FileTransport(EmailTransport):
+    """Writes each message to an .eml file (local development)"""
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or settings.EMAIL_FILE_DIR
+
+    async def send_batch(self, messages: list[EmailMessage]) -> list[bool]:
+        return await asyncio.to_thread(self._write, messages)
+
+    def _write(self, messages: list[EmailMessage]) -> list[bool]:
+        os.makedirs(self.directory, exist_ok=True)
+        for message in messages:
+            path = os.path.join(self.directory, f"{uuid4().hex}.eml")
+            with open(path, "wb") as f:
+                f.write(message.as_bytes())
+        return [True] * len(messages)
+
+
+class MemoryTransport(EmailTransport):
+    """
+    Keeps messages in memory (tests).
+
+    Args:
+        fail_for: Recipient addresses whose messages are reported as failed
+    """
+
+    def __init__(self, fail_for: set[str] | None = None):
+        self.fail_for = fail_for or set()
+        self.sent: list[EmailMessage] = []
+        self.batches = 0
+
+    async def send_batch(self, messages: list[EmailMessage]) -> list[bool]:
+        self.batches += 1
+        results = []
+        for message in messages:
+            ok = not any(address in message["To"] for address in self.fail_for)
+            if ok:
+                self.sent.append(message)
+            results.append(ok)
+        return results
+
+
+def get_transport() -> EmailTransport:
+    """Transport selected by settings.EMAIL_TRANSPORT"""
+    if settings.EMAIL_TRANSPORT == "file":
+        return FileTransport()
+    return SmtpTransport()
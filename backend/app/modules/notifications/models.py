@@ -3,9 +3,22 @@ SmartTask360 — Notification models
 """
 
 from datetime import datetime, time
+from typing import ClassVar
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, Time
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    Time,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -21,6 +34,19 @@ class Notification(Base):
     """
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Feed: a user's notifications, newest first
+        Index("ix_notifications_user_created", "user_id", "created_at"),
+        # Coalescing looks up the recipient's unread notification of a group
+        Index(
+            "ix_notifications_unread_group",
+            "user_id",
+            "group_key",
+            postgresql_where=text("NOT is_read AND group_key IS NOT NULL"),
+        ),
+        # Monthly range partitions (app.modules.notifications.partitions)
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
 
@@ -28,7 +54,6 @@ class Notification(Base):
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Notification type (see NotificationType enum)
@@ -57,20 +82,48 @@ class Notification(Base):
 
     # Group key for aggregation (e.g., "task_comment:{task_id}")
     group_key: Mapped[str | None] = mapped_column(String(200), nullable=True, index=True)
+    # Events folded into this notification (see NotificationService.send_bulk)
+    group_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
 
     # Extra data (JSONB for flexibility)
     extra_data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
-    # Timestamps
+    # Timestamps (created_at is the partition key, so it is part of the
+    # table's primary key; rows are still identified by id alone)
     created_at: Mapped[datetime] = mapped_column(
-        nullable=False, default=datetime.utcnow, index=True
+        primary_key=True, default=datetime.utcnow, index=True
     )
     read_at: Mapped[datetime | None] = mapped_column(nullable=True)
 
+    __mapper_args__: ClassVar[dict] = {"primary_key": [id]}
+
     def __repr__(self) -> str:
         return f"<Notification {self.type} for user={self.user_id}>"
 
 
+# Unread notifications per (user, type), maintained on every notification
+# write (app.modules.notifications.counters) so the bell poll reads a few
+# counter rows instead of aggregating over `notifications`.
+notification_unread_counters = Table(
+    "notification_unread_counters",
+    Base.metadata,
+    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("type", String(50), primary_key=True),
+    Column("unread", Integer, nullable=False, default=0, server_default="0"),
+    Column("unread_high", Integer, nullable=False, default=0, server_default="0"),
+)
+
+
+# When each user's last email digest was sent; notifications created after
+# it are pending for the next digest (app.modules.notifications.digest)
+notification_digest_state = Table(
+    "notification_digest_state",
+    Base.metadata,
+    Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("last_sent_at", DateTime, nullable=False),
+)
+
+
 class NotificationSettings(Base):
     """
     User notification preferences.
@@ -0,0 +1,188 @@
+"""
+SmartTask360 — Monthly partitions of the notifications table
+
+`notifications` is range-partitioned by created_at, one partition per
+calendar month (notifications_2026_10 holds October 2026), plus
+notifications_default as a safety net for rows outside every range.
+
+Retention drops whole partitions instead of running a large DELETE: a
+partition whose month is older than settings.NOTIFICATION_RETENTION_MONTHS
+is detached and dropped, which is instant and leaves no dead rows behind.
+Feed queries are bounded below by `retention_floor()`, so months that are
+due but not yet dropped are pruned, and cursor pages are bounded above by
+the cursor's created_at, so newer months are pruned too.
+
+Run nightly (creates upcoming partitions, then applies retention):
+
+    python -m app.modules.notifications.partitions
+"""
+
+import asyncio
+import re
+from datetime import date, datetime, time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+TABLE = "notifications"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+_PARTITION_NAME = re.compile(rf"^{TABLE}_(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing `value`"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) `month`"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month covered by a monthly partition (None for other tables)"""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def retention_floor(today: date | None = None) -> datetime:
+    """Oldest created_at kept by retention (start of the oldest kept month)"""
+    today = today or datetime.utcnow().date()
+    oldest = add_months(month_start(today), -settings.NOTIFICATION_RETENTION_MONTHS)
+    return datetime.combine(oldest, time.min)
+
+
+async def list_partitions(db: AsyncSession) -> list[str]:
+    """Names of the partitions currently attached to notifications"""
+    result = await db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = CAST(:table AS regclass)
+            ORDER BY child.relname
+            """
+        ),
+        {"table": TABLE},
+    )
+    return list(result.scalars().all())
+
+
+async def ensure_partitions(db: AsyncSession, today: date | None = None) -> list[str]:
+    """
+    Create the partitions for the current month and the next
+    settings.NOTIFICATION_PARTITIONS_AHEAD months if missing.
+
+    Rows that landed in the default partition because their month had no
+    partition yet (e.g. the job did not run) are moved into the new one.
+
+    Returns:
+        Names of the partitions created
+    """
+    current = month_start(today or datetime.utcnow().date())
+    existing = set(await list_partitions(db))
+
+    created = []
+    for offset in range(settings.NOTIFICATION_PARTITIONS_AHEAD + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        await _create_partition(db, month)
+        created.append(name)
+
+    await db.commit()
+    return created
+
+
+async def _create_partition(db: AsyncSession, month: date) -> None:
+    """
+    Create the partition for `month`.
+
+    Postgres refuses to create a partition while the default partition
+    holds rows of its range, so in that case the default partition is
+    detached, the new partition created, the rows moved across and the
+    default re-attached, all in the caller's transaction.
+    """
+    end = add_months(month, 1)
+    create = text(
+        f"CREATE TABLE {partition_name(month)} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+    )
+    bounds = {"start": datetime.combine(month, time.min), "end": datetime.combine(end, time.min)}
+    in_range = "created_at >= :start AND created_at < :end"
+
+    strays = await db.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"), bounds
+    )
+    if not strays.scalar():
+        await db.execute(create)
+        return
+
+    await db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    await db.execute(create)
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} RETURNING *) "
+            f"INSERT INTO {TABLE} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    await db.execute(text(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+
+async def drop_expired_partitions(db: AsyncSession, today: date | None = None) -> list[str]:
+    """
+    Detach and drop monthly partitions older than the retention floor, and
+    purge expired strays from the default partition.
+
+    Returns:
+        Names of the partitions dropped
+    """
+    floor = retention_floor(today)
+
+    dropped = []
+    for name in await list_partitions(db):
+        month = partition_month(name)
+        if month is None or add_months(month, 1) > floor.date():
+            continue
+        await db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        await db.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+
+    await db.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :floor"), {"floor": floor}
+    )
+    await db.commit()
+    return dropped
+
+
+async def main() -> None:
+    """Entry point for the nightly partition maintenance job"""
+    from app.core.database import async_session_maker
+    from app.modules.notifications import counters
+
+    async with async_session_maker() as db:
+        created = await ensure_partitions(db)
+        dropped = await drop_expired_partitions(db)
+        # Unread notifications in dropped partitions leave the counters
+        if dropped:
+            await counters.reconcile(db)
+
+    print(f"Notification partitions created: {', '.join(created) or 'none'}")
+    print(f"Notification partitions dropped: {', '.join(dropped) or 'none'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,11 +4,12 @@ SmartTask360 — Notification router (API endpoints)
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user, get_db
+from app.core.pagination import encode_cursor
 from app.core.types import NotificationType
 from app.modules.notifications.schemas import (
     NotificationMarkAllRead,
@@ -32,18 +33,23 @@ router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 @router.get("", response_model=list[NotificationWithActor])
 async def list_notifications(
+    response: Response,
     unread_only: bool = Query(False, description="Only show unread notifications"),
     notification_type: str | None = Query(None, description="Filter by type"),
     entity_type: str | None = Query(None, description="Filter by entity type"),
     entity_id: UUID | None = Query(None, description="Filter by entity ID"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    before: str | None = Query(None, description="X-Older-Cursor of the previous page"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    List notifications for current user.
+    List notifications for current user, newest first.
     Supports filtering by type, entity, and read status.
+
+    A full page carries an X-Older-Cursor header; pass it as `before` to get
+    the next (older) page. Cursor pages only read the months they need.
     """
     service = NotificationService(db)
 
@@ -58,15 +64,22 @@ async def list_notifications(
                 detail=f"Invalid notification type: {notification_type}"
             )
 
-    notifications = await service.get_notifications_for_user(
-        user_id=current_user.id,
-        unread_only=unread_only,
-        notification_type=notif_type,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        skip=skip,
-        limit=limit,
-    )
+    try:
+        notifications = await service.get_notifications_for_user(
+            user_id=current_user.id,
+            unread_only=unread_only,
+            notification_type=notif_type,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            skip=skip,
+            limit=limit,
+            before=before,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(notifications) == limit:
+        last = notifications[-1]
+        response.headers["X-Older-Cursor"] = encode_cursor(last.created_at, last.id)
 
     # Enrich with actor details
     result = []
@@ -96,6 +109,7 @@ async def list_notifications(
                 is_read=n.is_read,
                 priority=n.priority,
                 group_key=n.group_key,
+                group_count=n.group_count,
                 extra_data=n.extra_data,
                 created_at=n.created_at,
                 read_at=n.read_at,
@@ -109,12 +123,25 @@ async def list_notifications(
 
 @router.get("/unread-count", response_model=UnreadCount)
 async def get_unread_count(
+    response: Response,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get count of unread notifications"""
+    """
+    Get count of unread notifications.
+
+    Answers 304 Not Modified when If-None-Match carries the ETag of the
+    current counts, so polling clients only download changes.
+    """
     service = NotificationService(db)
-    return await service.get_unread_count(current_user.id)
+    counts = await service.get_unread_count(current_user.id)
+    etag = service.unread_count_etag(counts)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return counts
 
 
 @router.get("/{notification_id}", response_model=NotificationResponse)
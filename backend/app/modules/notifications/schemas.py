@@ -44,6 +44,7 @@ class NotificationResponse(BaseModel):
     is_read: bool
     priority: str
     group_key: str | None
+    group_count: int = 1
     extra_data: dict | None
     created_at: datetime
     read_at: datetime | None
@@ -65,6 +66,7 @@ class NotificationWithActor(BaseModel):
     is_read: bool
     priority: str
     group_key: str | None
+    group_count: int = 1
     extra_data: dict | None
     created_at: datetime
     read_at: datetime | None
@@ -227,3 +229,18 @@ class BoardNotificationPayload(BaseModel):
     from_column: str | None = None
     to_column: str
     new_status: str | None = None
+
+
+# ============================================================================
+# Email Digest Schemas
+# ============================================================================
+
+
+class DigestRunResult(BaseModel):
+    """Summary of an email digest run"""
+
+    recipients: int = 0  # Users with email digests enabled
+    due: int = 0  # Users whose digest period had elapsed
+    quiet: int = 0  # Due users skipped for quiet hours
+    sent: int = 0
+    failed: int = 0
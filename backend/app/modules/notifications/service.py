@@ -2,14 +2,20 @@
 SmartTask360 — Notification service (business logic)
 """
 
+import hashlib
 from datetime import datetime, timedelta
 from uuid import UUID
 
+from sqlalchemy import Select, Uuid, any_, bindparam, insert, select, tuple_, update
 from sqlalchemy import delete as sql_delete
-from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings as app_settings
+from app.core.pagination import decode_cursor
 from app.core.types import NotificationPriority, NotificationType
+from app.core.unit_of_work import UnitOfWork
+from app.modules.notifications import counters, partitions
 from app.modules.notifications.models import Notification, NotificationSettings
 from app.modules.notifications.schemas import (
     NotificationCreate,
@@ -17,12 +23,30 @@ from app.modules.notifications.schemas import (
     UnreadCount,
 )
 
+# Settings flag that enables each notification type (types not listed are
+# always delivered)
+TYPE_SETTINGS = {
+    NotificationType.TASK_ASSIGNED: "notify_task_assigned",
+    NotificationType.TASK_COMMENT: "notify_task_comment",
+    NotificationType.TASK_MENTION: "notify_task_mention",
+    NotificationType.TASK_STATUS_CHANGED: "notify_task_status_changed",
+    NotificationType.TASK_DUE_SOON: "notify_task_due_soon",
+    NotificationType.TASK_OVERDUE: "notify_task_overdue",
+    NotificationType.TASK_ACCEPTED: "notify_task_accepted",
+    NotificationType.TASK_REJECTED: "notify_task_rejected",
+    NotificationType.CHECKLIST_ASSIGNED: "notify_checklist_assigned",
+    NotificationType.CHECKLIST_COMPLETED: "notify_checklist_completed",
+    NotificationType.AI_VALIDATION_COMPLETE: "notify_ai_validation_complete",
+    NotificationType.BOARD_TASK_MOVED: "notify_board_task_moved",
+}
+
 
 class NotificationService:
     """Service for notification operations"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, uow: UnitOfWork | None = None):
         self.db = db
+        self.uow = uow or UnitOfWork.standalone(db)
 
     # =========================================================================
     # Notification CRUD
@@ -44,9 +68,58 @@ class NotificationService:
         entity_id: UUID | None = None,
         skip: int = 0,
         limit: int = 50,
+        before: str | None = None,
     ) -> list[Notification]:
-        """Get notifications for user with optional filters"""
-        query = select(Notification).where(Notification.user_id == user_id)
+        """
+        Get notifications for user with optional filters.
+
+        Raises:
+            ValueError: If the `before` cursor is malformed
+        """
+        query = self.feed_query(
+            user_id,
+            unread_only=unread_only,
+            notification_type=notification_type,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            skip=skip,
+            limit=limit,
+            before=before,
+        )
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    def feed_query(
+        self,
+        user_id: UUID,
+        unread_only: bool = False,
+        notification_type: NotificationType | None = None,
+        entity_type: str | None = None,
+        entity_id: UUID | None = None,
+        skip: int = 0,
+        limit: int = 50,
+        before: str | None = None,
+    ) -> Select:
+        """
+        The user's notification feed query, newest first.
+
+        `before` is the cursor of the last notification already shown
+        (keyset pagination over (created_at, id)). Its plain created_at bound
+        lets the planner prune the monthly partitions newer than the cursor;
+        the retention floor prunes expired months that retention has not
+        dropped yet. Within the remaining months the newest rows come from
+        the per-partition (user_id, created_at) indexes, so LIMIT stops early.
+        """
+        query = select(Notification).where(
+            Notification.user_id == user_id,
+            Notification.created_at >= partitions.retention_floor(),
+        )
+        if before:
+            created_at, notification_id = decode_cursor(before)
+            query = query.where(
+                Notification.created_at <= created_at,
+                tuple_(Notification.created_at, Notification.id) < tuple_(created_at, notification_id),
+            )
 
         if unread_only:
             query = query.where(Notification.is_read == False)
@@ -60,10 +133,11 @@ class NotificationService:
         if entity_id:
             query = query.where(Notification.entity_id == entity_id)
 
-        query = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit)
-
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return (
+            query.order_by(Notification.created_at.desc(), Notification.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
 
     async def create_notification(self, data: NotificationCreate) -> Notification:
         """Create a new notification"""
@@ -86,8 +160,8 @@ class NotificationService:
             extra_data=data.extra_data,
         )
         self.db.add(notification)
-        await self.db.commit()
-        await self.db.refresh(notification)
+        await counters.add(self.db, [(data.user_id, notification.type, notification.priority)])
+        await self.uow.save()
         return notification
 
     async def send(
@@ -107,32 +181,27 @@ class NotificationService:
         Send a notification to a user.
         Checks user settings before sending.
         Returns None if notification is disabled for user.
-        """
-        # Check settings
-        settings = await self.get_or_create_settings(user_id)
-        if not self._is_notification_enabled(settings, notification_type):
-            return None
 
-        notification = Notification(
-            user_id=user_id,
-            type=notification_type.value,
+        With a group_key, an unread notification of the same group from the
+        last NOTIFICATION_COALESCE_MINUTES is updated instead (see send_bulk).
+        """
+        notifications = await self.send_bulk(
+            user_ids=[user_id],
+            notification_type=notification_type,
             title=title,
             content=content,
             entity_type=entity_type,
             entity_id=entity_id,
             actor_id=actor_id,
-            priority=priority.value,
+            priority=priority,
             group_key=group_key,
             extra_data=extra_data,
         )
-        self.db.add(notification)
-        await self.db.commit()
-        await self.db.refresh(notification)
 
-        # TODO: Send email if email_enabled and email_digest == "instant"
+        # Email (including "instant") is sent by the digest job, see digest.py
         # TODO: Send push notification if push_enabled
 
-        return notification
+        return notifications[0] if notifications else None
 
     async def send_bulk(
         self,
@@ -150,40 +219,125 @@ class NotificationService:
         """
         Send notifications to multiple users.
         Returns list of created notifications (may be fewer than user_ids if disabled).
+
+        Fan-out costs two statements however many recipients there are: one
+        query loads every recipient's settings (users without a settings row
+        get the defaults), and a single multi-row INSERT ... RETURNING writes
+        the notifications. Callers can run it after the response in a
+        background task with its own session (see comments'
+        `notify_mentions_job`).
+
+        Notifications with a group_key are coalesced first: a recipient's
+        unread notification of the same group created or updated within
+        NOTIFICATION_COALESCE_MINUTES takes the new title, content and actor,
+        moves to the top of the feed and has its group_count incremented;
+        only the remaining recipients get a new row.
         """
-        notifications = []
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return []
+
+        field = TYPE_SETTINGS.get(notification_type)
+        if field is not None:
+            column = NotificationSettings.__table__.c[field]
+            result = await self.db.execute(
+                select(NotificationSettings.user_id, column).where(
+                    NotificationSettings.user_id
+                    == any_(bindparam("b_users", user_ids, type_=ARRAY(Uuid)))
+                )
+            )
+            enabled = dict(result.all())
+            user_ids = [u for u in user_ids if enabled.get(u, column.default.arg)]
+            if not user_ids:
+                return []
 
-        for user_id in user_ids:
-            notification = await self.send(
-                user_id=user_id,
-                notification_type=notification_type,
+        now = datetime.utcnow()
+        notifications = []
+        if group_key is not None:
+            notifications = await self._coalesce(
+                user_ids,
+                group_key,
+                now,
                 title=title,
                 content=content,
-                entity_type=entity_type,
-                entity_id=entity_id,
                 actor_id=actor_id,
-                priority=priority,
-                group_key=group_key,
                 extra_data=extra_data,
             )
-            if notification:
-                notifications.append(notification)
-
+            coalesced = {notification.user_id for notification in notifications}
+            user_ids = [user_id for user_id in user_ids if user_id not in coalesced]
+            if not user_ids:
+                await self.uow.save()
+                return notifications
+
+        rows = [
+            {
+                "user_id": user_id,
+                "type": notification_type.value,
+                "title": title,
+                "content": content,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "actor_id": actor_id,
+                "is_read": False,
+                "priority": priority.value,
+                "group_key": group_key,
+                "extra_data": extra_data,
+                "created_at": now,
+            }
+            for user_id in user_ids
+        ]
+        result = await self.db.scalars(insert(Notification).returning(Notification), rows)
+        notifications.extend(result.all())
+        await counters.add(
+            self.db, [(user_id, notification_type.value, priority.value) for user_id in user_ids]
+        )
+        await self.uow.save()
         return notifications
 
+    async def _coalesce(
+        self,
+        user_ids: list[UUID],
+        group_key: str,
+        now: datetime,
+        **fields,
+    ) -> list[Notification]:
+        """
+        Fold a new event into recipients' recent unread notifications of the
+        same group (one UPDATE for all recipients).
+
+        Returns:
+            The updated notifications; their recipients need no new row.
+            Unread counters are unchanged, the rows were already unread.
+        """
+        cutoff = now - timedelta(minutes=app_settings.NOTIFICATION_COALESCE_MINUTES)
+        result = await self.db.scalars(
+            update(Notification)
+            .where(
+                Notification.user_id == any_(bindparam("b_users", user_ids, type_=ARRAY(Uuid))),
+                Notification.group_key == group_key,
+                Notification.is_read == False,
+                Notification.created_at >= cutoff,
+            )
+            .values(group_count=Notification.group_count + 1, created_at=now, **fields)
+            .returning(Notification)
+        )
+        return list(result.all())
+
     async def mark_as_read(
         self, notification_ids: list[UUID], user_id: UUID
     ) -> int:
         """Mark notifications as read. Returns count of updated."""
-        result = await self.db.execute(
+        marked = await counters.apply(
+            self.db,
             update(Notification)
             .where(Notification.id.in_(notification_ids))
             .where(Notification.user_id == user_id)
             .where(Notification.is_read == False)
-            .values(is_read=True, read_at=datetime.utcnow())
+            .values(is_read=True, read_at=datetime.utcnow()),
+            rows_were_unread=True,
         )
         await self.db.commit()
-        return result.rowcount
+        return marked
 
     async def mark_all_as_read(
         self,
@@ -210,75 +364,54 @@ class NotificationService:
 
         query = query.values(is_read=True, read_at=datetime.utcnow())
 
-        result = await self.db.execute(query)
+        marked = await counters.apply(self.db, query, rows_were_unread=True)
         await self.db.commit()
-        return result.rowcount
+        return marked
 
     async def delete_notification(
         self, notification_id: UUID, user_id: UUID
     ) -> bool:
         """Delete a notification (only own notifications)"""
-        result = await self.db.execute(
+        deleted = await counters.apply(
+            self.db,
             sql_delete(Notification).where(
                 Notification.id == notification_id,
                 Notification.user_id == user_id,
-            )
+            ),
         )
         await self.db.commit()
-        return result.rowcount > 0
+        return deleted > 0
 
     async def delete_old_notifications(
         self, user_id: UUID, days: int = 30
     ) -> int:
         """Delete notifications older than specified days"""
         cutoff = datetime.utcnow() - timedelta(days=days)
-        result = await self.db.execute(
+        deleted = await counters.apply(
+            self.db,
             sql_delete(Notification).where(
                 Notification.user_id == user_id,
                 Notification.created_at < cutoff,
-            )
+            ),
         )
         await self.db.commit()
-        return result.rowcount
+        return deleted
 
     async def get_unread_count(self, user_id: UUID) -> UnreadCount:
-        """Get unread notification count with breakdown by type"""
-        # Total unread
-        total_result = await self.db.execute(
-            select(func.count(Notification.id)).where(
-                Notification.user_id == user_id,
-                Notification.is_read == False,
-            )
-        )
-        total = total_result.scalar() or 0
-
-        # By type
-        by_type_result = await self.db.execute(
-            select(Notification.type, func.count(Notification.id))
-            .where(
-                Notification.user_id == user_id,
-                Notification.is_read == False,
-            )
-            .group_by(Notification.type)
-        )
-        by_type = {row[0]: row[1] for row in by_type_result.all()}
-
-        # High priority
-        high_priority_result = await self.db.execute(
-            select(func.count(Notification.id)).where(
-                Notification.user_id == user_id,
-                Notification.is_read == False,
-                Notification.priority.in_(["high", "urgent"]),
-            )
-        )
-        high_priority = high_priority_result.scalar() or 0
-
+        """Get unread notification count with breakdown by type (counter rows only)"""
+        by_type = await counters.get_unread(self.db, user_id)
         return UnreadCount(
-            total=total,
-            by_type=by_type,
-            high_priority=high_priority,
+            total=sum(unread for unread, _ in by_type.values()),
+            by_type={type_: unread for type_, (unread, _) in by_type.items()},
+            high_priority=sum(unread_high for _, unread_high in by_type.values()),
         )
 
+    @staticmethod
+    def unread_count_etag(counts: UnreadCount) -> str:
+        """Weak ETag of an unread count, for If-None-Match polling"""
+        digest = hashlib.sha1(counts.model_dump_json().encode()).hexdigest()[:16]
+        return f'W/"{digest}"'
+
     # =========================================================================
     # Settings Management
     # =========================================================================
@@ -298,8 +431,7 @@ class NotificationService:
         if not settings:
             settings = NotificationSettings(user_id=user_id)
             self.db.add(settings)
-            await self.db.commit()
-            await self.db.refresh(settings)
+            await self.uow.save()
         return settings
 
     async def update_settings(
@@ -329,21 +461,8 @@ class NotificationService:
         self, settings: NotificationSettings, notification_type: NotificationType
     ) -> bool:
         """Check if notification type is enabled in user settings"""
-        mapping = {
-            NotificationType.TASK_ASSIGNED: settings.notify_task_assigned,
-            NotificationType.TASK_COMMENT: settings.notify_task_comment,
-            NotificationType.TASK_MENTION: settings.notify_task_mention,
-            NotificationType.TASK_STATUS_CHANGED: settings.notify_task_status_changed,
-            NotificationType.TASK_DUE_SOON: settings.notify_task_due_soon,
-            NotificationType.TASK_OVERDUE: settings.notify_task_overdue,
-            NotificationType.TASK_ACCEPTED: settings.notify_task_accepted,
-            NotificationType.TASK_REJECTED: settings.notify_task_rejected,
-            NotificationType.CHECKLIST_ASSIGNED: settings.notify_checklist_assigned,
-            NotificationType.CHECKLIST_COMPLETED: settings.notify_checklist_completed,
-            NotificationType.AI_VALIDATION_COMPLETE: settings.notify_ai_validation_complete,
-            NotificationType.BOARD_TASK_MOVED: settings.notify_board_task_moved,
-        }
-        return mapping.get(notification_type, True)
+        field = TYPE_SETTINGS.get(notification_type)
+        return True if field is None else getattr(settings, field)
 
     # =========================================================================
     # Convenience Methods for Common Notifications
@@ -411,6 +530,27 @@ class NotificationService:
             extra_data={"task_title": task_title},
         )
 
+    async def notify_task_mentions(
+        self,
+        mentioned_user_ids: list[UUID],
+        task_id: UUID,
+        task_title: str,
+        mentioner_id: UUID,
+        context: str,
+    ) -> list[Notification]:
+        """Send mention notifications to everyone mentioned in one comment"""
+        return await self.send_bulk(
+            user_ids=[u for u in mentioned_user_ids if u != mentioner_id],
+            notification_type=NotificationType.TASK_MENTION,
+            title=f"Вас упомянули в задаче: {task_title}",
+            content=context[:200],
+            entity_type="task",
+            entity_id=task_id,
+            actor_id=mentioner_id,
+            priority=NotificationPriority.HIGH,
+            extra_data={"task_title": task_title},
+        )
+
     async def notify_task_status_changed(
         self,
         user_ids: list[UUID],
@@ -9,6 +9,7 @@ from uuid import UUID
 from sqlalchemy import distinct, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.unit_of_work import UnitOfWork
 from app.modules.task_history.models import TaskHistory
 from app.modules.task_history.schemas import (
     TaskHistoryCreate,
@@ -20,8 +21,9 @@ from app.modules.task_history.schemas import (
 class TaskHistoryService:
     """Service for task history operations"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, uow: UnitOfWork | None = None):
         self.db = db
+        self.uow = uow or UnitOfWork.standalone(db)
 
     async def create_entry(self, entry_data: TaskHistoryCreate) -> TaskHistory:
         """Create a new history entry"""
@@ -37,8 +39,7 @@ class TaskHistoryService:
         )
 
         self.db.add(entry)
-        await self.db.commit()
-        await self.db.refresh(entry)
+        await self.uow.save()
         return entry
 
     async def log_task_created(
@@ -0,0 +1,174 @@
+"""
+SmartTask360 — Denormalized task counters
+
+Live subtask, comment and document counts per task, kept in `task_counters`
+so lists and boards read them with one indexed lookup instead of running
+aggregates per request.
+
+Writers call `adjust` / `adjust_many` inside their own transaction (no
+commit here), so a counter changes exactly when the row it counts does.
+Deltas are applied with INSERT ... ON CONFLICT DO UPDATE SET x = x + delta,
+which creates the row on first use and never loses a concurrent increment.
+
+`reconcile` recomputes everything from the source tables and fixes any
+drift (e.g. rows removed by FK cascades); run it nightly:
+
+    python -m app.modules.tasks.counters
+"""
+
+import asyncio
+from uuid import UUID
+
+from sqlalchemy import Uuid, any_, bindparam, func, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.comments.models import Comment
+from app.modules.documents.models import Document
+from app.modules.tasks.models import Task, task_counters
+
+COUNTERS = ("children_count", "comments_count", "documents_count", "documents_size")
+
+_upsert = pg_insert(task_counters)
+_ADJUST = _upsert.on_conflict_do_update(
+    index_elements=[task_counters.c.task_id],
+    set_={name: task_counters.c[name] + _upsert.excluded[name] for name in COUNTERS},
+)
+
+
+def empty_counters() -> dict[str, int]:
+    return dict.fromkeys(COUNTERS, 0)
+
+
+async def adjust(db: AsyncSession, task_id: UUID | None, **deltas: int) -> None:
+    """Add deltas (e.g. comments_count=1) to one task's counters"""
+    if task_id is not None:
+        await adjust_many(db, {task_id: deltas})
+
+
+async def adjust_many(db: AsyncSession, deltas: dict[UUID, dict[str, int]]) -> None:
+    """
+    Apply deltas to many tasks in one statement.
+
+    Rows are written in task ID order so concurrent writers lock counter
+    rows in the same order.
+    """
+    rows = [
+        {"task_id": task_id, **{name: changes.get(name, 0) for name in COUNTERS}}
+        for task_id, changes in sorted(deltas.items())
+        if task_id is not None and any(changes.values())
+    ]
+    if rows:
+        await db.execute(_ADJUST, rows)
+
+
+async def recount_children(db: AsyncSession, task_ids: set[UUID]) -> None:
+    """
+    Recompute children_count of the given tasks from `tasks`.
+
+    Used by subtree operations (delete/restore/move), where the set of
+    affected parents is known but per-parent deltas are not.
+    """
+    task_ids = {task_id for task_id in task_ids if task_id is not None}
+    if not task_ids:
+        return
+    ids = bindparam("b_recount", sorted(task_ids), type_=ARRAY(Uuid))
+    child = Task.__table__.alias("child")
+    counts = (
+        select(
+            Task.id.label("task_id"),
+            select(func.count())
+            .where(child.c.parent_id == Task.id, child.c.is_deleted == False)
+            .scalar_subquery()
+            .label("children_count"),
+        )
+        .where(Task.id == any_(ids))
+        .order_by(Task.id)
+    )
+    stmt = pg_insert(task_counters).from_select(["task_id", "children_count"], counts)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[task_counters.c.task_id],
+            set_={"children_count": stmt.excluded.children_count},
+        )
+    )
+
+
+async def get_counters(db: AsyncSession, task_ids: list[UUID]) -> dict[UUID, dict[str, int]]:
+    """Counters for many tasks (zeros for tasks without a row yet)"""
+    counts = {task_id: empty_counters() for task_id in task_ids}
+    if not task_ids:
+        return counts
+    result = await db.execute(
+        select(task_counters).where(
+            task_counters.c.task_id == any_(bindparam("b_tasks", list(task_ids), type_=ARRAY(Uuid)))
+        )
+    )
+    for row in result.mappings():
+        counts[row["task_id"]] = {name: row[name] for name in COUNTERS}
+    return counts
+
+
+async def reconcile(db: AsyncSession) -> int:
+    """
+    Recompute all counters from source tables in one statement.
+
+    Returns:
+        Number of counter rows inserted or corrected
+    """
+    tasks = Task.__table__
+    children = (
+        select(tasks.c.parent_id.label("task_id"), func.count().label("n"))
+        .where(tasks.c.parent_id.is_not(None), tasks.c.is_deleted == False)
+        .group_by(tasks.c.parent_id)
+        .subquery()
+    )
+    comments = (
+        select(Comment.task_id, func.count().label("n")).group_by(Comment.task_id).subquery()
+    )
+    documents = (
+        select(
+            Document.task_id,
+            func.count().label("n"),
+            func.sum(Document.file_size).label("size"),
+        )
+        .group_by(Document.task_id)
+        .subquery()
+    )
+    actual = (
+        select(
+            tasks.c.id,
+            func.coalesce(children.c.n, 0),
+            func.coalesce(comments.c.n, 0),
+            func.coalesce(documents.c.n, 0),
+            func.coalesce(documents.c.size, 0),
+        )
+        .select_from(tasks)
+        .outerjoin(children, children.c.task_id == tasks.c.id)
+        .outerjoin(comments, comments.c.task_id == tasks.c.id)
+        .outerjoin(documents, documents.c.task_id == tasks.c.id)
+    )
+
+    stmt = pg_insert(task_counters).from_select(["task_id", *COUNTERS], actual)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[task_counters.c.task_id],
+        set_={name: stmt.excluded[name] for name in COUNTERS},
+        where=or_(*(task_counters.c[name] != stmt.excluded[name] for name in COUNTERS)),
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+
+async def main() -> None:
+    """Entry point for the nightly reconciliation job"""
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as db:
+        fixed = await reconcile(db)
+    print(f"Task counters reconciled: {fixed} row(s) inserted or corrected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,11 +6,12 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID, uuid4
 
-from sqlalchemy import DECIMAL, Boolean, Column, ForeignKey, String, Table, Text
+from sqlalchemy import DECIMAL, BigInteger, Boolean, Column, ForeignKey, Index, Integer, String, Table, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
+from app.core.lexorank import DEFAULT_RANK
 from app.modules.departments.models import LTREE
 
 
@@ -32,6 +33,21 @@ task_participants = Table(
 )
 
 
+# Denormalized per-task counters, adjusted in the same transaction as the
+# comment/document/subtask write and periodically reconciled
+# (app.modules.tasks.counters). Kept out of `tasks` so counter updates do
+# not rewrite the wide task row.
+task_counters = Table(
+    "task_counters",
+    Base.metadata,
+    Column("task_id", ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
+    Column("children_count", Integer, nullable=False, default=0, server_default="0"),
+    Column("comments_count", Integer, nullable=False, default=0, server_default="0"),
+    Column("documents_count", Integer, nullable=False, default=0, server_default="0"),
+    Column("documents_size", BigInteger, nullable=False, default=0, server_default="0"),
+)
+
+
 class Task(Base):
     """
     Task model - represents work items with hierarchy, status, and assignments.
@@ -41,6 +57,19 @@ class Task(Base):
     """
 
     __tablename__ = "tasks"
+    # Partial indexes for the hot filters: reads always add `NOT is_deleted`,
+    # so tombstones are never scanned
+    __table_args__ = (
+        Index(
+            "ix_tasks_live_project_status",
+            "project_id", "status", "kanban_position",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        Index("ix_tasks_live_assignee", "assignee_id", "created_at", postgresql_where=text("NOT is_deleted")),
+        Index("ix_tasks_live_creator", "creator_id", "created_at", postgresql_where=text("NOT is_deleted")),
+        Index("ix_tasks_live_parent", "parent_id", postgresql_where=text("NOT is_deleted")),
+        Index("ix_tasks_live_created_at", "created_at", postgresql_where=text("NOT is_deleted")),
+    )
 
     # Primary key
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
@@ -94,7 +123,9 @@ class Task(Base):
 
     # Flags
     is_milestone: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
-    is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, index=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Shared by every row of one subtree delete, so restore undoes exactly that cascade
+    deleted_at: Mapped[datetime | None] = mapped_column(nullable=True)
 
     # Time tracking
     estimated_hours: Mapped[Decimal | None] = mapped_column(DECIMAL(10, 2), nullable=True)
@@ -113,9 +144,10 @@ class Task(Base):
         Text, nullable=True
     )  # Result/comment when task is completed or sent to review
 
-    # Kanban position (order within status column for a project)
-    kanban_position: Mapped[int] = mapped_column(
-        nullable=False, default=0, index=True
+    # Kanban position (order within status column for a project):
+    # fractional rank, see app.core.lexorank
+    kanban_position: Mapped[str] = mapped_column(
+        String(64, collation="C"), nullable=False, default=DEFAULT_RANK, index=True
     )
 
     # SMART Validation
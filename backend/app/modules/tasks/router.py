@@ -4,18 +4,31 @@ SmartTask360 — Tasks API endpoints
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_current_user, get_db
+from app.core.dependencies import get_current_user, get_db, get_uow
+from app.core.unit_of_work import UnitOfWork
 from app.modules.tasks.excel_schemas import ImportResult
 from app.modules.tasks.excel_service import ExcelService
 from app.modules.tasks.schemas import (
     AvailableTransitionsResponse,
     KanbanReorderRequest,
+    SimilarTaskResponse,
     TagBrief,
     TaskAccept,
+    TaskBulkUpdate,
+    TaskBulkUpdateResponse,
     TaskCreate,
     TaskParticipantRequest,
     TaskReject,
@@ -26,7 +39,7 @@ from app.modules.tasks.schemas import (
     TaskWatcherRequest,
     UserBrief,
 )
-from app.modules.tasks.service import TaskService
+from app.modules.tasks.service import TaskService, rebalance_kanban_column_job
 from app.modules.users.models import User
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -384,17 +397,58 @@ async def get_task_ancestors(
     ]
 
 
+@router.get("/{task_id}/similar", response_model=list[SimilarTaskResponse])
+async def get_similar_tasks(
+    task_id: UUID,
+    limit: int = Query(default=10, ge=1, le=50),
+    min_score: float = Query(default=0.5, ge=0.0, le=1.0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get likely duplicates of a task (local similarity index, no AI call).
+
+    Args:
+        limit: Maximum number of results
+        min_score: Minimum estimated similarity of title + description
+    """
+    service = TaskService(db)
+
+    task = await service.get_by_id(task_id)
+    if not task or task.is_deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+
+    similar = await service.get_similar_tasks(task, limit=limit, min_score=min_score)
+
+    return [
+        SimilarTaskResponse(
+            id=t.id,
+            title=t.title,
+            status=t.status,
+            priority=t.priority,
+            project_id=t.project_id,
+            assignee_id=t.assignee_id,
+            score=round(score, 3),
+        )
+        for t, score in similar
+    ]
+
+
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_data: TaskCreate,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user: User = Depends(get_current_user),
 ):
     """Create new task"""
-    service = TaskService(db)
+    service = TaskService(uow.db, uow)
 
     try:
         task = await service.create(task_data, current_user_id=current_user.id)
+        await uow.commit()
         # Newly created task has 0 children and no tags yet
         return task_to_response(task, 0, [])
     except ValueError as e:
@@ -404,6 +458,30 @@ async def create_task(
         )
 
 
+@router.post("/bulk", response_model=TaskBulkUpdateResponse)
+async def bulk_update_tasks(
+    data: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Apply one change (status, priority, assignee, project, due date, tags)
+    to many tasks at once.
+
+    Tasks are selected by task_ids or by a filter. Everything is written in
+    one transaction; the response lists the outcome for each task.
+    """
+    service = TaskService(db)
+
+    try:
+        return await service.bulk_update(data, current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.patch("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: UUID,
@@ -436,31 +514,61 @@ async def update_task(
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user: User = Depends(get_current_user),
 ):
-    """Soft delete task"""
-    service = TaskService(db)
-    success = await service.delete(task_id)
+    """Soft delete task together with its subtasks"""
+    service = TaskService(uow.db, uow)
+    success = await service.delete(task_id, user_id=current_user.id)
 
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
+    await uow.commit()
 
     return None
 
 
+@router.post("/{task_id}/restore", response_model=TaskResponse)
+async def restore_task(
+    task_id: UUID,
+    uow: UnitOfWork = Depends(get_uow),
+    current_user: User = Depends(get_current_user),
+):
+    """Restore a deleted task and the subtasks deleted along with it"""
+    service = TaskService(uow.db, uow)
+
+    try:
+        task = await service.restore(task_id, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Deleted task not found",
+        )
+    await uow.commit()
+
+    children_count = await service.get_children_count(task_id)
+    tasks_tags = await service.get_tasks_tags([task_id])
+    return task_to_response(task, children_count, tasks_tags.get(task_id, []))
+
+
 @router.post("/{task_id}/status", response_model=TaskResponse)
 async def change_task_status(
     task_id: UUID,
     status_data: TaskStatusChange,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user: User = Depends(get_current_user),
 ):
     """Change task status with optional comment"""
-    service = TaskService(db)
+    service = TaskService(uow.db, uow)
 
     task = await service.change_status(task_id, status_data, user_id=current_user.id)
 
@@ -469,6 +577,7 @@ async def change_task_status(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
+    await uow.commit()
 
     children_count = await service.get_children_count(task_id)
     tasks_tags = await service.get_tasks_tags([task_id])
@@ -540,7 +649,7 @@ async def reject_task(
 async def change_status_with_workflow(
     task_id: UUID,
     status_data: TaskStatusChangeWorkflow,
-    db: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -548,7 +657,7 @@ async def change_status_with_workflow(
 
     Validates transition using workflow template if task has one
     """
-    service = TaskService(db)
+    service = TaskService(uow.db, uow)
 
     try:
         task = await service.change_status_with_workflow(
@@ -563,6 +672,7 @@ async def change_status_with_workflow(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found",
             )
+        await uow.commit()
 
         children_count = await service.get_children_count(task_id)
         tasks_tags = await service.get_tasks_tags([task_id])
@@ -758,12 +868,16 @@ async def get_participated_tasks(
 async def reorder_kanban_tasks(
     project_id: UUID,
     data: KanbanReorderRequest,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Update kanban positions for tasks in a status column.
 
+    Only tasks that actually moved are written; the column is rebalanced in
+    the background when its position keys grow too long.
+
     Args:
         project_id: Project ID (query parameter)
         data: KanbanReorderRequest with task_ids in order and status
@@ -773,10 +887,12 @@ async def reorder_kanban_tasks(
     """
     service = TaskService(db)
 
-    await service.update_kanban_positions(
+    needs_rebalance = await service.update_kanban_positions(
         project_id=project_id,
         status=data.status.value,
         task_ids=data.task_ids,
     )
+    if needs_rebalance:
+        background_tasks.add_task(rebalance_kanban_column_job, project_id, data.status.value)
 
     return {"success": True, "message": "Positions updated"}
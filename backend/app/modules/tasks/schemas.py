@@ -7,8 +7,9 @@ from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
+from app.core.lexorank import DEFAULT_RANK
 from app.core.types import RejectionReason, TaskPriority, TaskStatus
 
 
@@ -102,7 +103,7 @@ class TaskResponse(BaseModel):
     rejection_reason: str | None = None
     rejection_comment: str | None = None
     completion_result: str | None = None
-    kanban_position: int = 0
+    kanban_position: str = DEFAULT_RANK  # Fractional rank within the status column
     smart_score: dict[str, Any] | None = None
     smart_validated_at: datetime | None
     smart_is_valid: bool | None
@@ -112,6 +113,18 @@ class TaskResponse(BaseModel):
     updated_at: datetime
 
 
+class SimilarTaskResponse(BaseModel):
+    """Schema for a likely duplicate task"""
+
+    id: UUID
+    title: str
+    status: str
+    priority: str
+    project_id: UUID | None
+    assignee_id: UUID | None
+    score: float  # Estimated Jaccard similarity of title + description (0..1)
+
+
 class TaskAccept(BaseModel):
     """Schema for accepting a task"""
 
@@ -185,3 +198,61 @@ class KanbanReorderRequest(BaseModel):
     task_ids: list[UUID]
     # The status column this order applies to
     status: TaskStatus
+
+
+class TaskBulkFilter(BaseModel):
+    """Task selection by filter (same semantics as GET /tasks filters)"""
+
+    status: list[TaskStatus] | None = None
+    priority: list[TaskPriority] | None = None
+    search: str | None = None
+    project_id: UUID | None = None
+    no_project: bool | None = None
+    assignee_id: UUID | None = None
+    creator_id: UUID | None = None
+    is_overdue: bool | None = None
+    parent_id: UUID | None = None
+    tag_ids: list[UUID] | None = None
+
+
+class TaskBulkPatch(BaseModel):
+    """Changes applied to every selected task; unset fields are left alone"""
+
+    status: TaskStatus | None = None
+    priority: TaskPriority | None = None
+    assignee_id: UUID | None = None  # Explicit null unassigns
+    project_id: UUID | None = None  # Explicit null removes from project
+    due_date: datetime | None = None
+    add_tag_ids: list[UUID] = []
+    remove_tag_ids: list[UUID] = []
+
+
+class TaskBulkUpdate(BaseModel):
+    """Request for POST /tasks/bulk: either task_ids or filter"""
+
+    task_ids: list[UUID] | None = None
+    filter: TaskBulkFilter | None = None
+    patch: TaskBulkPatch
+
+    @model_validator(mode="after")
+    def check_selection(self) -> "TaskBulkUpdate":
+        if (self.task_ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of task_ids or filter")
+        return self
+
+
+class TaskBulkItemResult(BaseModel):
+    """Outcome for one task of a bulk update"""
+
+    task_id: UUID
+    success: bool
+    changed_fields: list[str] = []
+    error: str | None = None
+
+
+class TaskBulkUpdateResponse(BaseModel):
+    """Result of a bulk update"""
+
+    matched: int  # Tasks selected and found
+    updated: int  # Tasks with at least one actual change
+    results: list[TaskBulkItemResult]
@@ -2,18 +2,32 @@
 SmartTask360 — Task service (business logic)
 """
 
-from datetime import datetime
-from uuid import UUID
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID, uuid4
 
 from sqlalchemy import delete as sql_delete
-from sqlalchemy import func, select, text, update
+from sqlalchemy import Select, String, Uuid, any_, bindparam, cast, func, insert, or_, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.lexorank import needs_rebalance, rank_after, rerank, spread_ranks
 from app.core.types import TaskStatus
+from app.core.unit_of_work import UnitOfWork
+from app.modules.departments.models import LTREE
+from app.modules.tasks import counters
+from app.modules.projects.models import Project
 from app.modules.tasks.models import Task, task_participants, task_watchers
+from app.modules.gantt.schedule_cache import project_schedule_cache
+from app.modules.tasks.similarity import task_similarity_index
 from app.modules.tags.models import Tag, task_tags
 from app.modules.tasks.schemas import (
     TaskAccept,
+    TaskBulkItemResult,
+    TaskBulkUpdate,
+    TaskBulkUpdateResponse,
     TaskCreate,
     TaskReject,
     TaskStatusChange,
@@ -21,6 +35,7 @@ from app.modules.tasks.schemas import (
     UserBrief,
 )
 from app.modules.users.models import User
+from app.modules.task_history.models import TaskHistory
 from app.modules.task_history.service import TaskHistoryService
 from app.modules.task_history.schemas import TaskHistoryCreate
 
@@ -28,8 +43,9 @@ from app.modules.task_history.schemas import TaskHistoryCreate
 class TaskService:
     """Service for task operations with hierarchy support"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, uow: UnitOfWork | None = None):
         self.db = db
+        self.uow = uow or UnitOfWork.standalone(db)
 
     async def get_by_id(self, task_id: UUID) -> Task | None:
         """Get task by ID (including soft-deleted)"""
@@ -58,7 +74,39 @@ class TaskService:
         if not include_deleted:
             query = query.where(Task.is_deleted == False)
 
-        # Apply filters
+        query = self._apply_filters(
+            query,
+            status=status,
+            priority=priority,
+            search=search,
+            project_id=project_id,
+            no_project=no_project,
+            assignee_id=assignee_id,
+            creator_id=creator_id,
+            is_overdue=is_overdue,
+            parent_id=parent_id,
+            tag_ids=tag_ids,
+        )
+        query = query.order_by(Task.path).offset(skip).limit(limit)
+
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _apply_filters(
+        query: Select,
+        status: str | list[str] | None = None,
+        priority: str | list[str] | None = None,
+        search: str | None = None,
+        project_id: UUID | None = None,
+        no_project: bool | None = None,
+        assignee_id: UUID | None = None,
+        creator_id: UUID | None = None,
+        is_overdue: bool | None = None,
+        parent_id: UUID | None = None,
+        tag_ids: list[UUID] | None = None,
+    ) -> Select:
+        """Add task list filters to a query selecting from Task"""
         if status:
             if isinstance(status, list):
                 query = query.where(Task.status.in_(status))
@@ -97,10 +145,7 @@ class TaskService:
                 task_tags.c.tag_id.in_(tag_ids)
             ).distinct()
 
-        query = query.order_by(Task.path).offset(skip).limit(limit)
-
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return query
 
     async def get_root_tasks(self) -> list[Task]:
         """Get all root-level tasks (depth = 0)"""
@@ -261,15 +306,17 @@ class TaskService:
         if task.assignee_id and task.status == TaskStatus.NEW.value:
             task.status = TaskStatus.ASSIGNED.value
 
-        await self.db.commit()
-        await self.db.refresh(task)
+        # New cards go to the bottom of their kanban column
+        task.kanban_position = await self._rank_at_column_end(task.project_id, task.status, task.id)
+
+        await counters.adjust(self.db, task.parent_id, children_count=1)
 
-        # Record history entry for task creation
-        history_service = TaskHistoryService(self.db)
+        # Record history entry for task creation (written with the task)
+        history_service = TaskHistoryService(self.db, self.uow)
         await history_service.create_entry(
             TaskHistoryCreate(
                 task_id=task.id,
-                user_id=current_user_id,
+                changed_by_id=current_user_id,
                 action="created",
                 field_name=None,
                 old_value=None,
@@ -277,7 +324,12 @@ class TaskService:
                 extra_data={"title": task.title, "status": task.status},
             )
         )
-        await self.db.commit()
+
+        self.uow.after_commit(
+            lambda: task_similarity_index.add(task.id, task.title, task.description)
+        )
+        self.uow.after_commit(lambda: project_schedule_cache.task_changed(task))
+        await self.uow.save()
 
         return task
 
@@ -296,12 +348,16 @@ class TaskService:
         if "priority" in update_data and update_data["priority"] is not None:
             update_data["priority"] = update_data["priority"].value
 
+        old_column = (task.project_id, task.status)
         for field, value in update_data.items():
             setattr(task, field, value)
+        if (task.project_id, task.status) != old_column:
+            task.kanban_position = await self._rank_at_column_end(task.project_id, task.status, task.id)
 
         # Handle parent change (move in hierarchy)
         if "parent_id" in task_data.model_dump(exclude_unset=True):
             new_parent_id = task_data.parent_id
+            old_parent_id = task.parent_id
 
             # Prevent moving task under itself or its descendants
             if new_parent_id:
@@ -335,8 +391,19 @@ class TaskService:
                 # Update paths of all descendants
                 await self._update_descendant_paths(task, old_path)
 
+            if new_parent_id != old_parent_id:
+                await counters.adjust_many(
+                    self.db,
+                    {old_parent_id: {"children_count": -1}, new_parent_id: {"children_count": 1}},
+                )
+
         await self.db.commit()
         await self.db.refresh(task)
+
+        if "title" in update_data or "description" in update_data:
+            task_similarity_index.add(task.id, task.title, task.description)
+        project_schedule_cache.task_changed(task)
+
         return task
 
     async def _update_descendant_paths(self, task: Task, old_path: str):
@@ -350,22 +417,377 @@ class TaskService:
             descendant.path = task.path + relative_path
             descendant.depth = descendant.path.count(".") if "." in descendant.path else 0
 
-    async def delete(self, task_id: UUID) -> bool:
+    async def bulk_update(
+        self, data: TaskBulkUpdate, user_id: UUID
+    ) -> TaskBulkUpdateResponse:
         """
-        Soft delete task (set is_deleted = True).
-        Optionally cascade to descendants.
+        Apply one patch to many tasks in a single transaction.
+
+        Column changes are one UPDATE ... WHERE id = ANY(:ids), tag changes one
+        INSERT and one DELETE, and history rows one multi-row INSERT, however
+        many tasks are selected.
+
+        Raises:
+            ValueError: Too many tasks selected, unknown/conflicting tags, or
+                unknown project or assignee
+        """
+        patch = data.patch
+        values = patch.model_dump(exclude_unset=True, exclude={"add_tag_ids", "remove_tag_ids"})
+        for field in ("status", "priority"):
+            if field in values:
+                if values[field] is None:
+                    del values[field]  # Not nullable
+                else:
+                    values[field] = values[field].value
+        if values.get("due_date") is not None and values["due_date"].tzinfo is not None:
+            values["due_date"] = values["due_date"].astimezone(timezone.utc).replace(tzinfo=None)
+
+        add_tag_ids = set(patch.add_tag_ids)
+        remove_tag_ids = set(patch.remove_tag_ids)
+        if add_tag_ids & remove_tag_ids:
+            raise ValueError("A tag cannot be both added and removed")
+        if add_tag_ids:
+            result = await self.db.execute(
+                select(Tag.id).where(Tag.id.in_(add_tag_ids), Tag.is_active == True)
+            )
+            unknown = add_tag_ids - set(result.scalars().all())
+            if unknown:
+                raise ValueError(f"Tags not found: {', '.join(sorted(map(str, unknown)))}")
+        if values.get("project_id") is not None:
+            result = await self.db.execute(
+                select(Project.id).where(Project.id == values["project_id"], Project.is_deleted == False)
+            )
+            if result.scalar() is None:
+                raise ValueError(f"Project {values['project_id']} not found")
+        if values.get("assignee_id") is not None:
+            result = await self.db.execute(
+                select(User.id).where(User.id == values["assignee_id"], User.is_active == True)
+            )
+            if result.scalar() is None:
+                raise ValueError(f"User {values['assignee_id']} not found")
+
+        # Select targets with the current values of the patched columns
+        max_items = settings.TASK_BULK_MAX_ITEMS
+        columns = dict.fromkeys(["project_id", "status", *values])
+        query = select(Task.id, *(getattr(Task, f) for f in columns)).where(
+            Task.is_deleted == False
+        )
+        if data.task_ids is not None:
+            requested = list(dict.fromkeys(data.task_ids))
+            if len(requested) > max_items:
+                raise ValueError(f"At most {max_items} tasks can be updated at once")
+            query = query.where(Task.id == any_(bindparam("b_ids", requested, type_=ARRAY(Uuid))))
+        else:
+            criteria = data.filter
+            query = self._apply_filters(
+                query,
+                status=[s.value for s in criteria.status] if criteria.status else None,
+                priority=[p.value for p in criteria.priority] if criteria.priority else None,
+                search=criteria.search,
+                project_id=criteria.project_id,
+                no_project=criteria.no_project,
+                assignee_id=criteria.assignee_id,
+                creator_id=criteria.creator_id,
+                is_overdue=criteria.is_overdue,
+                parent_id=criteria.parent_id,
+                tag_ids=criteria.tag_ids,
+            ).limit(max_items + 1)
+        rows = (await self.db.execute(query)).all()
+        if len(rows) > max_items:
+            raise ValueError(f"Filter matches more than {max_items} tasks")
+        if data.task_ids is None:
+            requested = [row.id for row in rows]
+        found = {row.id: row for row in rows}
+
+        existing_tags: set[tuple[UUID, UUID]] = set()
+        if found and (add_tag_ids or remove_tag_ids):
+            result = await self.db.execute(
+                select(task_tags.c.task_id, task_tags.c.tag_id).where(
+                    task_tags.c.task_id == any_(bindparam("b_tag_tasks", list(found), type_=ARRAY(Uuid))),
+                    task_tags.c.tag_id.in_(add_tag_ids | remove_tag_ids),
+                )
+            )
+            existing_tags = {(row.task_id, row.tag_id) for row in result.all()}
+
+        # Work out per task what actually changes
+        now = datetime.utcnow()
+        column_changes: list[UUID] = []
+        tag_inserts: list[dict] = []
+        tag_deletes: list[UUID] = []
+        history: list[dict] = []
+        results: list[TaskBulkItemResult] = []
+        for task_id in requested:
+            row = found.get(task_id)
+            if row is None:
+                results.append(TaskBulkItemResult(task_id=task_id, success=False, error="Task not found"))
+                continue
+
+            changed = [field for field, value in values.items() if getattr(row, field) != value]
+            if changed:
+                column_changes.append(task_id)
+            for field in changed:
+                history.append(
+                    self._bulk_history_row(task_id, user_id, field, getattr(row, field), values[field], now)
+                )
+
+            added = sorted(t for t in add_tag_ids if (task_id, t) not in existing_tags)
+            removed = sorted(t for t in remove_tag_ids if (task_id, t) in existing_tags)
+            tag_inserts.extend({"task_id": task_id, "tag_id": tag_id} for tag_id in added)
+            if removed:
+                tag_deletes.append(task_id)
+            if added or removed:
+                changed.append("tags")
+                history.append(
+                    {
+                        "id": uuid4(),
+                        "task_id": task_id,
+                        "changed_by_id": user_id,
+                        "action": "updated",
+                        "field_name": "tags",
+                        "old_value": None,
+                        "new_value": {
+                            "added": [str(t) for t in added],
+                            "removed": [str(t) for t in removed],
+                        },
+                        "comment": None,
+                        "extra_data": {"bulk": True},
+                        "created_at": now,
+                    }
+                )
+
+            results.append(TaskBulkItemResult(task_id=task_id, success=True, changed_fields=changed))
+
+        rank_changes = await self._bulk_column_end_ranks(values, found, column_changes)
+
+        # Set-based writes, one statement each
+        tasks = Task.__table__
+        if column_changes:
+            extra: dict = {"updated_at": now}
+            if values.get("status") == TaskStatus.IN_PROGRESS.value:
+                extra["started_at"] = func.coalesce(tasks.c.started_at, now)
+            elif values.get("status") == TaskStatus.DONE.value:
+                extra["completed_at"] = func.coalesce(tasks.c.completed_at, now)
+            await self.db.execute(
+                update(tasks)
+                .where(tasks.c.id == any_(bindparam("b_changed", column_changes, type_=ARRAY(Uuid))))
+                .values(**values, **extra)
+            )
+        if rank_changes:
+            await self.db.execute(
+                update(tasks)
+                .where(tasks.c.id == bindparam("b_id"))
+                .values(kanban_position=bindparam("b_rank")),
+                rank_changes,
+            )
+        if tag_inserts:
+            await self.db.execute(pg_insert(task_tags).on_conflict_do_nothing(), tag_inserts)
+        if tag_deletes:
+            await self.db.execute(
+                task_tags.delete().where(
+                    task_tags.c.task_id == any_(bindparam("b_untag", tag_deletes, type_=ARRAY(Uuid))),
+                    task_tags.c.tag_id.in_(remove_tag_ids),
+                )
+            )
+        if history:
+            await self.db.execute(insert(TaskHistory.__table__), history)
+        await self.db.commit()
+
+        if column_changes and set(values) - {"priority", "assignee_id"}:
+            affected_projects = {found[task_id].project_id for task_id in column_changes}
+            affected_projects.add(values.get("project_id"))
+            for project_id in affected_projects:
+                project_schedule_cache.invalidate(project_id)
+
+        return TaskBulkUpdateResponse(
+            matched=len(found),
+            updated=sum(1 for r in results if r.changed_fields),
+            results=results,
+        )
+
+    async def _bulk_column_end_ranks(
+        self, values: dict, found: dict, task_ids: list[UUID]
+    ) -> list[dict]:
+        """
+        New ranks for tasks a bulk patch moves to another kanban column.
+
+        Moved tasks go to the bottom of their new column in request order.
+        The last rank of every target column comes from one grouped query.
+        """
+        if "status" not in values and "project_id" not in values:
+            return []
+
+        moves: dict[tuple, list[UUID]] = {}
+        for task_id in task_ids:
+            row = found[task_id]
+            column = (values.get("project_id", row.project_id), values.get("status", row.status))
+            if column != (row.project_id, row.status):
+                moves.setdefault(column, []).append(task_id)
+        if not moves:
+            return []
+
+        projects = {project_id for project_id, _ in moves}
+        in_projects = [Task.project_id.in_([p for p in projects if p is not None])]
+        if None in projects:
+            in_projects.append(Task.project_id.is_(None))
+        result = await self.db.execute(
+            select(Task.project_id, Task.status, func.max(Task.kanban_position))
+            .where(or_(*in_projects), Task.status.in_({status for _, status in moves}))
+            .group_by(Task.project_id, Task.status)
+        )
+        last_ranks = {(project_id, status): rank for project_id, status, rank in result.all()}
+
+        changes = []
+        for column, moved_ids in moves.items():
+            rank = last_ranks.get(column)
+            for task_id in moved_ids:
+                rank = rank_after(rank)
+                changes.append({"b_id": task_id, "b_rank": rank})
+        return changes
+
+    @staticmethod
+    def _bulk_history_row(
+        task_id: UUID, user_id: UUID, field: str, old: Any, new: Any, now: datetime
+    ) -> dict:
+        """task_history row for one field changed by a bulk update"""
+
+        def as_json(value: Any) -> Any:
+            if isinstance(value, datetime):
+                return value.isoformat()
+            return str(value) if isinstance(value, UUID) else value
+
+        if field == "status":
+            action, old_value, new_value = "status_changed", {"status": old}, {"status": new}
+        else:
+            action = "assigned" if field == "assignee_id" else "updated"
+            old_value = {"value": as_json(old)} if old is not None else None
+            new_value = {"value": as_json(new)} if new is not None else None
+
+        return {
+            "id": uuid4(),
+            "task_id": task_id,
+            "changed_by_id": user_id,
+            "action": action,
+            "field_name": field,
+            "old_value": old_value,
+            "new_value": new_value,
+            "comment": None,
+            "extra_data": {"bulk": True},
+            "created_at": now,
+        }
+
+    async def delete(self, task_id: UUID, user_id: UUID | None = None) -> bool:
+        """
+        Soft delete a task and all of its live descendants.
+
+        One UPDATE over the ltree subtree; every row gets the same deleted_at
+        so `restore` can bring back exactly this cascade.
         """
         task = await self.get_by_id(task_id)
         if not task or task.is_deleted:
             return False
 
-        # Soft delete
-        task.is_deleted = True
-        task.updated_at = datetime.utcnow()
+        now = datetime.utcnow()
+        tasks = Task.__table__
+        result = await self.db.execute(
+            update(tasks)
+            .where(self._in_subtree(task.path), tasks.c.is_deleted == False)
+            .values(is_deleted=True, deleted_at=now, updated_at=now)
+            .returning(tasks.c.id, tasks.c.project_id)
+        )
+        rows = result.all()
+        await self.db.execute(
+            insert(TaskHistory.__table__),
+            self._subtree_history_rows(rows, task_id, "deleted", user_id, now),
+        )
+        await counters.recount_children(self.db, {task.parent_id, *(row.id for row in rows)})
 
-        await self.db.commit()
+        def forget() -> None:
+            for row in rows:
+                task_similarity_index.remove(row.id)
+            for project_id in {row.project_id for row in rows}:
+                project_schedule_cache.invalidate(project_id)
+
+        self.uow.after_commit(forget)
+        await self.uow.save()
         return True
 
+    async def restore(self, task_id: UUID, user_id: UUID | None = None) -> Task | None:
+        """
+        Restore a soft-deleted task with the descendants deleted along with it.
+
+        Subtasks that had been deleted on their own before the cascade stay
+        deleted (their deleted_at differs).
+
+        Raises:
+            ValueError: If the parent task is still deleted
+        """
+        task = await self.get_by_id(task_id)
+        if not task or not task.is_deleted:
+            return None
+
+        if task.parent_id:
+            parent = await self.get_by_id(task.parent_id)
+            if parent and parent.is_deleted:
+                raise ValueError("Cannot restore subtask of a deleted task; restore the parent first")
+
+        now = datetime.utcnow()
+        tasks = Task.__table__
+        result = await self.db.execute(
+            update(tasks)
+            .where(
+                self._in_subtree(task.path),
+                tasks.c.is_deleted == True,
+                tasks.c.deleted_at == task.deleted_at,
+            )
+            .values(is_deleted=False, deleted_at=None, updated_at=now)
+            .returning(tasks.c.id, tasks.c.title, tasks.c.description, tasks.c.project_id)
+        )
+        rows = result.all()
+        await self.db.execute(
+            insert(TaskHistory.__table__),
+            self._subtree_history_rows(rows, task_id, "restored", user_id, now),
+        )
+        await counters.recount_children(self.db, {task.parent_id, *(row.id for row in rows)})
+        await self.db.refresh(task)
+
+        def reindex() -> None:
+            for row in rows:
+                task_similarity_index.add(row.id, row.title, row.description)
+            for project_id in {row.project_id for row in rows}:
+                project_schedule_cache.invalidate(project_id)
+
+        self.uow.after_commit(reindex)
+        await self.uow.save()
+        return task
+
+    @staticmethod
+    def _in_subtree(path: str):
+        """Task and all descendants (ltree <@, served by the GiST path index)"""
+        return Task.__table__.c.path.op("<@")(
+            cast(bindparam("subtree_path", path, type_=String), LTREE)
+        )
+
+    @staticmethod
+    def _subtree_history_rows(
+        rows: list, root_id: UUID, action: str, user_id: UUID | None, now: datetime
+    ) -> list[dict]:
+        """One task_history row per task touched by a subtree delete/restore"""
+        return [
+            {
+                "id": uuid4(),
+                "task_id": row.id,
+                "changed_by_id": user_id,
+                "action": action,
+                "field_name": "is_deleted",
+                "old_value": {"value": action == "restored"},
+                "new_value": {"value": action == "deleted"},
+                "comment": None,
+                "extra_data": None if row.id == root_id else {"root_task_id": str(root_id)},
+                "created_at": now,
+            }
+            for row in rows
+        ]
+
     async def change_status(
         self, task_id: UUID, status_data: TaskStatusChange, user_id: UUID
     ) -> Task | None:
@@ -379,6 +801,8 @@ class TaskService:
 
         # Update status
         task.status = new_status
+        if new_status != old_status:
+            task.kanban_position = await self._rank_at_column_end(task.project_id, new_status, task.id)
 
         # Track started_at and completed_at
         if new_status == TaskStatus.IN_PROGRESS.value and not task.started_at:
@@ -390,15 +814,12 @@ class TaskService:
         if status_data.comment and new_status in (TaskStatus.DONE.value, TaskStatus.IN_REVIEW.value):
             task.completion_result = status_data.comment
 
-        await self.db.commit()
-        await self.db.refresh(task)
-
-        # Log status change in task_history
-        history_service = TaskHistoryService(self.db)
+        # Log status change in task_history (written with the status)
+        history_service = TaskHistoryService(self.db, self.uow)
         await history_service.create_entry(
             TaskHistoryCreate(
                 task_id=task.id,
-                user_id=user_id,
+                changed_by_id=user_id,
                 action="status_changed",
                 field_name="status",
                 old_value={"status": old_status},
@@ -406,7 +827,9 @@ class TaskService:
                 extra_data={"comment": status_data.comment} if status_data.comment else None,
             )
         )
-        await self.db.commit()
+
+        self.uow.after_commit(lambda: project_schedule_cache.task_changed(task))
+        await self.uow.save()
 
         # TODO: Create notification for assignee/creator
 
@@ -430,11 +853,14 @@ class TaskService:
 
         # Accept task
         task.accepted_at = datetime.utcnow()
-        task.status = TaskStatus.IN_PROGRESS.value
+        if task.status != TaskStatus.IN_PROGRESS.value:
+            task.status = TaskStatus.IN_PROGRESS.value
+            task.kanban_position = await self._rank_at_column_end(task.project_id, task.status, task.id)
         task.started_at = datetime.utcnow()
 
         await self.db.commit()
         await self.db.refresh(task)
+        project_schedule_cache.task_changed(task)
 
         # TODO: Create notification for creator
 
@@ -618,6 +1044,8 @@ class TaskService:
 
         # Update status
         task.status = new_status
+        if new_status != old_status:
+            task.kanban_position = await self._rank_at_column_end(task.project_id, new_status, task.id)
 
         # Track started_at and completed_at
         if new_status == TaskStatus.IN_PROGRESS.value and not task.started_at:
@@ -625,8 +1053,8 @@ class TaskService:
         elif new_status == TaskStatus.DONE.value and not task.completed_at:
             task.completed_at = datetime.utcnow()
 
-        await self.db.commit()
-        await self.db.refresh(task)
+        self.uow.after_commit(lambda: project_schedule_cache.task_changed(task))
+        await self.uow.save()
 
         # TODO: Log status change in task_history
 
@@ -665,9 +1093,14 @@ class TaskService:
     # ========================================================================
 
     async def update_smart_score(
-        self, task_id: UUID, smart_score: dict, is_valid: bool
+        self, task_id: UUID, smart_score: dict, is_valid: bool, commit: bool = True
     ) -> Task | None:
-        """Update task with SMART validation results"""
+        """
+        Update task with SMART validation results.
+
+        With commit=False the change is only staged in the session so the
+        caller can persist it together with its own writes.
+        """
         task = await self.get_by_id(task_id)
         if not task or task.is_deleted:
             return None
@@ -676,38 +1109,120 @@ class TaskService:
         task.smart_is_valid = is_valid
         task.smart_validated_at = datetime.utcnow()
 
-        await self.db.commit()
-        await self.db.refresh(task)
+        if commit:
+            await self.db.commit()
+            await self.db.refresh(task)
         return task
 
+    async def bulk_update_smart_scores(
+        self, scores: dict[UUID, tuple[dict, bool]]
+    ) -> int:
+        """
+        Apply SMART validation results to many tasks in one transaction.
+
+        Args:
+            scores: task_id -> (smart_score, is_valid)
+
+        Returns:
+            Number of results submitted (deleted tasks are skipped by the WHERE)
+        """
+        if not scores:
+            return 0
+
+        tasks = Task.__table__
+        stmt = (
+            update(tasks)
+            .where(tasks.c.id == bindparam("b_id"))
+            .where(tasks.c.is_deleted == False)
+            .values(
+                smart_score=bindparam("b_score"),
+                smart_is_valid=bindparam("b_valid"),
+                smart_validated_at=datetime.utcnow(),
+            )
+        )
+        await self.db.execute(
+            stmt,
+            [
+                {"b_id": task_id, "b_score": score, "b_valid": is_valid}
+                for task_id, (score, is_valid) in scores.items()
+            ],
+        )
+        await self.db.commit()
+        return len(scores)
+
+    async def get_open_tasks(
+        self, limit: int = 1000, after_id: UUID | None = None
+    ) -> list[Task]:
+        """
+        Get non-deleted tasks that are not done/cancelled, keyset-paginated by ID.
+
+        Used by batch jobs that walk the whole task table.
+        """
+        query = (
+            select(Task)
+            .where(Task.is_deleted == False)
+            .where(Task.status.notin_([TaskStatus.DONE.value, TaskStatus.CANCELLED.value]))
+        )
+        if after_id:
+            query = query.where(Task.id > after_id)
+
+        result = await self.db.execute(query.order_by(Task.id).limit(limit))
+        return list(result.scalars().all())
+
     # ========================================================================
-    # Children Count
+    # Duplicate Detection
     # ========================================================================
 
-    async def get_children_count(self, task_id: UUID) -> int:
-        """Get count of direct (non-deleted) children for a task"""
+    async def get_similar_tasks(
+        self, task: Task, limit: int = 10, min_score: float = 0.5
+    ) -> list[tuple[Task, float]]:
+        """
+        Find likely duplicates of a task via the local MinHash/LSH index.
+
+        Returns:
+            [(task, similarity score)] best first, deleted tasks excluded;
+            empty while the index is still being built
+        """
+        if not task_similarity_index.is_built:
+            task_similarity_index.start_build()
+            return []
+        if task.id not in task_similarity_index:
+            # Created by another worker since this process built its index
+            task_similarity_index.add(task.id, task.title, task.description)
+
+        matches = task_similarity_index.query(task.id, limit=limit, min_score=min_score)
+        if not matches:
+            return []
+
         result = await self.db.execute(
-            select(func.count(Task.id))
-            .where(Task.parent_id == task_id)
+            select(Task)
+            .where(Task.id.in_([task_id for task_id, _ in matches]))
             .where(Task.is_deleted == False)
         )
-        return result.scalar() or 0
+        tasks_by_id = {t.id: t for t in result.scalars().all()}
+
+        return [
+            (tasks_by_id[task_id], score)
+            for task_id, score in matches
+            if task_id in tasks_by_id
+        ]
+
+    # ========================================================================
+    # Children Count
+    # ========================================================================
+
+    async def get_children_count(self, task_id: UUID) -> int:
+        """Get count of direct (non-deleted) children for a task"""
+        counts = await self.get_children_counts([task_id])
+        return counts[task_id]
 
     async def get_children_counts(self, task_ids: list[UUID]) -> dict[UUID, int]:
-        """Get children counts for multiple tasks in one query"""
+        """Get children counts for multiple tasks (maintained counters, one lookup)"""
         if not task_ids:
             return {}
 
-        result = await self.db.execute(
-            select(Task.parent_id, func.count(Task.id))
-            .where(Task.parent_id.in_(task_ids))
-            .where(Task.is_deleted == False)
-            .group_by(Task.parent_id)
-        )
-
-        counts = {row[0]: row[1] for row in result.all()}
-        # Fill in zeros for tasks with no children
-        return {task_id: counts.get(task_id, 0) for task_id in task_ids}
+        task_counts = await counters.get_counters(self.db, task_ids)
+        return {task_id: c["children_count"] for task_id, c in task_counts.items()}
 
     async def get_tasks_tags(self, task_ids: list[UUID]) -> dict[UUID, list[Tag]]:
         """Get tags for multiple tasks in one query"""
@@ -729,6 +1244,16 @@ class TaskService:
 
         return tags_by_task
 
+    async def _rank_at_column_end(
+        self, project_id: UUID | None, status: str, exclude_id: UUID | None = None
+    ) -> str:
+        """Rank that puts a task at the bottom of its kanban column (project + status)"""
+        stmt = select(Task.kanban_position).where(Task.project_id == project_id, Task.status == status)
+        if exclude_id is not None:
+            stmt = stmt.where(Task.id != exclude_id)
+        result = await self.db.execute(stmt.order_by(Task.kanban_position.desc()).limit(1))
+        return rank_after(result.scalar())
+
     async def update_kanban_positions(
         self,
         project_id: UUID,
@@ -738,24 +1263,76 @@ class TaskService:
         """
         Update kanban positions for tasks in a status column.
 
+        Positions are fractional ranks: tasks whose relative order did not
+        change keep their rank, so a single drag writes one row.
+
         Args:
             project_id: Project ID to scope the update
             status: Task status column
             task_ids: Ordered list of task IDs (top to bottom)
 
         Returns:
-            True if successful
+            True if a new rank got long enough that the column should be
+            rebalanced
         """
-        for position, task_id in enumerate(task_ids):
-            await self.db.execute(
-                update(Task)
-                .where(
-                    Task.id == task_id,
-                    Task.project_id == project_id,
-                    Task.status == status,
-                )
-                .values(kanban_position=position)
+        result = await self.db.execute(
+            select(Task.id, Task.kanban_position).where(
+                Task.id.in_(task_ids),
+                Task.project_id == project_id,
+                Task.status == status,
             )
+        )
+        current = dict(result.all())
+        ordered_ids = [task_id for task_id in task_ids if task_id in current]
+
+        changes = rerank([current[task_id] for task_id in ordered_ids])
+        if not changes:
+            return False
 
+        tasks = Task.__table__
+        await self.db.execute(
+            update(tasks)
+            .where(tasks.c.id == bindparam("b_id"))
+            .values(kanban_position=bindparam("b_rank")),
+            [{"b_id": ordered_ids[i], "b_rank": rank} for i, rank in changes.items()],
+        )
         await self.db.commit()
-        return True
+        return any(needs_rebalance(rank) for rank in changes.values())
+
+    async def rebalance_kanban_column(self, project_id: UUID, status: str) -> int:
+        """
+        Re-spread the ranks of a status column as short, evenly spaced keys.
+
+        Returns:
+            Number of tasks re-ranked
+        """
+        result = await self.db.execute(
+            select(Task.id)
+            .where(Task.project_id == project_id, Task.status == status)
+            .order_by(Task.kanban_position, Task.id)
+            .with_for_update()
+        )
+        task_ids = list(result.scalars().all())
+        if not task_ids:
+            return 0
+
+        tasks = Task.__table__
+        await self.db.execute(
+            update(tasks)
+            .where(tasks.c.id == bindparam("b_id"))
+            .values(kanban_position=bindparam("b_rank")),
+            [
+                {"b_id": task_id, "b_rank": rank}
+                for task_id, rank in zip(task_ids, spread_ranks(len(task_ids)))
+            ],
+        )
+        await self.db.commit()
+        return len(task_ids)
+
+
+async def rebalance_kanban_column_job(project_id: UUID, status: str) -> None:
+    """Background task: rebalance a kanban column in its own session"""
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as db:
+        await TaskService(db).rebalance_kanban_column(project_id, status)
@@ -0,0 +1,233 @@
+"""
+SmartTask360 — Task similarity index (duplicate detection)
+
+In-process MinHash + LSH index over task title and description, built in the
+background at startup. TaskService keeps it up to date on create/update/delete;
+lookups never call the AI API.
+
+Each task gets a NUM_PERM-value MinHash signature of its word unigrams and
+bigrams. The signature is cut into BANDS bands of ROWS values; tasks sharing
+any band land in the same bucket and become candidates, which are then ranked
+by estimated Jaccard similarity. A lookup touches BANDS buckets plus a small
+vectorized comparison, independent of corpus size.
+"""
+
+import asyncio
+import re
+import zlib
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.tasks.models import Task
+
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS  # ~0.6 Jaccard threshold for becoming a candidate
+
+# Upper bound of candidates scored per lookup (protects against huge buckets
+# of identical boilerplate titles)
+MAX_CANDIDATES = 5000
+
+# Rows loaded per query when building the index from the database
+BUILD_PAGE_SIZE = 5000
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def task_shingles(title: str, description: str | None) -> set[str]:
+    """Word unigrams and bigrams of lowercased title + description"""
+    words = [
+        w for w in _TOKEN_RE.findall(f"{title} {description or ''}".lower()) if len(w) > 1
+    ]
+    shingles = set(words)
+    shingles.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return shingles
+
+
+class TaskSimilarityIndex:
+    """MinHash/LSH index of task texts keyed by task ID"""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+        self._signatures: dict[UUID, np.ndarray] = {}
+        self._buckets: list[dict[bytes, set[UUID]]] = [{} for _ in range(bands)]
+        self._build_lock = asyncio.Lock()
+        self._build_task: asyncio.Task | None = None
+        self.is_built = False
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, task_id: UUID) -> bool:
+        return task_id in self._signatures
+
+    def signature(self, title: str, description: str | None) -> np.ndarray | None:
+        """MinHash signature (uint32[num_perm]), None for texts without words"""
+        shingles = task_shingles(title, description)
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [
+            signature[i * self.rows : (i + 1) * self.rows].tobytes()
+            for i in range(self.bands)
+        ]
+
+    def add(self, task_id: UUID, title: str, description: str | None) -> None:
+        """Index (or re-index) a task"""
+        self.remove(task_id)
+
+        signature = self.signature(title, description)
+        if signature is None:
+            return
+
+        self._signatures[task_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(task_id)
+
+    def add_many(self, items: list[tuple[UUID, str, str | None]]) -> None:
+        """
+        Index many tasks at once: (task_id, title, description).
+
+        Hashes every shingle of the batch in one vectorized pass and reduces
+        per task with np.minimum.reduceat - much faster than add() in a loop.
+        """
+        task_ids: list[UUID] = []
+        offsets: list[int] = []
+        hashes: list[int] = []
+        for task_id, title, description in items:
+            self.remove(task_id)
+            shingles = task_shingles(title, description)
+            if not shingles:
+                continue
+            task_ids.append(task_id)
+            offsets.append(len(hashes))
+            hashes.extend(zlib.crc32(s.encode("utf-8")) for s in shingles)
+
+        if not task_ids:
+            return
+
+        values = np.asarray(hashes, dtype=np.uint64)
+        permuted = (np.outer(values, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        signatures = np.minimum.reduceat(permuted, offsets, axis=0).astype(np.uint32)
+
+        for task_id, signature in zip(task_ids, signatures):
+            self._signatures[task_id] = signature
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(task_id)
+
+    def remove(self, task_id: UUID) -> None:
+        """Drop a task from the index (no-op if absent)"""
+        signature = self._signatures.pop(task_id, None)
+        if signature is None:
+            return
+
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(task_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def query(
+        self, task_id: UUID, limit: int = 10, min_score: float = 0.5
+    ) -> list[tuple[UUID, float]]:
+        """
+        Find tasks similar to an indexed task.
+
+        Returns:
+            [(task_id, estimated Jaccard similarity)] best first, excluding the task itself
+        """
+        signature = self._signatures.get(task_id)
+        if signature is None:
+            return []
+
+        candidates: set[UUID] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+            if len(candidates) > MAX_CANDIDATES:
+                break
+        candidates.discard(task_id)
+        if not candidates:
+            return []
+
+        candidate_ids = list(candidates)[:MAX_CANDIDATES]
+        matrix = np.stack([self._signatures[c] for c in candidate_ids])
+        scores = (matrix == signature).mean(axis=1)
+
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [
+            (candidate_ids[i], float(scores[i]))
+            for i in order
+            if scores[i] >= min_score
+        ]
+
+    async def build(self, db: AsyncSession) -> None:
+        """Load all non-deleted tasks (keyset-paginated by ID)"""
+        if self.is_built:
+            return
+
+        async with self._build_lock:
+            if self.is_built:
+                return
+
+            after_id = None
+            while True:
+                query = (
+                    select(Task.id, Task.title, Task.description)
+                    .where(Task.is_deleted == False)
+                    .order_by(Task.id)
+                    .limit(BUILD_PAGE_SIZE)
+                )
+                if after_id:
+                    query = query.where(Task.id > after_id)
+
+                rows = (await db.execute(query)).all()
+                if not rows:
+                    break
+                self.add_many([(row.id, row.title, row.description) for row in rows])
+                after_id = rows[-1].id
+
+            self.is_built = True
+
+    def start_build(self) -> None:
+        """
+        Build the index in a background task unless it is built or building.
+
+        Called at startup and again by lookups, so a failed build is retried.
+        Until the build finishes, lookups return no matches instead of
+        blocking a request on the full table scan.
+        """
+        if self.is_built or (self._build_task is not None and not self._build_task.done()):
+            return
+        self._build_task = asyncio.get_running_loop().create_task(build_similarity_index_job())
+
+
+async def build_similarity_index_job() -> None:
+    """Background task: build the process-wide index in its own session"""
+    from app.core.database import async_session_maker
+
+    async with async_session_maker() as db:
+        await task_similarity_index.build(db)
+
+
+# Process-wide index shared by all requests
+task_similarity_index = TaskSimilarityIndex()
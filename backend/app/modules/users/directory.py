@@ -0,0 +1,201 @@
+"""
+SmartTask360 — In-process user directory (@mentions and autocomplete)
+
+Active users' names and emails kept in process memory, like the task
+similarity index, so resolving "@Name" and answering autocomplete
+keystrokes does not hit the database:
+
+- names: lowercased full name -> user ID (exact mention resolution)
+- grams: every 1..3 character substring of the lowercased name and email
+  -> user IDs. A query of up to 3 characters is one dict lookup; longer
+  queries intersect the sets of their trigrams and confirm the substring,
+  so results match the SQL `contains` search.
+
+UserService updates the directory after its own writes. Edits made by
+other worker processes show up after settings.USER_DIRECTORY_TTL_SECONDS,
+when the directory reloads. Installations with more than
+settings.USER_DIRECTORY_MAX_USERS active users are not loaded; callers
+fall back to SQL, served by the lower() and trigram indexes on users.
+"""
+
+import asyncio
+import heapq
+import time
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.modules.users.models import User
+
+GRAM_SIZE = 3
+
+# Rows loaded per query when building the directory
+BUILD_PAGE_SIZE = 5000
+
+
+def _grams(text: str) -> set[str]:
+    """All substrings of 1..GRAM_SIZE characters"""
+    return {
+        text[i : i + n]
+        for n in range(1, GRAM_SIZE + 1)
+        for i in range(len(text) - n + 1)
+    }
+
+
+def _grams_of_size(text: str, n: int) -> list[str]:
+    return [text[i : i + n] for i in range(len(text) - n + 1)]
+
+
+class UserDirectory:
+    """Name/email lookup over active users"""
+
+    def __init__(self):
+        self._clear()
+        self._build_lock = asyncio.Lock()
+        self.built_at: float | None = None
+        self.is_enabled = True
+
+    def _clear(self) -> None:
+        self._users: dict[UUID, tuple[str, str]] = {}  # id -> (lower name, lower email)
+        self._names: dict[str, set[UUID]] = {}
+        self._grams: dict[str, set[UUID]] = {}
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def __contains__(self, user_id: UUID) -> bool:
+        return user_id in self._users
+
+    # ============== Maintenance ==============
+
+    def put(self, user_id: UUID, name: str, email: str, is_active: bool = True) -> None:
+        """Add or refresh a user; inactive users are removed"""
+        self.remove(user_id)
+        if not is_active:
+            return
+
+        name, email = name.lower().strip(), email.lower()
+        self._users[user_id] = (name, email)
+        self._names.setdefault(name, set()).add(user_id)
+        for gram in _grams(name) | _grams(email):
+            self._grams.setdefault(gram, set()).add(user_id)
+
+    def remove(self, user_id: UUID) -> None:
+        """Drop a user (no-op if absent)"""
+        entry = self._users.pop(user_id, None)
+        if entry is None:
+            return
+
+        name, email = entry
+        self._discard(self._names, name, user_id)
+        for gram in _grams(name) | _grams(email):
+            self._discard(self._grams, gram, user_id)
+
+    @staticmethod
+    def _discard(index: dict[str, set[UUID]], key: str, user_id: UUID) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(user_id)
+            if not ids:
+                del index[key]
+
+    def invalidate(self) -> None:
+        """Force a reload on next use"""
+        self.built_at = None
+
+    # ============== Lookups ==============
+
+    def resolve_names(self, names: list[str]) -> dict[str, UUID]:
+        """
+        Exact, case-insensitive name lookup.
+
+        Returns:
+            {lowercased name: user ID} for names that match an active user
+            (the lowest ID wins if several users share a name)
+        """
+        resolved = {}
+        for name in names:
+            key = name.lower().strip()
+            ids = self._names.get(key)
+            if ids:
+                resolved[key] = min(ids)
+        return resolved
+
+    def search(self, query: str, limit: int = 10) -> list[UUID]:
+        """IDs of users whose name or email contains `query`, ordered by name"""
+        query = query.lower()
+        if not query:
+            return []
+
+        if len(query) <= GRAM_SIZE:
+            candidates = self._grams.get(query, set())
+        else:
+            sets = [self._grams.get(gram) for gram in _grams_of_size(query, GRAM_SIZE)]
+            if not all(sets):
+                return []
+            sets.sort(key=len)
+            candidates = set(sets[0]).intersection(*sets[1:])
+            candidates = {
+                user_id
+                for user_id in candidates
+                if query in self._users[user_id][0] or query in self._users[user_id][1]
+            }
+
+        return heapq.nsmallest(limit, candidates, key=lambda user_id: self._users[user_id])
+
+    # ============== Loading ==============
+
+    async def ensure_built(self, db: AsyncSession) -> bool:
+        """
+        Load active users if the directory is missing or older than the TTL.
+
+        Returns:
+            True if lookups can use the directory, False if callers should
+            query the database (too many users)
+        """
+        if self._is_fresh():
+            return self.is_enabled
+
+        async with self._build_lock:
+            if self._is_fresh():
+                return self.is_enabled
+
+            rows = []
+            after_id = None
+            while True:
+                query = (
+                    select(User.id, User.name, User.email)
+                    .where(User.is_active == True)
+                    .order_by(User.id)
+                    .limit(BUILD_PAGE_SIZE)
+                )
+                if after_id:
+                    query = query.where(User.id > after_id)
+
+                page = (await db.execute(query)).all()
+                if not page:
+                    break
+                rows.extend(page)
+                after_id = page[-1].id
+                if len(rows) > settings.USER_DIRECTORY_MAX_USERS:
+                    break
+
+            self._clear()
+            self.is_enabled = len(rows) <= settings.USER_DIRECTORY_MAX_USERS
+            if self.is_enabled:
+                for row in rows:
+                    self.put(row.id, row.name, row.email)
+            self.built_at = time.monotonic()
+            return self.is_enabled
+
+    def _is_fresh(self) -> bool:
+        return (
+            self.built_at is not None
+            and time.monotonic() - self.built_at < settings.USER_DIRECTORY_TTL_SECONDS
+        )
+
+
+# Process-wide directory shared by all requests
+user_directory = UserDirectory()
@@ -5,7 +5,7 @@ SmartTask360 — User model
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import Boolean, String
+from sqlalchemy import Boolean, Index, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -45,3 +45,21 @@ class User(Base):
 
     def __repr__(self) -> str:
         return f"<User {self.email} ({self.role})>"
+
+
+# Exact @mention resolution: lower(name) = ANY(:names)
+Index("ix_users_name_lower", func.lower(User.name))
+
+# Autocomplete fallback: lower(name/email) LIKE '%q%' (pg_trgm)
+Index(
+    "ix_users_name_trgm",
+    func.lower(User.name).label("name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"name_lower": "gin_trgm_ops"},
+)
+Index(
+    "ix_users_email_trgm",
+    func.lower(User.email).label("email_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"email_lower": "gin_trgm_ops"},
+)
@@ -8,6 +8,7 @@ from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_password_hash
+from app.modules.users.directory import user_directory
 from app.modules.users.models import User
 from app.modules.users.schemas import UserCreate, UserUpdate
 
@@ -50,6 +51,7 @@ class UserService:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        user_directory.put(user.id, user.name, user.email, user.is_active)
         return user
 
     async def update(self, user_id: UUID, user_data: UserUpdate) -> User | None:
@@ -65,6 +67,7 @@ class UserService:
 
         await self.db.commit()
         await self.db.refresh(user)
+        user_directory.put(user.id, user.name, user.email, user.is_active)
         return user
 
     async def delete(self, user_id: UUID) -> bool:
@@ -75,6 +78,7 @@ class UserService:
 
         user.is_active = False
         await self.db.commit()
+        user_directory.remove(user_id)
         return True
 
     async def hard_delete(self, user_id: UUID) -> bool:
@@ -85,17 +89,28 @@ class UserService:
 
         await self.db.delete(user)
         await self.db.commit()
+        user_directory.remove(user_id)
         return True
 
     async def search(self, query: str, limit: int = 10) -> list[User]:
         """
         Search users by name or email for @mention autocomplete.
         Case-insensitive search on name and email.
+
+        Served from the in-process user directory; falls back to SQL
+        (trigram indexes on lower(name) / lower(email)) when the directory
+        is disabled for large installations.
         """
         if not query or len(query) < 1:
             return []
 
-        search_pattern = f"%{query}%"
+        if await user_directory.ensure_built(self.db):
+            user_ids = user_directory.search(query, limit)
+            if not user_ids:
+                return []
+            result = await self.db.execute(select(User).where(User.id.in_(user_ids)))
+            users = {user.id: user for user in result.scalars().all()}
+            return [users[user_id] for user_id in user_ids if user_id in users]
 
         result = await self.db.execute(
             select(User)
@@ -0,0 +1,156 @@
+"""
+Test batch SMART scoring (LocalBatchBackend stand-in, no DB or network)
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.modules.ai.batch import (
+    FileCheckpointStore,
+    LocalBatchBackend,
+    SMARTBatchScorer,
+    parse_validation_content,
+)
+
+
+def _response(score: float) -> str:
+    return json.dumps({
+        "overall_score": score,
+        "is_valid": score >= 0.7,
+        "criteria": [],
+        "summary": "ok",
+    })
+
+
+class FakeTaskService:
+    """Records bulk updates; can fail once to simulate an interrupted run"""
+
+    def __init__(self, tasks, fail_after_calls: int | None = None):
+        self.tasks = tasks
+        self.applied: dict = {}
+        self.calls = 0
+        self.fail_after_calls = fail_after_calls
+
+    async def get_open_tasks(self, limit=1000, after_id=None):
+        ids = sorted(self.tasks, key=lambda t: t.id)
+        if after_id:
+            ids = [t for t in ids if t.id > after_id]
+        return ids[:limit]
+
+    async def bulk_update_smart_scores(self, scores):
+        if self.fail_after_calls is not None and self.calls >= self.fail_after_calls:
+            raise RuntimeError("connection lost")
+        self.calls += 1
+        self.applied.update(scores)
+        return len(scores)
+
+
+class LocalScorer(SMARTBatchScorer):
+    """Scorer with settings and parent lookups stubbed out"""
+
+    def __init__(self, task_service, **kwargs):
+        super().__init__(db=None, **kwargs)
+        self.task_service = task_service
+
+    async def _prompt_settings(self):
+        return "test-model", "en", None
+
+    async def _load_parents(self, tasks):
+        return {}
+
+
+def _make_tasks(count: int):
+    return [
+        SimpleNamespace(
+            id=uuid4(), title=f"Task {i}", description="", parent_id=None,
+            priority="medium", status="new", due_date=None, estimated_hours=None,
+        )
+        for i in range(count)
+    ]
+
+
+def test_parse_validation_content():
+    """Markdown-wrapped JSON is accepted, garbage is rejected"""
+    result = parse_validation_content(f"```json\n{_response(0.8)}\n```")
+    assert result.overall_score == 0.8
+    assert result.is_valid
+
+    try:
+        parse_validation_content("not json")
+        assert False, "Should reject invalid content"
+    except ValueError:
+        pass
+
+
+def test_batch_run_applies_scores():
+    """All open tasks are scored; errored requests are reported as failed"""
+    tasks = _make_tasks(5)
+
+    def responder(params):
+        # Static instructions go in a cached system block, task data in the user turn
+        assert params["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert "Title: Task" not in params["system"][0]["text"]
+        if "Title: Task 2" in params["messages"][0]["content"]:
+            raise RuntimeError("errored")
+        return _response(0.9)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FileCheckpointStore(os.path.join(tmp, "checkpoint.json"))
+        service = FakeTaskService(tasks)
+        scorer = LocalScorer(
+            service,
+            backend=LocalBatchBackend(responder, polls_until_complete=2),
+            checkpoint_store=store,
+            poll_interval=0,
+        )
+        result = asyncio.run(scorer.run())
+
+        assert result.total == 5
+        assert result.applied == 4
+        assert result.failed == 1
+        assert tasks[2].id not in service.applied
+        assert store.load() is None, "Checkpoint should be cleared after success"
+
+
+def test_batch_run_resumes_from_checkpoint():
+    """An interrupted apply phase resumes without resubmitting the batch"""
+    import app.modules.ai.batch as batch_module
+
+    tasks = _make_tasks(7)
+    backend = LocalBatchBackend(lambda params: _response(0.75))
+
+    original_chunk = batch_module.APPLY_CHUNK_SIZE
+    batch_module.APPLY_CHUNK_SIZE = 3
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FileCheckpointStore(os.path.join(tmp, "checkpoint.json"))
+
+            # First run dies after the first chunk is written
+            service = FakeTaskService(tasks, fail_after_calls=1)
+            scorer = LocalScorer(service, backend=backend, checkpoint_store=store, poll_interval=0)
+            try:
+                asyncio.run(scorer.run())
+                assert False, "First run should fail"
+            except RuntimeError:
+                pass
+
+            checkpoint = store.load()
+            assert checkpoint is not None and checkpoint.batch_id
+            assert len(checkpoint.applied_task_ids) == 3
+
+            # Second run picks up the same batch and applies the rest
+            service.fail_after_calls = None
+            scorer = LocalScorer(service, backend=backend, checkpoint_store=store, poll_interval=0)
+            result = asyncio.run(scorer.run())
+
+            assert result.resumed
+            assert result.batch_id == checkpoint.batch_id
+            assert result.applied == 7
+            assert len(backend.batches) == 1, "Batch must not be resubmitted"
+            assert set(service.applied) == {t.id for t in tasks}
+    finally:
+        batch_module.APPLY_CHUNK_SIZE = original_chunk
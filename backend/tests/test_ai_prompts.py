@@ -0,0 +1,60 @@
+"""
+Test cached prompt layout (static system prefix + dynamic user suffix)
+"""
+
+from app.modules.ai.prompts import (
+    PROMPT_CACHE_MIN_TOKENS,
+    CachedPrompt,
+    build_risk_analysis_prompt,
+    build_smart_validation_prompt,
+    estimate_tokens,
+    render_cached_prompt,
+)
+
+
+def test_split_at_first_dynamic_field():
+    template = "Static rules.\n\nMore rules.\n\nTask: {title}\nAnswer in {language_instruction}"
+    prompt = render_cached_prompt(template, title="Ship it", language_instruction="English")
+
+    assert prompt.system == "Static rules.\n\nMore rules."
+    assert prompt.user == "Task: Ship it\nAnswer in English"
+    assert prompt.messages() == [{"role": "user", "content": "Task: Ship it\nAnswer in English"}]
+
+
+def test_template_starting_with_task_data_has_no_prefix():
+    prompt = render_cached_prompt("Task: {title}\n\nRules.", title="Ship it")
+
+    assert prompt.system == ""
+    assert prompt.user == "Task: Ship it\n\nRules."
+    assert prompt.system_blocks() is None
+
+
+def test_small_prefix_is_sent_without_cache_control():
+    prompt = CachedPrompt(system="Short rules.", user="Task: Ship it")
+
+    assert not prompt.is_cacheable
+    assert prompt.system_blocks() == [{"type": "text", "text": "Short rules."}]
+
+
+def test_large_prefix_is_marked_for_caching():
+    system = "Rule. " * (PROMPT_CACHE_MIN_TOKENS + 10)
+    prompt = CachedPrompt(system=system, user="Task: Ship it")
+
+    assert estimate_tokens(system) >= PROMPT_CACHE_MIN_TOKENS
+    blocks = prompt.system_blocks()
+    assert len(blocks) == 1
+    assert blocks[0]["text"] == system
+    assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_default_prompts_keep_task_data_out_of_the_prefix():
+    smart = build_smart_validation_prompt("Ship release", "Cut the 2.0 tag", language="en")
+    risk = build_risk_analysis_prompt("Ship release", "Cut the 2.0 tag", language="en")
+
+    for prompt in (smart, risk):
+        assert "Ship release" not in prompt.system
+        assert "Ship release" in prompt.user
+
+    # Only the long SMART instructions reach the cache minimum
+    assert "cache_control" in smart.system_blocks()[0]
+    assert "cache_control" not in risk.system_blocks()[0]
@@ -0,0 +1,123 @@
+"""
+Test the AI conversation unit of work (fake session, no DB)
+"""
+
+import asyncio
+from uuid import uuid4
+
+from app.modules.ai.models import AIConversation
+from app.modules.ai.schemas import AIConversationCreate, AIConversationUpdate, AIMessageCreate
+from app.modules.ai.unit_of_work import ConversationUnitOfWork
+from app.modules.views.models import UserView  # noqa: F401 - completes the User mapper
+
+
+class FakeSession:
+    """Records staged objects and transaction calls"""
+
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.committed = []  # objects staged at each commit
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def add_all(self, objs):
+        self.added.extend(objs)
+
+    async def commit(self):
+        self.commits += 1
+        self.committed.append(list(self.added))
+        self.added = []
+
+    async def rollback(self):
+        self.rollbacks += 1
+        self.added = []
+
+
+def _conversation_data() -> AIConversationCreate:
+    return AIConversationCreate(
+        conversation_type="smart_validation",
+        task_id=uuid4(),
+        user_id=uuid4(),
+        model="claude-sonnet-4-20250514",
+        temperature=0.3,
+        context={},
+    )
+
+
+def _message(role: str, sequence: int) -> AIMessageCreate:
+    return AIMessageCreate(role=role, content=f"{role} {sequence}", sequence=sequence)
+
+
+def test_turn_commits_once():
+    """Conversation, messages and status change are written in one commit"""
+    db = FakeSession()
+    uow = ConversationUnitOfWork.start(db, _conversation_data())
+
+    async def run():
+        uow.add_message(_message("user", 1))
+        uow.add_message(_message("assistant", 2))
+        uow.update(AIConversationUpdate(status="completed", result={"score": 0.8}))
+        assert db.commits == 0
+        return await uow.commit()
+
+    conversation = asyncio.run(run())
+    assert db.commits == 1
+    staged = db.committed[0]
+    assert staged[0] is conversation
+    assert [m.sequence for m in staged[1:]] == [1, 2]
+    assert all(m.conversation_id == conversation.id for m in staged[1:])
+    assert conversation.status == "completed" and conversation.completed_at is not None
+
+
+def test_next_turn_does_not_re_add_conversation():
+    """After the first commit only new messages are staged"""
+    db = FakeSession()
+    uow = ConversationUnitOfWork.start(db, _conversation_data())
+
+    async def run():
+        uow.add_message(_message("user", 1))
+        await uow.commit()
+        uow.add_message(_message("user", 2))
+        await uow.commit()
+
+    asyncio.run(run())
+    assert db.commits == 2
+    assert [m.sequence for m in db.committed[1]] == [2]
+
+
+def test_fail_on_started_conversation():
+    """fail() drops staged messages and persists the new conversation as failed"""
+    db = FakeSession()
+    uow = ConversationUnitOfWork.start(db, _conversation_data())
+
+    async def run():
+        uow.add_message(_message("user", 1))
+        return await uow.fail()
+
+    conversation = asyncio.run(run())
+    assert db.rollbacks == 1
+    assert db.commits == 1
+    assert db.committed[0] == [conversation]
+    assert conversation.status == "failed"
+
+
+def test_fail_on_resumed_conversation():
+    """fail() on a persisted conversation writes only the status change"""
+    db = FakeSession()
+    existing = AIConversation(id=uuid4(), status="active")
+    uow = ConversationUnitOfWork.resume(db, existing)
+
+    async def run():
+        uow.add_message(_message("user", 3))
+        uow.add_message(_message("assistant", 4))
+        return await uow.fail()
+
+    conversation = asyncio.run(run())
+    assert conversation is existing
+    assert db.rollbacks == 1
+    assert db.commits == 1
+    assert db.committed[0] == []
+    assert existing.status == "failed"
@@ -156,6 +156,86 @@ async def main():
         assert response.status_code == 400
         print(f"✓ Correctly rejected invalid reply_to_id\n")
 
+        # Step 13: Mark task comments as read
+        print("13. Marking task comments as read...")
+        response = await client.post(
+            f"{BASE_URL}/comments/tasks/{task_id}/mark-read", headers=headers
+        )
+        assert response.status_code == 200
+        print(f"✓ Marked {response.json()['marked_count']} comment(s) as read\n")
+
+        # Step 14: Batch unread counts
+        print("14. Getting unread counts for several tasks...")
+        missing_id = "00000000-0000-0000-0000-000000000000"
+        response = await client.post(
+            f"{BASE_URL}/comments/tasks/unread-counts",
+            json={"task_ids": [task_id, missing_id]},
+            headers=headers,
+        )
+        assert response.status_code == 200, f"Batch counts failed: {response.text}"
+        counts = {c["task_id"]: c for c in response.json()}
+        assert counts[task_id]["total"] > 0
+        assert counts[task_id]["unread"] == 0
+        assert counts[missing_id]["total"] == 0
+        print(f"✓ Counts: {counts[task_id]}\n")
+
+        # Step 15: Thread page with reactions and reply counts
+        print("15. Getting comment thread with reactions...")
+        response = await client.post(
+            f"{BASE_URL}/comments/{comment1_id}/reactions", json={"emoji": "👍"}, headers=headers
+        )
+        assert response.status_code == 201
+        response = await client.get(f"{BASE_URL}/comments/tasks/{task_id}/thread", headers=headers)
+        assert response.status_code == 200, f"Thread failed: {response.text}"
+        thread = {c["id"]: c for c in response.json()["items"]}
+        first = thread[comment1_id]
+        assert first["reactions"][0]["emoji"] == "👍"
+        assert first["reactions"][0]["has_current_user"] is True
+        print(f"✓ {len(thread)} comment(s); first has {first['reply_count']} reply(ies), "
+              f"{len(first['reactions'])} reaction(s)\n")
+
+        # Step 16: Cursor pagination, newest first then scroll back
+        print("16. Paging comments with cursors...")
+        for i in range(3):
+            response = await client.post(
+                f"{BASE_URL}/comments/",
+                json={"task_id": task_id, "content": f"Paged comment {i}"},
+                headers=headers,
+            )
+            assert response.status_code == 201
+        response = await client.get(
+            f"{BASE_URL}/comments/tasks/{task_id}/comments/page?limit=2", headers=headers
+        )
+        assert response.status_code == 200, f"Page failed: {response.text}"
+        newest = response.json()
+        assert [c["content"] for c in newest["items"]] == ["Paged comment 1", "Paged comment 2"]
+        assert newest["has_older"] and not newest["has_newer"]
+
+        response = await client.get(
+            f"{BASE_URL}/comments/tasks/{task_id}/comments/page",
+            params={"limit": 2, "before": newest["older_cursor"]},
+            headers=headers,
+        )
+        older = response.json()
+        assert older["items"][-1]["content"] == "Paged comment 0"
+        assert older["has_newer"]
+
+        response = await client.get(
+            f"{BASE_URL}/comments/tasks/{task_id}/comments/page",
+            params={"after": older["newer_cursor"]},
+            headers=headers,
+        )
+        assert [c["content"] for c in response.json()["items"]] == [
+            "Paged comment 1",
+            "Paged comment 2",
+        ]
+
+        response = await client.get(
+            f"{BASE_URL}/comments/tasks/{task_id}/comments/page?before=garbage", headers=headers
+        )
+        assert response.status_code == 400
+        print(f"✓ Scrolled back {len(older['items'])} comment(s) and forward again\n")
+
         print("=== All Tests Passed! ===")
 
 
@@ -0,0 +1,259 @@
+"""
+Test Gantt API endpoints
+"""
+
+import asyncio
+from uuid import uuid4
+
+import httpx
+
+# Test configuration
+BASE_URL = "http://localhost:8000/api/v1"
+ADMIN_EMAIL = "admin@smarttask360.com"
+ADMIN_PASSWORD = "Admin123!"
+
+
+async def main():
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        print("=== Testing Gantt API ===\n")
+
+        # Step 1: Login as admin
+        print("1. Login as admin...")
+        response = await client.post(
+            f"{BASE_URL}/auth/login",
+            json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+        )
+        assert response.status_code == 200
+        access_token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {access_token}"}
+        print("✓ Logged in\n")
+
+        # Step 2: Create a project with three tasks
+        print("2. Creating project and tasks...")
+        response = await client.post(
+            f"{BASE_URL}/projects",
+            json={"name": f"Gantt {uuid4().hex[:8]}", "code": f"GNT{uuid4().hex[:5].upper()}"},
+            headers=headers,
+        )
+        assert response.status_code == 201
+        project_id = response.json()["id"]
+
+        task_ids = {}
+        for title in ("A", "B", "C"):
+            response = await client.post(
+                f"{BASE_URL}/tasks/",
+                json={
+                    "title": f"Task {title}",
+                    "project_id": project_id,
+                    "planned_start_date": "2026-11-02T09:00:00",
+                    "planned_end_date": "2026-11-06T18:00:00",
+                },
+                headers=headers,
+            )
+            assert response.status_code == 201
+            task_ids[title] = response.json()["id"]
+        a, b, c = task_ids["A"], task_ids["B"], task_ids["C"]
+        print(f"✓ Created project with {len(task_ids)} tasks\n")
+
+        # Step 3: Bulk dependencies - in-batch cycle and duplicate are rejected
+        print("3. Bulk dependencies with an in-batch cycle and duplicate...")
+        response = await client.post(
+            f"{BASE_URL}/gantt/dependencies/bulk",
+            json={
+                "dependencies": [
+                    {"predecessor_id": a, "successor_id": b},
+                    {"predecessor_id": b, "successor_id": c},
+                    {"predecessor_id": c, "successor_id": a},  # closes A -> B -> C -> A
+                    {"predecessor_id": a, "successor_id": b},  # repeats the first item
+                ]
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200
+        created = response.json()
+        assert [(d["predecessor_id"], d["successor_id"]) for d in created] == [(a, b), (b, c)]
+        assert all(d["id"] and d["created_at"] for d in created)
+        print(f"✓ Created {len(created)} dependencies, cycle and duplicate skipped\n")
+
+        # Step 4: Resubmitting existing dependencies fails the whole batch
+        print("4. Bulk dependencies that all exist already...")
+        response = await client.post(
+            f"{BASE_URL}/gantt/dependencies/bulk",
+            json={
+                "dependencies": [
+                    {"predecessor_id": a, "successor_id": b},
+                    {"predecessor_id": c, "successor_id": a},
+                ]
+            },
+            headers=headers,
+        )
+        assert response.status_code == 400
+        errors = response.json()["detail"]["errors"]
+        assert "already exists" in errors[0]
+        assert "circular reference" in errors[1]
+        print(f"✓ Rejected: {len(errors)} error(s)\n")
+
+        # Step 5: Add a hierarchy reaching into December and a January task
+        print("5. Creating a three-level hierarchy and a later task...")
+
+        async def create_task(title, **fields):
+            response = await client.post(
+                f"{BASE_URL}/tasks/",
+                json={"title": title, "project_id": project_id, **fields},
+                headers=headers,
+            )
+            assert response.status_code == 201
+            return response.json()["id"]
+
+        parent = await create_task(
+            "Parent",
+            planned_start_date="2026-11-09T09:00:00",
+            planned_end_date="2026-11-13T18:00:00",
+        )
+        child = await create_task(
+            "Child",
+            parent_id=parent,
+            planned_start_date="2026-12-01T09:00:00",
+            planned_end_date="2026-12-04T18:00:00",
+        )
+        # No end date: the end comes from estimated hours (40h = 5 days)
+        await create_task(
+            "Grandchild",
+            parent_id=child,
+            planned_start_date="2026-12-10T09:00:00",
+            estimated_hours=40,
+        )
+        await create_task(
+            "Later",
+            planned_start_date="2027-01-11T09:00:00",
+            planned_end_date="2027-01-15T18:00:00",
+        )
+        print("✓ Created 4 tasks\n")
+
+        # Step 6: A date window clips tasks outside it
+        print("6. Gantt data for November only...")
+        response = await client.get(
+            f"{BASE_URL}/gantt/projects/{project_id}",
+            params={"start": "2026-11-01T00:00:00", "end": "2026-11-30T23:59:59"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        gantt = response.json()
+        titles = {t["title"] for t in gantt["tasks"]}
+        assert titles == {"Task A", "Task B", "Task C", "Parent"}
+        print(f"✓ Window returned {sorted(titles)}\n")
+
+        # Step 7: Depth 0 collapses the subtree; its dates widen the summary range
+        print("7. Gantt data expanded to depth 0...")
+        response = await client.get(
+            f"{BASE_URL}/gantt/projects/{project_id}",
+            params={"depth": 0},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        gantt = response.json()
+        rows = {t["title"]: t for t in gantt["tasks"]}
+        assert set(rows) == {"Task A", "Task B", "Task C", "Parent", "Later"}
+        summary = rows["Parent"]
+        assert summary["is_collapsed"] and summary["collapsed_count"] == 2
+        assert summary["summary_start_date"].startswith("2026-12-01")
+        assert summary["summary_end_date"].startswith("2026-12-15")
+        assert not rows["Task A"]["is_collapsed"]
+        assert gantt["min_date"].startswith("2026-11-02")
+        assert gantt["max_date"].startswith("2027-01-15")
+        print(
+            f"✓ Parent rolls up {summary['collapsed_count']} tasks "
+            f"({summary['summary_start_date']} - {summary['summary_end_date']})\n"
+        )
+
+        # Step 8: The collapsed subtree keeps its ancestor inside a later window
+        print("8. Gantt data at depth 0 for December...")
+        response = await client.get(
+            f"{BASE_URL}/gantt/projects/{project_id}",
+            params={"start": "2026-12-08T00:00:00", "end": "2026-12-31T23:59:59", "depth": 0},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        gantt = response.json()
+        assert [t["title"] for t in gantt["tasks"]] == ["Parent"]
+        assert gantt["tasks"][0]["collapsed_count"] == 2
+        assert gantt["max_date"].startswith("2026-12-15")
+        print("✓ Only the collapsed Parent overlaps December\n")
+
+        # Step 9: Baseline the whole project in one request
+        print("9. Creating project baseline 'Plan v1'...")
+        response = await client.post(
+            f"{BASE_URL}/gantt/projects/{project_id}/baselines",
+            json={"baseline_name": "Plan v1"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        baselines = response.json()
+        assert len(baselines) == 7
+        assert {b["baseline_number"] for b in baselines} == {1}
+        assert all(b["baseline_name"] == "Plan v1" for b in baselines)
+        print(f"✓ Baselined {len(baselines)} tasks\n")
+
+        # Step 10: Numbering continues per task across single and project baselines
+        print("10. Baselining Task A alone, then the project again...")
+        response = await client.post(
+            f"{BASE_URL}/gantt/baselines", json={"task_id": a}, headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["baseline_number"] == 2
+
+        response = await client.post(
+            f"{BASE_URL}/gantt/projects/{project_id}/baselines",
+            json={"baseline_name": "Plan v2"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        numbers = {b["task_id"]: b["baseline_number"] for b in response.json()}
+        assert numbers[a] == 3
+        assert {n for task_id, n in numbers.items() if task_id != a} == {2}
+        print("✓ Task A is at baseline 3, other tasks at 2\n")
+
+        # Step 11: Variance against each task's latest baseline
+        print("11. Slipping Task A by two days and checking variance...")
+        response = await client.patch(
+            f"{BASE_URL}/gantt/tasks/{a}/dates",
+            json={"planned_end_date": "2026-11-08T18:00:00"},
+            headers=headers,
+        )
+        assert response.status_code == 200
+
+        response = await client.get(
+            f"{BASE_URL}/gantt/projects/{project_id}/variance", headers=headers
+        )
+        assert response.status_code == 200
+        variance = response.json()
+        rows = {t["task_id"]: t for t in variance["tasks"]}
+        assert len(rows) == 7
+        assert rows[a]["baseline_number"] == 3
+        assert float(rows[a]["end_variance_days"]) == 2.0
+        assert all(rows[t]["baseline_number"] == 2 for t in rows if t != a)
+        assert all(float(rows[t]["end_variance_days"] or 0) == 0 for t in rows if t != a)
+        assert variance["slipped_count"] == 1
+        assert variance["max_end_variance_days"] == 2.0
+        print(f"✓ {variance['slipped_count']} task slipped by {variance['max_end_variance_days']} days\n")
+
+        # Step 12: Variance against a specific baseline number
+        print("12. Variance against baseline 1...")
+        response = await client.get(
+            f"{BASE_URL}/gantt/projects/{project_id}/variance",
+            params={"baseline_number": 1},
+            headers=headers,
+        )
+        assert response.status_code == 200
+        variance = response.json()
+        assert variance["baseline_number"] == 1
+        assert {t["baseline_number"] for t in variance["tasks"]} == {1}
+        assert len(variance["tasks"]) == 7
+        assert variance["slipped_count"] == 1
+        print("✓ Every task compared with its first baseline\n")
+
+        print("=== All Tests Passed! ===")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
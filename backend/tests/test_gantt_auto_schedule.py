@@ -0,0 +1,89 @@
+"""
+Test dependency propagation and resource leveling (no DB)
+"""
+
+import numpy as np
+
+from app.modules.gantt.auto_schedule import (
+    MINUTES_PER_DAY,
+    REASON_DEPENDENCY,
+    REASON_NONE,
+    REASON_RESOURCE,
+    auto_schedule,
+)
+from app.modules.gantt.scheduling import DependencyGraph
+
+# Monday 2026-03-02 09:00 in minutes since the epoch
+MONDAY = int(np.datetime64("2026-03-02T09:00", "m").astype(np.int64))
+
+
+def days(*values: int) -> np.ndarray:
+    return MONDAY + np.array(values, dtype=np.int64) * MINUTES_PER_DAY
+
+
+def test_slip_is_propagated_downstream():
+    """A late predecessor pushes its FS chain; a fixed task stays put"""
+    # 0 -FS-> 1 -FS-> 2, and 0 -FS-> 3 (fixed)
+    graph = DependencyGraph.from_edges(
+        4, [(0, 1, "FS", 0), (1, 2, "FS", 1), (0, 3, "FS", 0)]
+    )
+    starts, ends = days(0, 1, 3, 1), days(3, 2, 4, 2)
+    fixed = np.array([False, False, False, True])
+
+    new_starts, new_ends, reasons = auto_schedule(starts, ends, graph, fixed)
+
+    assert list((new_starts - starts) // MINUTES_PER_DAY) == [0, 2, 2, 0]
+    assert (new_ends - new_starts == ends - starts).all()
+    assert list(reasons) == [REASON_NONE, REASON_DEPENDENCY, REASON_DEPENDENCY, REASON_NONE]
+
+
+def test_leveling_delays_lower_priority_task():
+    """Two full-time weeks for one user: the higher priority keeps its slot"""
+    graph = DependencyGraph.from_edges(2, [])
+    starts, ends = days(0, 0), days(4, 4)
+
+    new_starts, _, reasons = auto_schedule(
+        starts,
+        ends,
+        graph,
+        np.zeros(2, dtype=bool),
+        level=True,
+        users=np.array([0, 0]),
+        hours=np.array([40.0, 40.0]),
+        priorities=np.array([1, 2]),
+    )
+
+    # Moved to the next Monday, not onto the weekend
+    assert list((new_starts - starts) // MINUTES_PER_DAY) == [7, 0]
+    assert list(reasons) == [REASON_RESOURCE, REASON_NONE]
+
+
+def test_leveling_respects_dependencies_and_capacity():
+    """Random project: no dependency is violated and nobody is overbooked"""
+    rng = np.random.default_rng(3)
+    n = 300
+    pairs = {(int(min(a, b)), int(max(a, b))) for a, b in rng.integers(0, n, (500, 2)) if a != b}
+    edges = [(a, b, "FS", int(rng.integers(0, 2))) for a, b in pairs]
+    graph = DependencyGraph.from_edges(n, edges)
+    starts = days(*rng.integers(0, 60, n))
+    ends = starts + rng.integers(0, 6, n) * MINUTES_PER_DAY
+    users = rng.integers(0, 10, n)
+    hours = rng.integers(1, 8, n).astype(float)
+
+    new_starts, new_ends, _ = auto_schedule(
+        starts, ends, graph, np.zeros(n, dtype=bool),
+        level=True, users=users, hours=hours, priorities=rng.integers(0, 4, n),
+    )
+
+    assert (new_starts >= starts).all()
+    for a, b, _, lag in edges:
+        assert new_starts[b] >= new_ends[a] + lag * MINUTES_PER_DAY
+
+    # Rebuild per-user daily load from the result
+    first_day = int(new_starts.min() // MINUTES_PER_DAY)
+    load = np.zeros((10, int(new_ends.max() // MINUTES_PER_DAY) - first_day + 1))
+    for i in range(n):
+        span = np.arange(new_starts[i] // MINUTES_PER_DAY, new_ends[i] // MINUTES_PER_DAY + 1)
+        workday = np.is_busday(span.astype("datetime64[D]"))
+        load[users[i], span[workday] - first_day] += hours[i] / max(1, workday.sum())
+    assert load.max() <= 8.0 + 1e-6
@@ -0,0 +1,124 @@
+"""
+Test the CPM scheduling engine and cached project schedules (no DB)
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+
+from app.modules.gantt import scheduling
+from app.modules.gantt.schedule_cache import ProjectSchedule, ProjectScheduleCache
+from app.modules.gantt.scheduling import DependencyGraph, compute_schedule
+
+
+def test_critical_path_with_dependency_types():
+    """ES/EF/LS/LF and float for a small mixed-type network"""
+    # 0 -FS-> 1 -FS-> 3
+    # 0 -SS+1-> 2 -FF-> 3
+    graph = DependencyGraph.from_edges(
+        4,
+        [(0, 1, "FS", 0), (1, 3, "FS", 0), (0, 2, "SS", 1), (2, 3, "FF", 0)],
+    )
+    schedule = compute_schedule(np.array([2, 3, 2, 1]), graph)
+
+    assert schedule.project_duration == 6
+    assert list(schedule.es) == [0, 2, 1, 5]
+    assert list(schedule.ef) == [2, 5, 3, 6]
+    assert list(schedule.lf) == [2, 5, 6, 6]
+    assert list(schedule.total_float) == [0, 0, 3, 0]
+    assert list(schedule.critical_path()) == [0, 1, 3]
+
+
+def test_cycle_is_left_unscheduled():
+    """Tasks on a cycle are excluded instead of looping forever"""
+    graph = DependencyGraph.from_edges(
+        4, [(0, 1, "FS", 0), (1, 2, "FS", 0), (2, 1, "FS", 0), (0, 3, "FS", 0)]
+    )
+    schedule = compute_schedule(np.ones(4, dtype=np.int64), graph)
+
+    assert list(schedule.scheduled) == [True, False, False, True]
+    assert list(schedule.critical_path()) == [0, 3]
+
+
+def test_long_chain_does_not_recurse():
+    """A chain far deeper than the recursion limit is scheduled"""
+    n = 5000
+    graph = DependencyGraph.from_edges(n, [(i, i + 1, "FS", 1) for i in range(n - 1)])
+    schedule = compute_schedule(np.ones(n, dtype=np.int64), graph)
+
+    assert schedule.project_duration == n + (n - 1)
+    assert schedule.critical.all()
+
+
+def test_scalar_and_vectorized_levels_agree(monkeypatch):
+    """Narrow levels (scalar loops) give the same schedule as the NumPy path"""
+    rng = np.random.default_rng(3)
+    n = 300
+    pairs = {(int(min(a, b)), int(max(a, b))) for a, b in rng.integers(0, n, (900, 2)) if a != b}
+    types = ["FS", "SS", "FF", "SF"]
+    edges = [(a, b, types[int(rng.integers(0, 4))], int(rng.integers(-2, 3))) for a, b in pairs]
+    edges += [(n - 2, n - 1, "FS", 0), (n - 1, n - 2, "FS", 0)]  # cycle
+    graph = DependencyGraph.from_edges(n, edges)
+    durations = rng.integers(0, 6, n)
+
+    results = []
+    for narrow in (0, n + 1):
+        monkeypatch.setattr(scheduling, "NARROW_LEVEL", narrow)
+        results.append(compute_schedule(durations, graph))
+
+    vectorized, scalar = results
+    for field in ("es", "ef", "ls", "lf", "scheduled", "order"):
+        assert (getattr(scalar, field) == getattr(vectorized, field)).all(), field
+
+
+def test_incremental_updates_match_full_recompute():
+    """Duration and dependency edits give the same result as a rebuild"""
+    rng = np.random.default_rng(7)
+    n = 200
+    ids = [uuid4() for _ in range(n)]
+    durations = [int(x) for x in rng.integers(0, 6, n)]
+    pairs = {(int(min(a, b)), int(max(a, b))) for a, b in rng.integers(0, n, (600, 2)) if a != b}
+    edges = [(a, b, int(rng.integers(0, 4)), int(rng.integers(-2, 3))) for a, b in pairs]
+    schedule = ProjectSchedule(ids, durations, edges)
+
+    for v in rng.integers(0, n, 20):
+        durations[v] = int(rng.integers(0, 8))
+        schedule.set_duration(ids[v], durations[v])
+    removed = edges.pop()
+    schedule.remove_dependency(ids[removed[0]], ids[removed[1]])
+    schedule.add_dependency(ids[removed[0]], ids[removed[1]], "SS", 2)
+    edges.append((removed[0], removed[1], 1, 2))
+
+    expected = ProjectSchedule(ids, durations, edges).to_schedule()
+    actual = schedule.to_schedule()
+    for field in ("es", "ef", "ls", "lf"):
+        assert (getattr(actual, field) == getattr(expected, field)).all(), field
+
+
+def test_schedule_cache_task_changes():
+    """Date edits update in place; new or moved tasks invalidate the project"""
+    cache = ProjectScheduleCache()
+    project_id = uuid4()
+    task = SimpleNamespace(
+        id=uuid4(), project_id=project_id, is_deleted=False, is_milestone=False,
+        estimated_hours=16, planned_start_date=None, planned_end_date=None,
+        due_date=None, started_at=None, completed_at=None, created_at=None,
+    )
+    cache.store(project_id, ProjectSchedule.from_tasks([task], []), cache.generation(project_id))
+    schedule = cache.get(project_id)
+    assert schedule.to_schedule().project_duration == 2
+
+    task.estimated_hours = 40
+    cache.task_changed(task)
+    assert cache.get(project_id) is schedule
+    assert schedule.to_schedule().project_duration == 5
+
+    task.project_id = uuid4()
+    cache.task_changed(task)
+    assert cache.get(project_id) is None
+
+    # A build started before the invalidation must not be stored
+    generation = cache.generation(project_id)
+    cache.invalidate(project_id)
+    assert not cache.store(project_id, schedule, generation)
@@ -0,0 +1,60 @@
+"""
+Test the resource workload engine (pure NumPy, no DB)
+"""
+
+from datetime import date
+
+import numpy as np
+
+from app.modules.gantt.workload import compute_workload
+
+
+def _workload(tasks, start=date(2026, 3, 2), end=date(2026, 3, 15)):
+    """tasks: [(user index, first day, last day, hours)]"""
+    return compute_workload(
+        ["alice", "bob"],
+        np.array([t[0] for t in tasks], dtype=np.int64),
+        np.array([t[1] for t in tasks], dtype="datetime64[D]"),
+        np.array([t[2] for t in tasks], dtype="datetime64[D]"),
+        np.array([t[3] for t in tasks], dtype=np.float64),
+        start,
+        end,
+    )
+
+
+def test_hours_spread_over_working_days():
+    """Mon 2 Mar - Sun 8 Mar: 40h over 5 working days, none on the weekend"""
+    workload = _workload([(0, date(2026, 3, 2), date(2026, 3, 8), 40)])
+
+    assert list(workload.allocated[0, :7]) == [8, 8, 8, 8, 8, 0, 0]
+    assert workload.allocated[1].sum() == 0
+    assert workload.capacity[0, 5] == 0, "No capacity on Saturday"
+    assert workload.overallocated.sum() == 0
+
+
+def test_overallocation_and_weekly_rollup():
+    """Overlapping tasks exceed capacity; weeks sum days"""
+    workload = _workload([
+        (1, date(2026, 3, 2), date(2026, 3, 6), 40),
+        (1, date(2026, 3, 4), date(2026, 3, 5), 8),
+    ])
+
+    assert list(workload.allocated[1, :5]) == [8, 8, 12, 12, 8]
+    assert workload.overallocated[1].sum() == 8
+    assert workload.utilization[1, 2] == 1.5
+
+    weekly = workload.by_week()
+    assert weekly.periods == [date(2026, 3, 2), date(2026, 3, 9)]
+    assert list(weekly.allocated[1]) == [48, 0]
+    assert list(weekly.capacity[1]) == [40, 40]
+
+
+def test_task_clipped_to_horizon():
+    """Only the part of a task inside the horizon is counted"""
+    workload = _workload(
+        [(0, date(2026, 2, 23), date(2026, 3, 6), 80)],
+        start=date(2026, 3, 2),
+        end=date(2026, 3, 8),
+    )
+
+    assert workload.allocated[0].sum() == 40
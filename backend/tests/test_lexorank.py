@@ -0,0 +1,73 @@
+"""
+Test fractional rank keys used for kanban and board card order (no DB)
+"""
+
+import random
+
+import pytest
+
+from app.core.lexorank import rank_after, rank_between, ranks_between, rerank, spread_ranks
+
+
+def test_rank_between_orders_as_strings():
+    """New ranks sort strictly between their neighbours and never end in "0" """
+    assert rank_between(None, None) == "i"
+    for before, after in [(None, "1"), ("i", "j"), ("a", "a1"), ("zz", None), ("0i", "0i01")]:
+        rank = rank_between(before, after)
+        assert (before or "") < rank
+        assert after is None or rank < after
+        assert not rank.endswith("0")
+
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+
+
+def test_repeated_inserts_grow_slowly():
+    """Inserting at the same spot grows keys logarithmically"""
+    before, after = "i", "j"
+    for _ in range(50):
+        after = rank_between(before, after)
+    assert len(after) <= 12
+
+    ranks = spread_ranks(1000)
+    assert ranks == sorted(ranks)
+    assert max(len(rank) for rank in ranks) == 2
+    assert ranks_between("a", "b", 3) == sorted(ranks_between("a", "b", 3))
+
+
+def test_appends_keep_short_keys():
+    """Appending to a column orders cards by insertion with constant-length keys"""
+    assert rank_after(None) == "i"
+    ranks = [rank_after(None)]
+    for _ in range(500):
+        ranks.append(rank_after(ranks[-1]))
+    assert ranks == sorted(ranks)
+    assert len(set(ranks)) == len(ranks)
+    assert max(len(rank) for rank in ranks) == 2
+    assert not any(rank.endswith("0") for rank in ranks)
+
+    # The end of the key space falls back to a longer key
+    assert rank_after("zz") > "zz"
+    assert spread_ranks(3)[-1] < rank_after(spread_ranks(3)[-1])
+
+
+def test_single_move_changes_one_rank():
+    """Dragging one card re-ranks only that card"""
+    ranks = spread_ranks(10)
+    order = ranks[:2] + [ranks[7]] + ranks[2:7] + ranks[8:]
+
+    changes = rerank(order)
+
+    assert list(changes) == [2]
+    assert ranks[1] < changes[2] < ranks[2]
+
+
+def test_rerank_handles_ties_and_unranked():
+    """Any input order, including duplicates and gaps, becomes strictly increasing"""
+    rng = random.Random(5)
+    pool = [None, "i", "i8", "z", "zz1"] + spread_ranks(5)
+    for _ in range(500):
+        current = [rng.choice(pool) for _ in range(rng.randint(0, 15))]
+        changes = rerank(current)
+        result = [changes.get(i, rank) for i, rank in enumerate(current)]
+        assert all(a < b for a, b in zip(result, result[1:]))
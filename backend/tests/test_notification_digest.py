@@ -0,0 +1,129 @@
+"""
+Test email digests: scheduling and quiet hours, rendering, and a full run
+against an in-memory transport (no DB: recipient and notification loading
+is replaced with fixed data)
+"""
+
+import asyncio
+from datetime import datetime, time, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.modules.notifications.digest import (
+    DigestRecipient,
+    NotificationDigest,
+    in_quiet_hours,
+    is_due,
+    render_digest,
+)
+from app.modules.notifications.mailer import MemoryTransport
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+def _item(title="Задача назначена", content="Вам назначена задача", group_count=1):
+    return SimpleNamespace(
+        title=title,
+        content=content,
+        entity_type="task",
+        entity_id=uuid4(),
+        group_count=group_count,
+    )
+
+
+def _recipient(email, digest="daily", **fields):
+    return DigestRecipient(user_id=uuid4(), email=email, name=email.split("@")[0], digest=digest, **fields)
+
+
+def test_is_due_by_period():
+    """A digest is due once its period has elapsed; first digests are always due"""
+    assert is_due("daily", None, NOW)
+    assert is_due("daily", NOW - timedelta(days=1), NOW)
+    assert not is_due("daily", NOW - timedelta(hours=23), NOW)
+    assert is_due("hourly", NOW - timedelta(hours=1), NOW)
+    assert not is_due("weekly", NOW - timedelta(days=6), NOW)
+    assert is_due("instant", NOW, NOW)
+    assert not is_due("disabled", None, NOW)
+
+
+def test_quiet_hours_wrap_midnight():
+    """Overnight windows cover both sides of midnight; the end is exclusive"""
+    start, end = time(22, 0), time(8, 0)
+    assert in_quiet_hours(start, end, time(23, 30))
+    assert in_quiet_hours(start, end, time(3, 0))
+    assert not in_quiet_hours(start, end, time(8, 0))
+    assert not in_quiet_hours(start, end, time(12, 0))
+    assert in_quiet_hours(time(13, 0), time(14, 0), time(13, 15))
+    assert not in_quiet_hours(None, end, time(3, 0))
+
+
+def test_render_digest_escapes_html_and_counts_overflow():
+    """HTML part is escaped, grouped items show their count, overflow is summarized"""
+    recipient = _recipient(
+        "anna@example.com",
+        items=[_item(title="<script>x</script>", group_count=3)],
+        total=5,
+    )
+    message = render_digest(recipient)
+
+    assert message["To"] == "anna <anna@example.com>"
+    assert "5" in message["Subject"]
+    text = message.get_body(("plain",)).get_content()
+    body = message.get_body(("html",)).get_content()
+    assert "(×3)" in text and "и ещё 4" in text
+    assert "<script>" not in body and "&lt;script&gt;" in body
+    assert f"/tasks/{recipient.items[0].entity_id}" in body
+
+
+class FakeDigest(NotificationDigest):
+    """Digest run over fixed recipients, recording watermark updates"""
+
+    def __init__(self, recipients, pending, **kwargs):
+        super().__init__(db=None, **kwargs)
+        self.recipients = recipients
+        self.pending = pending
+        self.marked = []
+
+    async def _load_recipients(self, after_id):
+        ids = [r.user_id for r in self.recipients]
+        start = ids.index(after_id) + 1 if after_id else 0
+        return self.recipients[start : start + self.user_batch]
+
+    async def _load_pending(self, recipients, now):
+        for recipient in recipients:
+            recipient.items = self.pending.get(recipient.email, [])
+            recipient.total = len(recipient.items)
+        return recipients
+
+    async def _record_delivered(self, sent_at):
+        delivered, self._delivered = self._delivered, []
+        self.marked.extend(delivered)
+
+
+def test_run_sends_due_digests_and_marks_delivered():
+    """Only due, awake users with pending items get mail; failures are not marked"""
+    ok = _recipient("ok@example.com")
+    bounced = _recipient("bounced@example.com")
+    sleeping = _recipient("sleeping@example.com", quiet_hours_start=time(11), quiet_hours_end=time(13))
+    recent = _recipient("recent@example.com", last_sent_at=NOW - timedelta(hours=2))
+    empty = _recipient("empty@example.com")
+    many = [_recipient(f"user{i}@example.com", digest="hourly") for i in range(7)]
+    recipients = [ok, bounced, sleeping, recent, empty, *many]
+
+    pending = {r.email: [_item()] for r in recipients if r is not empty}
+    transport = MemoryTransport(fail_for={"bounced@example.com"})
+    digest = FakeDigest(
+        recipients, pending, transport=transport, user_batch=4, send_batch=3, send_workers=2
+    )
+    result = asyncio.run(digest.run(now=NOW))
+
+    assert result.recipients == len(recipients)
+    assert result.due == len(recipients) - 1
+    assert result.quiet == 1
+    assert result.sent == 1 + len(many)
+    assert result.failed == 1
+    assert sorted(digest.marked) == sorted([ok.user_id, *(r.user_id for r in many)])
+    assert {m["To"].addresses[0].addr_spec for m in transport.sent} == {
+        r.email for r in [ok, *many]
+    }
+    assert transport.batches >= 3
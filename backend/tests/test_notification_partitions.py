@@ -0,0 +1,167 @@
+"""
+Test monthly notification partitions: naming, retention arithmetic and feed
+query bounds (no DB), and partition pruning of the feed query (live DB, run as
+a script)
+"""
+
+import asyncio
+import operator
+from datetime import date, datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.modules.notifications.partitions import (
+    add_months,
+    ensure_partitions,
+    partition_month,
+    partition_name,
+    retention_floor,
+)
+from app.modules.notifications.service import NotificationService
+
+
+class FakeSession:
+    """Lists the given partitions, reports default-partition strays, records SQL"""
+
+    def __init__(self, partitions, strays):
+        self.partitions = partitions
+        self.strays = strays
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        sql = " ".join(str(stmt).split())
+        self.statements.append(sql)
+        if "pg_inherits" in sql:
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.partitions))
+        if sql.startswith("SELECT EXISTS"):
+            return SimpleNamespace(scalar=lambda: params["start"].date() in self.strays)
+        return None
+
+    async def commit(self):
+        pass
+
+
+def test_month_arithmetic_crosses_years():
+    """add_months moves across year boundaries in both directions"""
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert add_months(date(2026, 3, 1), -15) == date(2024, 12, 1)
+
+
+def test_partition_names_round_trip():
+    """Partition names encode their month; other tables are ignored"""
+    assert partition_name(date(2026, 2, 1)) == "notifications_2026_02"
+    assert partition_month("notifications_2026_02") == date(2026, 2, 1)
+    assert partition_month("notifications_default") is None
+    assert partition_month("notification_settings") is None
+
+
+def test_retention_floor_is_month_aligned():
+    """The floor is the first day of the oldest retained month"""
+    floor = retention_floor(date(2026, 10, 19))
+    assert floor == datetime.combine(
+        add_months(date(2026, 10, 1), -settings.NOTIFICATION_RETENTION_MONTHS),
+        datetime.min.time(),
+    )
+    assert floor.day == 1
+
+
+def test_ensure_partitions_moves_default_strays():
+    """A month with rows in the default partition is created around a detached default"""
+    db = FakeSession(
+        ["notifications_2026_10", "notifications_default"], strays={date(2026, 11, 1)}
+    )
+    created = asyncio.run(ensure_partitions(db, date(2026, 10, 19)))
+
+    assert created[:2] == ["notifications_2026_11", "notifications_2026_12"]
+    ddl = [sql for sql in db.statements if not sql.startswith("SELECT")]
+    november = ddl[:4]
+    assert november[0] == "ALTER TABLE notifications DETACH PARTITION notifications_default"
+    assert november[1].startswith("CREATE TABLE notifications_2026_11 PARTITION OF")
+    assert november[2].startswith("WITH moved AS (DELETE FROM notifications_default")
+    assert november[3] == "ALTER TABLE notifications ATTACH PARTITION notifications_default DEFAULT"
+    # No strays in December: plain CREATE
+    assert ddl[4].startswith("CREATE TABLE notifications_2026_12 PARTITION OF")
+
+
+def _created_at_bounds(stmt):
+    """(operator, value) of every created_at comparison in a query's WHERE clause"""
+    return {
+        (node.operator, node.right.value)
+        for node in visitors.iterate(stmt.whereclause)
+        if isinstance(node, BinaryExpression)
+        and getattr(node.left, "key", None) == "created_at"
+        and isinstance(node.right, BindParameter)
+    }
+
+
+def test_feed_cursor_bounds_created_at():
+    """A cursor adds a plain created_at upper bound (prunable) besides the floor"""
+    cursor_at = datetime(2026, 9, 14, 8, 30)
+    query = NotificationService(None).feed_query(
+        uuid4(), before=encode_cursor(cursor_at, uuid4())
+    )
+
+    bounds = _created_at_bounds(query)
+    assert (operator.le, cursor_at) in bounds
+    assert (operator.ge, retention_floor()) in bounds
+    assert _created_at_bounds(NotificationService(None).feed_query(uuid4())) == {
+        (operator.ge, retention_floor())
+    }
+
+    with pytest.raises(ValueError):
+        NotificationService(None).feed_query(uuid4(), before="not-a-cursor")
+
+
+async def _explain_feed(db, before: str | None = None) -> str:
+    conn = await db.connection()
+    query = NotificationService(db).feed_query(uuid4(), before=before)
+    compiled = query.compile(dialect=conn.dialect)
+    result = await conn.exec_driver_sql(
+        f"EXPLAIN {compiled}",
+        tuple(compiled.params[name] for name in compiled.positiontup),
+    )
+    return "\n".join(result.scalars().all())
+
+
+async def check_feed_prunes_partitions():
+    """
+    EXPLAIN the service's feed query: the first page skips expired months,
+    a cursor page only reads the months between the floor and the cursor
+    """
+    from app.core.database import async_session_maker
+    from app.modules.notifications.partitions import list_partitions, month_start
+    from app.modules.views.models import UserView  # noqa: F401 - completes the User mapper
+
+    floor = retention_floor()
+    # Cursor in the middle of last month: this and later months are pruned
+    cursor_month = add_months(month_start(datetime.utcnow().date()), -1)
+    cursor_at = datetime.combine(cursor_month, datetime.min.time()).replace(day=15)
+
+    async with async_session_maker() as db:
+        names = await list_partitions(db)
+        first_page = await _explain_feed(db)
+        cursor_page = await _explain_feed(db, encode_cursor(cursor_at, uuid4()))
+
+    monthly = {name: partition_month(name) for name in names if partition_month(name)}
+    expired = [name for name, month in monthly.items() if add_months(month, 1) <= floor.date()]
+    print(first_page)
+    for name in expired:
+        assert name not in first_page, f"{name} was not pruned"
+    print(f"✅ First page skips {len(expired)} expired partition(s) of {len(names)}\n")
+
+    print(cursor_page)
+    scanned = {name for name in monthly if name in cursor_page}
+    expected = {name for name, month in monthly.items() if floor.date() <= month <= cursor_month}
+    assert scanned == expected, f"scanned {sorted(scanned)}, expected {sorted(expected)}"
+    print(f"✅ Cursor page reads only {sorted(scanned)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(check_feed_prunes_partitions())
@@ -1,10 +1,21 @@
 """
 Test Notifications API endpoints
+
+Fan-out unit tests (fake session, no DB) run under pytest; the API steps
+need a running server and run as a script.
 """
 
 import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+from uuid import UUID, uuid4
 
 import httpx
+from sqlalchemy.sql import Select, visitors
+from sqlalchemy.sql.elements import BindParameter
+
+from app.core.types import NotificationType
+from app.modules.notifications.service import NotificationService
 
 # Test configuration
 BASE_URL = "http://localhost:8000/api/v1"
@@ -12,6 +23,95 @@ ADMIN_EMAIL = "admin@smarttask360.com"
 ADMIN_PASSWORD = "Admin123!"
 
 
+class FakeSession:
+    """Answers the settings query with fixed rows and records every statement"""
+
+    def __init__(self, settings_rows):
+        self.settings_rows = settings_rows
+        self.selects = []
+        self.inserted = []
+        self.commits = 0
+
+    async def execute(self, stmt, params=None):
+        if isinstance(stmt, Select):
+            self.selects.append(stmt)
+            return SimpleNamespace(all=lambda: list(self.settings_rows))
+        return None  # counter upserts
+
+    async def scalars(self, stmt, rows):
+        self.inserted.extend(rows)
+        return SimpleNamespace(all=lambda: [SimpleNamespace(**row) for row in rows])
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _bound(stmt, name):
+    """Value of a named bind parameter (without compiling, so no mapper setup)"""
+    return next(
+        node.value
+        for node in visitors.iterate(stmt)
+        if isinstance(node, BindParameter) and node.key == name
+    )
+
+
+def test_send_bulk_loads_settings_once_and_inserts_once():
+    """One settings query, one INSERT; users without settings get the column default"""
+    disabled, enabled, no_settings = uuid4(), uuid4(), uuid4()
+    db = FakeSession([(disabled, False), (enabled, True)])
+
+    notifications = asyncio.run(
+        NotificationService(db).send_bulk(
+            [disabled, enabled, no_settings, enabled],
+            NotificationType.TASK_COMMENT,
+            "Новый комментарий",
+        )
+    )
+
+    assert len(db.selects) == 1
+    assert _bound(db.selects[0], "b_users") == [disabled, enabled, no_settings]
+    assert [row["user_id"] for row in db.inserted] == [enabled, no_settings]
+    assert [n.user_id for n in notifications] == [enabled, no_settings]
+    assert db.commits == 1
+
+
+def test_notify_task_mentions_skips_author():
+    """The author is never notified about their own mention"""
+    author, mentioned = uuid4(), uuid4()
+    db = FakeSession([])
+
+    asyncio.run(
+        NotificationService(db).notify_task_mentions(
+            mentioned_user_ids=[author, mentioned, mentioned],
+            task_id=uuid4(),
+            task_title="Задача",
+            mentioner_id=author,
+            context="@Автор @Коллега",
+        )
+    )
+
+    assert _bound(db.selects[0], "b_users") == [mentioned]
+    assert [row["user_id"] for row in db.inserted] == [mentioned]
+
+
+def test_send_bulk_skips_queries_when_everyone_is_excluded():
+    db = FakeSession([])
+    author = uuid4()
+
+    result = asyncio.run(
+        NotificationService(db).notify_task_mentions(
+            mentioned_user_ids=[author],
+            task_id=uuid4(),
+            task_title="Задача",
+            mentioner_id=author,
+            context="@Автор",
+        )
+    )
+
+    assert result == []
+    assert db.selects == [] and db.inserted == []
+
+
 async def main():
     async with httpx.AsyncClient(timeout=10.0) as client:
         print("=== Testing Notifications API ===\n")
@@ -213,6 +313,15 @@ async def main():
         print(f"    Total unread: {unread['total']}")
         assert unread["total"] == 0, "Unread count should be 0"
 
+        # Polling with the ETag answers 304 while nothing changed
+        etag = response.headers["ETag"]
+        response = await client.get(
+            f"{BASE_URL}/notifications/unread-count",
+            headers={**headers, "If-None-Match": etag},
+        )
+        assert response.status_code == 304, f"Expected 304, got {response.status_code}"
+        print("    Repeated poll answered 304 Not Modified")
+
         # Step 15: Test delete old notifications
         print("\n15. Testing delete old notifications...")
         response = await client.delete(
@@ -237,8 +346,84 @@ async def main():
         assert response.status_code == 200
         print("    Settings reset")
 
+        # Step 17: Comment notifications with one group_key coalesce
+        if test_user_id:
+            print("\n17. Coalescing comment notifications on one task...")
+            from sqlalchemy import update
+
+            from app.core.config import settings as app_settings
+            from app.core.database import async_session_maker
+            from app.modules.notifications.models import Notification
+
+            async def notify_comment():
+                async with async_session_maker() as db:
+                    notifications = await NotificationService(db).notify_task_comment(
+                        user_ids=[UUID(test_user_id)],
+                        task_id=UUID(task_id),
+                        task_title=task["title"],
+                        comment_preview="Новый комментарий",
+                        commenter_id=UUID(task["creator_id"]),
+                    )
+                    return notifications[0]
+
+            async def comment_notifications():
+                response = await client.get(
+                    f"{BASE_URL}/notifications",
+                    params={"notification_type": "task_comment", "entity_id": task_id},
+                    headers=user2_headers,
+                )
+                assert response.status_code == 200
+                return response.json()
+
+            async def unread_total():
+                response = await client.get(
+                    f"{BASE_URL}/notifications/unread-count", headers=user2_headers
+                )
+                assert response.status_code == 200
+                return response.json()["total"]
+
+            unread_before = await unread_total()
+            first = await notify_comment()
+            second = await notify_comment()
+            assert second.id == first.id
+            rows = await comment_notifications()
+            assert len(rows) == 1 and rows[0]["group_count"] == 2
+            assert await unread_total() == unread_before + 1
+            print("    Second comment folded into the first (group_count=2)")
+
+            # Step 18: A read notification is never coalesced into
+            print("\n18. Commenting after the notification was read...")
+            response = await client.post(
+                f"{BASE_URL}/notifications/mark-read",
+                json={"notification_ids": [str(first.id)]},
+                headers=user2_headers,
+            )
+            assert response.status_code == 200
+            third = await notify_comment()
+            assert third.id != first.id and third.group_count == 1
+            assert len(await comment_notifications()) == 2
+            print("    New notification created")
+
+            # Step 19: Neither is one older than the coalescing window
+            print("\n19. Commenting after the coalescing window...")
+            async with async_session_maker() as db:
+                await db.execute(
+                    update(Notification)
+                    .where(Notification.id == third.id)
+                    .values(
+                        created_at=third.created_at
+                        - timedelta(minutes=app_settings.NOTIFICATION_COALESCE_MINUTES + 1)
+                    )
+                )
+                await db.commit()
+            fourth = await notify_comment()
+            assert fourth.id != third.id and fourth.group_count == 1
+            assert len(await comment_notifications()) == 3
+            assert await unread_total() == unread_before + 2
+            print("    New notification created")
+
         # Cleanup
-        print("\n17. Cleanup: Deleting test task...")
+        print("\n20. Cleanup: Deleting test task...")
         await client.delete(f"{BASE_URL}/tasks/{task_id}", headers=headers)
         print("    Task deleted")
 
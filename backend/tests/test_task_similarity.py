@@ -0,0 +1,123 @@
+"""
+Test task similarity index (MinHash/LSH duplicate detection)
+"""
+
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.modules.tasks import similarity
+from app.modules.tasks.similarity import TaskSimilarityIndex
+
+
+def _build_index():
+    index = TaskSimilarityIndex()
+    ids = {name: uuid4() for name in ("login", "login_dup", "report", "empty")}
+    index.add(
+        ids["login"],
+        "Fix login bug on mobile Safari",
+        "Users cannot log in with Safari on iOS 17 after password reset",
+    )
+    index.add(
+        ids["login_dup"],
+        "Fix login bug on mobile Safari browser",
+        "Users cannot log in with Safari on iOS 17 after the password reset",
+    )
+    index.add(ids["report"], "Prepare quarterly financial report", "Q3 numbers for the board")
+    index.add(ids["empty"], "!", None)
+    return index, ids
+
+
+def test_finds_near_duplicate():
+    """A reworded copy of a task is returned, unrelated tasks are not"""
+    index, ids = _build_index()
+
+    matches = index.query(ids["login"])
+    assert [task_id for task_id, _ in matches] == [ids["login_dup"]]
+    assert matches[0][1] >= 0.5
+
+    assert index.query(ids["report"]) == []
+
+
+def test_texts_without_words_are_not_indexed():
+    """Tasks with no word tokens are skipped instead of matching everything"""
+    index, ids = _build_index()
+    assert ids["empty"] not in index
+    assert index.query(ids["empty"]) == []
+
+
+def test_update_and_remove():
+    """Re-adding replaces the signature; removed tasks disappear from results"""
+    index, ids = _build_index()
+
+    index.add(ids["login_dup"], "Prepare quarterly financial report", "Q3 numbers for the board")
+    assert index.query(ids["login"]) == []
+    assert [task_id for task_id, _ in index.query(ids["report"])] == [ids["login_dup"]]
+
+    index.remove(ids["login_dup"])
+    assert index.query(ids["report"]) == []
+    assert len(index) == 2
+
+
+def test_add_many_matches_add():
+    """Batch indexing produces the same signatures as one-by-one indexing"""
+    items = [
+        (uuid4(), f"Task number {i} about billing", f"Details {i} for invoices and payments")
+        for i in range(50)
+    ]
+    single = TaskSimilarityIndex()
+    batch = TaskSimilarityIndex()
+    for item in items:
+        single.add(*item)
+    batch.add_many(items)
+
+    for task_id, _, _ in items:
+        assert sorted(single.query(task_id)) == sorted(batch.query(task_id))
+
+
+class FakePagedSession:
+    """Returns the given pages of rows, one per execute() call"""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+
+    async def execute(self, query):
+        rows = self.pages.pop(0) if self.pages else []
+        return SimpleNamespace(all=lambda: rows)
+
+
+def test_build_loads_all_pages():
+    """build() indexes every page and marks the index ready"""
+    rows = [
+        SimpleNamespace(id=uuid4(), title="Fix login bug on mobile Safari", description=None),
+        SimpleNamespace(id=uuid4(), title="Fix login bug on mobile Safari", description=None),
+    ]
+    index = TaskSimilarityIndex()
+    asyncio.run(index.build(FakePagedSession([rows[:1], rows[1:]])))
+
+    assert index.is_built
+    assert len(index) == 2
+    assert [task_id for task_id, _ in index.query(rows[0].id)] == [rows[1].id]
+
+
+def test_start_build_schedules_one_background_build(monkeypatch):
+    """Repeated start_build() calls share one build; a built index starts none"""
+    started = []
+
+    async def fake_job():
+        started.append(True)
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(similarity, "build_similarity_index_job", fake_job)
+
+    async def run():
+        index = TaskSimilarityIndex()
+        index.start_build()
+        index.start_build()
+        await index._build_task
+
+        index.is_built = True
+        index.start_build()
+
+    asyncio.run(run())
+    assert started == [True]
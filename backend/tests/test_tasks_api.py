@@ -184,7 +184,14 @@ async def main():
         moved_task = response.json()
         print(f"✓ Moved task to new parent")
         print(f"  New path: {moved_task['path']}")
-        print(f"  New depth: {moved_task['depth']}\n")
+        print(f"  New depth: {moved_task['depth']}")
+
+        # Children counters follow the move
+        response = await client.get(f"{BASE_URL}/tasks/{task1_id}", headers=headers)
+        assert response.json()["children_count"] == 2
+        response = await client.get(f"{BASE_URL}/tasks/{task2_id}", headers=headers)
+        assert response.json()["children_count"] == 0
+        print(f"✓ Children counts updated\n")
 
         # Step 13: Soft delete task
         print("13. Soft deleting a task...")
@@ -197,6 +204,27 @@ async def main():
         visible_tasks = response.json()
         print(f"✓ Visible tasks after deletion: {len(visible_tasks)}\n")
 
+        # Step 14: Deleting a task deletes its subtree
+        print("14. Soft deleting a subtree...")
+        response = await client.delete(f"{BASE_URL}/tasks/{task1_id}", headers=headers)
+        assert response.status_code == 204
+        response = await client.get(f"{BASE_URL}/tasks/{task3_id}", headers=headers)
+        assert response.status_code == 404
+        print(f"✓ Root and its subtask are hidden\n")
+
+        # Step 15: Restore brings back only the cascade
+        print("15. Restoring the subtree...")
+        response = await client.post(f"{BASE_URL}/tasks/{task1_id}/restore", headers=headers)
+        assert response.status_code == 200, f"Restore failed: {response.text}"
+        assert not response.json()["is_deleted"]
+        assert response.json()["children_count"] == 1
+        response = await client.get(f"{BASE_URL}/tasks/{task3_id}", headers=headers)
+        assert response.status_code == 200
+        # task2 was deleted on its own in step 13
+        response = await client.get(f"{BASE_URL}/tasks/{task2_id}", headers=headers)
+        assert response.status_code == 404
+        print(f"✓ Subtask restored, separately deleted task stays deleted\n")
+
         print("=== All Tests Passed! ===")
 
 
@@ -3,6 +3,7 @@ Test Tasks Extended API (Workflow, Watchers, Participants)
 """
 
 import asyncio
+from uuid import uuid4
 
 import httpx
 
@@ -262,6 +263,77 @@ async def main():
         watchers_dup = response.json()
         print(f"✓ Watchers count (should be 1): {len(watchers_dup)}\n")
 
+        # Step 20: Bulk update
+        print("20. Bulk updating priority and assignee...")
+        missing_id = "00000000-0000-0000-0000-000000000000"
+        bulk_data = {
+            "task_ids": [task_id, task2_id, missing_id],
+            "patch": {"priority": "critical", "assignee_id": admin_id},
+        }
+        response = await client.post(f"{BASE_URL}/tasks/bulk", json=bulk_data, headers=headers)
+        assert response.status_code == 200, f"Bulk update failed: {response.text}"
+        bulk = response.json()
+        assert bulk["matched"] == 2
+        results = {r["task_id"]: r for r in bulk["results"]}
+        assert results[task_id]["success"]
+        assert "priority" in results[task_id]["changed_fields"]
+        assert results[missing_id]["error"] == "Task not found"
+        response = await client.get(f"{BASE_URL}/tasks/{task2_id}", headers=headers)
+        assert response.json()["priority"] == "critical"
+        print(f"✓ Bulk update: {bulk['matched']} matched, {bulk['updated']} updated\n")
+
+        # Step 21: Bulk update needs exactly one selection
+        print("21. Bulk update without selection (should fail)...")
+        response = await client.post(
+            f"{BASE_URL}/tasks/bulk", json={"patch": {"priority": "low"}}, headers=headers
+        )
+        assert response.status_code == 422
+        print("✓ Rejected request without task_ids or filter\n")
+
+        # Step 22: Bulk update to a missing project or assignee fails as a whole
+        print("22. Bulk update to unknown project / assignee (should fail)...")
+        for field in ("project_id", "assignee_id"):
+            response = await client.post(
+                f"{BASE_URL}/tasks/bulk",
+                json={"task_ids": [task_id], "patch": {field: missing_id}},
+                headers=headers,
+            )
+            assert response.status_code == 400, f"{field}: {response.text}"
+            assert "not found" in response.json()["detail"]
+        print("✓ Rejected unknown project and assignee\n")
+
+        # Step 23: New and moved tasks go to the bottom of their kanban column
+        print("23. Creating three tasks in one kanban column...")
+        response = await client.post(
+            f"{BASE_URL}/projects",
+            json={"name": f"Kanban {uuid4().hex[:8]}", "code": f"KB{uuid4().hex[:5].upper()}"},
+            headers=headers,
+        )
+        assert response.status_code == 201
+        project_id = response.json()["id"]
+
+        ranks = {}
+        for title in ("First", "Second", "Third"):
+            response = await client.post(
+                f"{BASE_URL}/tasks/",
+                json={"title": title, "project_id": project_id, "status": "new"},
+                headers=headers,
+            )
+            assert response.status_code == 201
+            ranks[title] = (response.json()["id"], response.json()["kanban_position"])
+        assert ranks["First"][1] < ranks["Second"][1] < ranks["Third"][1]
+
+        # Moving First to another column and back puts it after Third
+        for status in ("in_progress", "new"):
+            response = await client.post(
+                f"{BASE_URL}/tasks/{ranks['First'][0]}/status",
+                json={"status": status},
+                headers=headers,
+            )
+            assert response.status_code == 200
+        assert response.json()["kanban_position"] > ranks["Third"][1]
+        print("✓ Tasks ranked in creation order, moved task appended\n")
+
         print("=== All Tests Passed! ===")
 
 
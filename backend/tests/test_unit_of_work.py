@@ -0,0 +1,79 @@
+"""
+Test the request-scoped unit of work (fake session, no DB)
+"""
+
+import asyncio
+
+from app.core.unit_of_work import UnitOfWork
+
+
+class FakeSession:
+    """Records staged objects and transaction calls"""
+
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+async def _create_entry(uow: UnitOfWork, entry: str) -> None:
+    """Shape of a service write: stage the row, then end the operation"""
+    uow.db.add(entry)
+    await uow.save()
+
+
+def test_request_scope_commits_once():
+    """Services only stage; side effects run after the single commit"""
+    db = FakeSession()
+    uow = UnitOfWork(db)
+    effects = []
+
+    async def run():
+        await _create_entry(uow, "created")
+        await _create_entry(uow, "status_changed")
+        uow.after_commit(lambda: effects.append("indexed"))
+        await uow.save()
+        assert db.commits == 0 and effects == []
+        await uow.commit()
+
+    asyncio.run(run())
+    assert len(db.added) == 2
+    assert db.commits == 1
+    assert effects == ["indexed"]
+
+
+def test_rollback_drops_side_effects():
+    db = FakeSession()
+    uow = UnitOfWork(db)
+    effects = []
+
+    async def run():
+        uow.after_commit(lambda: effects.append("indexed"))
+        await uow.rollback()
+        await uow.commit()
+
+    asyncio.run(run())
+    assert db.rollbacks == 1
+    assert effects == []
+
+
+def test_standalone_commits_per_operation():
+    """Services built without a unit of work keep committing on their own"""
+    db = FakeSession()
+    uow = UnitOfWork.standalone(db)
+
+    async def run():
+        await _create_entry(uow, "created")
+        await _create_entry(uow, "status_changed")
+
+    asyncio.run(run())
+    assert db.commits == 2
@@ -0,0 +1,56 @@
+"""
+Test the in-process user directory used for @mentions and autocomplete (no DB)
+"""
+
+from uuid import uuid4
+
+from app.modules.users.directory import UserDirectory
+
+
+def _directory():
+    directory = UserDirectory()
+    ids = {name: uuid4() for name in ("ivan", "maria", "admin")}
+    directory.put(ids["ivan"], "Иван Петров", "ivan@example.com")
+    directory.put(ids["maria"], "Мария Иванова", "maria@example.com")
+    directory.put(ids["admin"], "Admin", "admin@smarttask360.com")
+    return directory, ids
+
+
+def test_search_matches_substrings_ordered_by_name():
+    """Short and long queries match name or email substrings, like SQL contains"""
+    directory, ids = _directory()
+
+    assert directory.search("ива") == [ids["ivan"], ids["maria"]]
+    assert directory.search("ИВАНОВА") == [ids["maria"]]
+    assert directory.search("smarttask") == [ids["admin"]]
+    assert directory.search("example.com", limit=1) == [ids["ivan"]]
+    assert directory.search("петрова") == []
+    assert directory.search("") == []
+
+
+def test_put_and_remove_keep_indexes_consistent():
+    """Renames, deactivation and removal drop stale entries"""
+    directory, ids = _directory()
+
+    directory.put(ids["maria"], "Мария Сидорова", "maria@example.com")
+    assert directory.search("иванова") == []
+    assert directory.search("сидор") == [ids["maria"]]
+
+    directory.put(ids["ivan"], "Иван Петров", "ivan@example.com", is_active=False)
+    assert ids["ivan"] not in directory
+    assert directory.search("петров") == []
+
+    directory.remove(ids["maria"])
+    directory.remove(ids["admin"])
+    assert len(directory) == 0
+    assert directory._grams == {} and directory._names == {}
+
+
+def test_resolve_names_is_exact_and_case_insensitive():
+    """Only full names resolve; lookups ignore case and surrounding spaces"""
+    directory, ids = _directory()
+
+    assert directory.resolve_names(["иван петров", " ADMIN ", "Иван", "nobody"]) == {
+        "иван петров": ids["ivan"],
+        "admin": ids["admin"],
+    }
@@ -8,6 +8,7 @@ import {
   deleteBoard,
   moveTask,
 } from "../api";
+import { compareRanks } from "../../../shared/lib/utils";
 import type { Board, BoardFull, BoardCreate, BoardUpdate, MoveTaskRequest, BoardColumnWithTasks } from "../types";
 
 export const boardKeys = {
@@ -61,7 +62,9 @@ export function useBoardColumnsWithTasks(boardId: string, enabled = true) {
       // Build columns with tasks
       return board.columns.map((column) => ({
         ...column,
-        tasks: (tasksByColumn.get(column.id) || []).sort((a, b) => a.order_index - b.order_index),
+        tasks: (tasksByColumn.get(column.id) || []).sort((a, b) =>
+          compareRanks(a.order_index, b.order_index)
+        ),
       }));
     },
     enabled: enabled && !!boardId,
@@ -41,7 +41,7 @@ export interface BoardTaskWithDetails {
   board_id: string;
   task_id: string;
   column_id: string;
-  order_index: number;
+  order_index: string; // Fractional rank within the column
   added_at: string;
   moved_at: string;
   task_title: string;
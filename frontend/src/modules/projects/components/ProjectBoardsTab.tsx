@@ -9,7 +9,7 @@ import { Spinner, Badge, Avatar, Input, Button } from "../../../shared/ui";
 import { useProjectTasks } from "../hooks";
 import { useChangeTaskStatus, useCreateTask } from "../../tasks/hooks";
 import { reorderKanbanTasks } from "../../tasks/api";
-import { formatDate, getTaskUrgency } from "../../../shared/lib/utils";
+import { compareRanks, formatDate, getTaskUrgency } from "../../../shared/lib/utils";
 import type { Task, TaskStatus } from "../../tasks/types";
 import { useAuth } from "../../auth";
 import { useUsers } from "../../users";
@@ -528,14 +528,14 @@ export function ProjectBoardsTab({ projectId }: ProjectBoardsTabProps) {
         statusTasks.sort((a, b) => {
           const aIndex = localOrder.indexOf(a.id);
           const bIndex = localOrder.indexOf(b.id);
-          if (aIndex === -1 && bIndex === -1) return a.kanban_position - b.kanban_position;
+          if (aIndex === -1 && bIndex === -1) return compareRanks(a.kanban_position, b.kanban_position);
           if (aIndex === -1) return 1;
           if (bIndex === -1) return -1;
           return aIndex - bIndex;
         });
       } else {
         // Sort by kanban_position from server
-        statusTasks.sort((a, b) => a.kanban_position - b.kanban_position);
+        statusTasks.sort((a, b) => compareRanks(a.kanban_position, b.kanban_position));
       }
     }
 
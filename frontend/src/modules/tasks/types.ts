@@ -67,7 +67,7 @@ export interface Task {
   rejection_reason: RejectionReason | null;
   rejection_comment: string | null;
   completion_result: string | null;
-  kanban_position: number;
+  kanban_position: string; // Fractional rank within the status column
   smart_score: SMARTValidationResult | null;
   smart_validated_at: string | null;
   smart_is_valid: boolean | null;
@@ -353,3 +353,11 @@ export function getTaskUrgency(task: { status: string; due_date: string | null;
     daysLeft,
   };
 }
+
+/**
+ * Compare fractional rank keys (kanban_position, board order_index).
+ * Ranks are ordered by plain code-point comparison, not locale rules.
+ */
+export function compareRanks(a: string, b: string): number {
+  return a < b ? -1 : a > b ? 1 : 0;
+}
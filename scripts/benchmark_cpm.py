@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark the CPM scheduling and auto-scheduling engines on a synthetic project
+
+Usage:
+    python scripts/benchmark_cpm.py [--tasks 50000] [--edges 200000] [--chain 20000]
+                                    [--users 300]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.modules.gantt.auto_schedule import MINUTES_PER_DAY, auto_schedule
+from app.modules.gantt.scheduling import DependencyGraph, compute_schedule
+
+
+def random_dag(num_tasks: int, num_edges: int, rng: np.random.Generator) -> tuple:
+    """Random DAG edge arrays: edges point from a lower to a higher task rank"""
+    a = rng.integers(0, num_tasks, num_edges * 2)
+    b = rng.integers(0, num_tasks, num_edges * 2)
+    pairs = np.unique(np.stack([np.minimum(a, b), np.maximum(a, b)], axis=1), axis=0)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    pairs = pairs[rng.permutation(len(pairs))[:num_edges]]
+
+    # Shuffle task indices so the input order is not already topological
+    relabel = rng.permutation(num_tasks)
+    return (
+        num_tasks,
+        relabel[pairs[:, 0]],
+        relabel[pairs[:, 1]],
+        rng.choice(4, len(pairs), p=[0.7, 0.15, 0.1, 0.05]),
+        rng.integers(-2, 5, len(pairs)),
+    )
+
+
+def chain(num_tasks: int) -> DependencyGraph:
+    """Single FS chain - the worst case for level-by-level processing"""
+    idx = np.arange(num_tasks - 1)
+    zeros = np.zeros(num_tasks - 1, dtype=np.int64)
+    return DependencyGraph(num_tasks, idx, idx + 1, zeros, zeros)
+
+
+def bench(name: str, graph: DependencyGraph, durations: np.ndarray, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        schedule = compute_schedule(durations, graph)
+        best = min(best, time.perf_counter() - start)
+
+    levels = len(graph.topological_levels())
+    print(
+        f"{name}: {graph.num_tasks} tasks, {graph.num_edges} edges, {levels} levels -> "
+        f"{best * 1000:.1f} ms, duration {schedule.project_duration} days, "
+        f"{int(schedule.critical.sum())} critical"
+    )
+
+
+def bench_auto_schedule(graph: DependencyGraph, num_users: int, rng: np.random.Generator):
+    n = graph.num_tasks
+    starts = (np.int64(20_000) + rng.integers(0, 365, n)) * MINUTES_PER_DAY
+    ends = starts + rng.integers(0, 10, n) * MINUTES_PER_DAY
+    fixed = rng.random(n) < 0.05
+
+    for level in (False, True):
+        start = time.perf_counter()
+        new_starts, _, _ = auto_schedule(
+            starts,
+            ends,
+            graph,
+            fixed,
+            level=level,
+            users=rng.integers(-1, num_users, n),
+            hours=rng.integers(0, 40, n).astype(float),
+            priorities=rng.integers(0, 4, n),
+        )
+        elapsed = time.perf_counter() - start
+        moved = int((new_starts != starts).sum())
+        name = "Propagate + level" if level else "Propagate"
+        print(f"{name}: {n} tasks -> {elapsed * 1000:.1f} ms, {moved} moved")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--edges", type=int, default=200_000)
+    parser.add_argument("--chain", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=300)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+
+    edges = random_dag(args.tasks, args.edges, rng)
+    start = time.perf_counter()
+    graph = DependencyGraph(*edges)
+    print(f"Graph build: {(time.perf_counter() - start) * 1000:.1f} ms")
+    bench("Random DAG", graph, rng.integers(0, 10, args.tasks))
+
+    bench("Chain", chain(args.chain), np.ones(args.chain, dtype=np.int64))
+
+    bench_auto_schedule(graph, args.users, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark the resource workload engine
+
+Usage:
+    python scripts/benchmark_workload.py [--users 500] [--tasks 50000] [--days 365]
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from app.modules.gantt.workload import compute_workload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    horizon_start = date(2026, 1, 1)
+    horizon_end = horizon_start + timedelta(days=args.days - 1)
+
+    # Tasks start up to a month before the horizon and last 1-30 days
+    first = np.datetime64(horizon_start, "D")
+    starts = first + rng.integers(-30, args.days, args.tasks)
+    ends = starts + rng.integers(0, 30, args.tasks)
+    users = rng.integers(0, args.users, args.tasks)
+    hours = rng.integers(1, 80, args.tasks).astype(np.float64)
+
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        workload = compute_workload(
+            list(range(args.users)), users, starts, ends, hours, horizon_start, horizon_end
+        )
+        utilization = workload.utilization
+        weekly = workload.by_week()
+        best = min(best, time.perf_counter() - start)
+
+    overallocated_days = int((workload.overallocated > 0).sum())
+    print(
+        f"{args.users} users x {args.days} days, {args.tasks} tasks -> {best * 1000:.1f} ms "
+        f"(daily + weekly), {overallocated_days} overallocated user-days, "
+        f"peak utilization {utilization.max():.2f}, {len(weekly.periods)} weeks"
+    )
+
+
+if __name__ == "__main__":
+    main()